@@ -0,0 +1,154 @@
+#------------------------------------------------------------
+# Columnar (Arrow IPC / Parquet) exports streamed from a cursor
+#------------------------------------------------------------
+import datetime
+
+from flask import Response, jsonify, make_response, request
+from pymysql import cursors
+from pymysql.constants import FIELD_TYPE
+
+from backend.db_connection import db
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # exports answer 501 until pyarrow is installed
+    pa = pq = None
+
+# Rows per Arrow record batch (and Parquet row group)
+BATCH_ROWS = 10000
+
+FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+_INTEGER_TYPES = {FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.INT24,
+                  FIELD_TYPE.LONG, FIELD_TYPE.LONGLONG, FIELD_TYPE.YEAR}
+
+
+def _column_types(description):
+    """
+    (build type, schema type) per cursor column. Values are built with the
+    first and cast to the second, e.g. TINYINT(1)/BOOLEAN is built as int8
+    and stored as bool.
+    """
+    types = []
+    for _, type_code, _, length, _, scale, _ in description:
+        if type_code == FIELD_TYPE.TINY and length == 1:
+            types.append((pa.int8(), pa.bool_()))
+        elif type_code in _INTEGER_TYPES:
+            types.append((pa.int64(), pa.int64()))
+        elif type_code == FIELD_TYPE.FLOAT:
+            types.append((pa.float32(), pa.float32()))
+        elif type_code == FIELD_TYPE.DOUBLE:
+            types.append((pa.float64(), pa.float64()))
+        elif type_code in (FIELD_TYPE.NEWDECIMAL, FIELD_TYPE.DECIMAL):
+            # length counts the sign and point too, so it bounds the precision
+            decimal = pa.decimal128(max(1, min(int(length or 38), 38)), int(scale or 0))
+            types.append((decimal, decimal))
+        elif type_code in (FIELD_TYPE.DATE, FIELD_TYPE.NEWDATE):
+            types.append((pa.date32(), pa.date32()))
+        elif type_code in (FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP):
+            types.append((pa.timestamp("us"), pa.timestamp("us")))
+        elif type_code == FIELD_TYPE.TIME:
+            # PyMySQL returns TIME as timedelta (it may exceed 24h)
+            types.append((pa.duration("us"), pa.duration("us")))
+        else:
+            types.append((pa.string(), pa.string()))
+    return types
+
+
+def _record_batch(rows, types, schema):
+    columns = []
+    for i, (build, final) in enumerate(types):
+        values = [row[i] for row in rows]
+        if build == pa.string():
+            values = [None if v is None else v if isinstance(v, str) else
+                      v.decode() if isinstance(v, bytes) else str(v) for v in values]
+        array = pa.array(values, type=build)
+        columns.append(array if build == final else array.cast(final))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+class _Drain:
+    """Write-only file object whose buffered bytes are handed out as chunks."""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self):
+        return True
+
+    def take(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _stream(query, params, fmt):
+    """Yield the encoded file chunk by chunk, one record batch at a time."""
+    with db.connection() as conn:
+        # Unbuffered, tuple rows: the result is never held in full
+        cursor = conn.cursor(cursors.SSCursor)
+        try:
+            cursor.execute(query, params)
+            types = _column_types(cursor.description)
+            schema = pa.schema([(col[0], final) for col, (_, final) in zip(cursor.description, types)])
+
+            drain = _Drain()
+            sink = pa.PythonFile(drain, mode="w")
+            writer = (pa.ipc.new_stream(sink, schema) if fmt == "arrow"
+                      else pq.ParquetWriter(sink, schema, compression="snappy"))
+            while True:
+                rows = cursor.fetchmany(BATCH_ROWS)
+                if not rows:
+                    break
+                batch = _record_batch(rows, types, schema)
+                if fmt == "arrow":
+                    writer.write_batch(batch)
+                else:
+                    writer.write_table(pa.Table.from_batches([batch]))
+                chunk = drain.take()
+                if chunk:
+                    yield chunk
+            writer.close()
+            yield drain.take()
+        finally:
+            cursor.close()
+            conn.commit()
+
+
+def export_response(query, params, name):
+    """
+    Stream query's result as ?format=arrow (IPC stream, the default) or
+    ?format=parquet, with column types taken from the cursor (DECIMAL stays
+    decimal, DATE stays date, BOOLEAN becomes bool).
+    """
+    fmt = request.args.get("format", "arrow").lower()
+    if fmt not in FORMATS:
+        return make_response(jsonify({"error": "format must be 'arrow' or 'parquet'"}), 400)
+    if pa is None:
+        return make_response(jsonify({"error": "Columnar export needs pyarrow installed on the API"}), 501)
+
+    mimetype, extension = FORMATS[fmt]
+    filename = f"{name}_{datetime.date.today():%Y%m%d}.{extension}"
+    return Response(_stream(query, params, fmt), mimetype=mimetype,
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'})
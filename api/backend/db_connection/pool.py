@@ -0,0 +1,302 @@
+#------------------------------------------------------------
+# Pooled PyMySQL connections shared by every blueprint
+#------------------------------------------------------------
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pymysql
+from flask import g
+from pymysql import cursors
+from pymysql.constants import SERVER_STATUS
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out in time."""
+
+
+class _PooledConnection:
+    """A PyMySQL connection plus the bookkeeping the pool needs."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of PyMySQL connections.
+
+    Connections are pinged on checkout when they have been idle longer than
+    ping_interval seconds, and are recycled once they are older than
+    max_lifetime seconds, so stale sockets never reach a route.
+    """
+
+    def __init__(self, connect_kwargs, min_size=2, max_size=10, timeout=10.0,
+                 max_lifetime=1800, ping_interval=30):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self.connect_kwargs = connect_kwargs
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+
+        self._idle = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+
+        # Metrics
+        self._waiters = 0
+        self._checkouts = 0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+        self._timeouts = 0
+        self._recycled = 0
+        self._failed_pings = 0
+
+    def warm(self):
+        """Open min_size connections up front; returns how many were opened."""
+        opened = 0
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return opened
+                self._size += 1
+            pooled = self._open()
+            with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+            opened += 1
+
+    def _open(self):
+        """Open a connection for a slot already counted in self._size."""
+        try:
+            return _PooledConnection(pymysql.connect(**self.connect_kwargs))
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    @staticmethod
+    def _close(pooled):
+        try:
+            pooled.conn.close()
+        except Exception:
+            pass
+
+    def _forget(self, count=1):
+        """Give up slots whose connections were closed; call with the lock held."""
+        self._size -= count
+        self._cond.notify(count)
+
+    def _check(self, pooled, now):
+        """
+        None if pooled can be handed out, else why not ('recycled' or
+        'ping'). Runs without the lock: the ping is a server round trip.
+        """
+        if self.max_lifetime and now - pooled.created_at > self.max_lifetime:
+            return "recycled"
+        if now - pooled.last_used_at > self.ping_interval:
+            try:
+                pooled.conn.ping(reconnect=False)
+            except Exception:
+                return "ping"
+        return None
+
+    def acquire(self, timeout=None):
+        """Check a connection out of the pool, blocking while it is exhausted."""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            pooled = None
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    if self._idle:
+                        # Take it while locked, vet it after releasing the lock
+                        pooled = self._idle.pop()
+                        break
+
+                    if self._size < self.max_size:
+                        # Reserve the slot, then connect outside the lock so a slow
+                        # handshake does not stall other checkouts.
+                        self._size += 1
+                        break
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(f"No database connection available after {timeout}s")
+
+                    self._waiters += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiters -= 1
+
+            if pooled is None:
+                pooled = self._open()
+                with self._cond:
+                    return self._checked_out(pooled, started)
+
+            problem = self._check(pooled, time.monotonic())
+            if problem is None:
+                with self._cond:
+                    return self._checked_out(pooled, started)
+
+            # Stale or dead: close it unlocked, free its slot and try again
+            self._close(pooled)
+            with self._cond:
+                if problem == "recycled":
+                    self._recycled += 1
+                else:
+                    self._failed_pings += 1
+                self._forget()
+
+    def _checked_out(self, pooled, started):
+        elapsed = time.monotonic() - started
+        self._checkouts += 1
+        self._checkout_time_total += elapsed
+        self._checkout_time_max = max(self._checkout_time_max, elapsed)
+        return pooled
+
+    def release(self, pooled, discard=False):
+        """Return a connection to the pool, rolling back any open transaction."""
+        if not discard and pooled.conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+            try:
+                pooled.conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard:
+            self._close(pooled)
+            with self._cond:
+                self._forget()
+            return
+
+        with self._cond:
+            pooled.last_used_at = time.monotonic()
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    def close(self):
+        """Close every idle connection."""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._forget(len(idle))
+        for pooled in idle:
+            self._close(pooled)
+
+    def stats(self):
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "inUse": self._size - len(self._idle),
+                "minSize": self.min_size,
+                "maxSize": self.max_size,
+                "waiters": self._waiters,
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "recycled": self._recycled,
+                "failedPings": self._failed_pings,
+                "avgCheckoutMs": round(self._checkout_time_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "maxCheckoutMs": round(self._checkout_time_max * 1000, 3),
+            }
+
+
+class PooledMySQL:
+    """
+    Drop-in replacement for flaskext.mysql.MySQL backed by a ConnectionPool.
+
+    get_db() hands out one pooled connection per app context and returns it
+    to the pool on teardown, so existing routes keep calling
+    db.get_db().cursor() / db.get_db().commit() unchanged.
+    """
+
+    def __init__(self, app=None, cursorclass=cursors.DictCursor):
+        self.cursorclass = cursorclass
+        self.pool = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("MYSQL_DATABASE_HOST", "localhost")
+        app.config.setdefault("MYSQL_DATABASE_PORT", 3306)
+        app.config.setdefault("MYSQL_DATABASE_USER", None)
+        app.config.setdefault("MYSQL_DATABASE_PASSWORD", None)
+        app.config.setdefault("MYSQL_DATABASE_DB", None)
+        app.config.setdefault("MYSQL_DATABASE_CHARSET", "utf8mb4")
+        app.config.setdefault("MYSQL_POOL_MIN_SIZE", 2)
+        app.config.setdefault("MYSQL_POOL_MAX_SIZE", 10)
+        app.config.setdefault("MYSQL_POOL_TIMEOUT", 10.0)
+        app.config.setdefault("MYSQL_POOL_MAX_LIFETIME", 1800)
+        app.config.setdefault("MYSQL_POOL_PING_INTERVAL", 30)
+
+        connect_kwargs = {
+            "host": app.config["MYSQL_DATABASE_HOST"],
+            "port": int(app.config["MYSQL_DATABASE_PORT"]),
+            "user": app.config["MYSQL_DATABASE_USER"],
+            "password": app.config["MYSQL_DATABASE_PASSWORD"],
+            "database": app.config["MYSQL_DATABASE_DB"],
+            "charset": app.config["MYSQL_DATABASE_CHARSET"],
+            "cursorclass": self.cursorclass,
+            "autocommit": False,
+        }
+
+        self.pool = ConnectionPool(
+            connect_kwargs,
+            min_size=int(app.config["MYSQL_POOL_MIN_SIZE"]),
+            max_size=int(app.config["MYSQL_POOL_MAX_SIZE"]),
+            timeout=float(app.config["MYSQL_POOL_TIMEOUT"]),
+            max_lifetime=float(app.config["MYSQL_POOL_MAX_LIFETIME"]),
+            ping_interval=float(app.config["MYSQL_POOL_PING_INTERVAL"]),
+        )
+        app.teardown_appcontext(self.teardown_request)
+
+        # The db container may still be starting; the pool fills lazily then.
+        try:
+            opened = self.pool.warm()
+            app.logger.info(f"Connection pool warmed with {opened} connection(s)")
+        except Exception as e:
+            app.logger.warning(f"Connection pool warm-up failed, connecting lazily: {e}")
+
+    def get_db(self):
+        """Return the connection bound to the current app context."""
+        if "_pooled_db" not in g:
+            g._pooled_db = self.pool.acquire()
+        return g._pooled_db.conn
+
+    def teardown_request(self, exception):
+        pooled = g.pop("_pooled_db", None)
+        if pooled is not None:
+            self.pool.release(pooled)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Check out a pooled connection outside the request cycle, e.g. from a
+        background thread. The connection goes back to the pool on exit.
+        timeout overrides the pool's wait (0 raises PoolTimeout at once).
+        """
+        pooled = self.pool.acquire(timeout)
+        discard = False
+        try:
+            yield pooled.conn
+        except pymysql.err.OperationalError:
+            discard = True
+            raise
+        finally:
+            self.pool.release(pooled, discard=discard)
+
+    def stats(self):
+        return self.pool.stats() if self.pool else {}
@@ -0,0 +1,60 @@
+#------------------------------------------------------------
+# Conditional GET (ETag) support for per-student reads
+#------------------------------------------------------------
+import datetime
+import hashlib
+from functools import wraps
+
+from flask import g, make_response, request
+
+from backend.db_connection import db
+from backend.streaming import wants_ndjson
+from backend.student_versions import current_version
+
+
+def etag_by_student(daily=False):
+    """
+    Give a per-student GET view a strong ETag built from the endpoint, its
+    query args and the student's change version (also sent as
+    X-Student-Version), and answer a matching If-None-Match with 304 before
+    the view (and its query) runs. Set daily for views whose results depend
+    on CURDATE(). Requests without a studentID are passed through untouched,
+    and so are streamed (NDJSON) responses: those read on their own
+    connection, so the version read here would not describe their rows.
+    The version is left in g.student_version for views that read on other
+    connections and must check they saw the same data.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                student_id = int(kwargs.get('student_id') or request.args.get('studentID'))
+            except (TypeError, ValueError):
+                return view(*args, **kwargs)
+            if wants_ndjson():
+                return view(*args, **kwargs)
+
+            # Read on the request's own connection, so the view's queries see
+            # the same snapshot the version came from
+            cursor = db.get_db().cursor()
+            version = current_version(cursor, student_id)
+            cursor.close()
+            g.student_version = version
+            parts = [request.endpoint, repr(sorted(request.args.items(multi=True))), str(version)]
+            if daily:
+                parts.append(datetime.date.today().isoformat())
+            etag = hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+            if request.if_none_match.contains(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+            response.set_etag(etag)
+            response.headers["X-Student-Version"] = str(version)
+            # Clients may keep the body but must revalidate before reusing it
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,94 @@
+#------------------------------------------------------------
+# App-wide JSON encoding for database rows (orjson, stdlib fallback)
+#------------------------------------------------------------
+import dataclasses
+import datetime
+import decimal
+import json
+import uuid
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # same output through the stdlib encoder, just slower
+    orjson = None
+
+
+# Exact-type lookups first: these are the types PyMySQL hands back, and a
+# dict hit is much cheaper than the isinstance() chain per value
+_ENCODERS = {
+    decimal.Decimal: float,
+    datetime.date: str,
+    datetime.datetime: str,
+    datetime.time: str,
+    datetime.timedelta: str,
+}
+
+
+def default(value):
+    """
+    Encode the column types PyMySQL returns the way the routes always have:
+    DECIMAL as a float and DATE/DATETIME/TIME (timedelta) as str(), e.g.
+    '2025-01-31', '2025-01-31 09:30:00' and '9:30:00'.
+    """
+    encoder = _ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+        return str(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps_stdlib(obj, sort_keys=False, indent=False):
+    return json.dumps(obj, default=default, sort_keys=sort_keys, ensure_ascii=False,
+                      indent=2 if indent else None,
+                      separators=None if indent else (",", ":")).encode()
+
+
+if orjson is not None:
+    # Dates go through default() too, so the output matches the stdlib path
+    _BASE_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def _dumps_orjson(obj, sort_keys=False, indent=False):
+        options = _BASE_OPTIONS
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=options)
+
+    dumps_bytes, loads = _dumps_orjson, orjson.loads
+else:
+    dumps_bytes, loads = _dumps_stdlib, json.loads
+
+
+class StudyLinkJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider used by jsonify() and every JSON response. Routes
+    can hand it rows straight from the cursor; no per-route Decimal/date
+    fix-up is needed.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj, sort_keys=kwargs.get("sort_keys", self.sort_keys),
+                           indent=bool(kwargs.get("indent"))).decode()
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = dumps_bytes(obj, sort_keys=self.sort_keys, indent=indent) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
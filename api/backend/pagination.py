@@ -0,0 +1,54 @@
+#------------------------------------------------------------
+# Keyset (cursor) pagination helpers shared by the blueprints
+#------------------------------------------------------------
+import base64
+import datetime
+import json
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+def _cursor_value(value):
+    # Dates/times go into the cursor as the strings MySQL compares them by
+    if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values):
+    """Pack the sort-key values of the last row on a page into an opaque token."""
+    raw = json.dumps([_cursor_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, size):
+    """Unpack a cursor token; raises ValueError if it is malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def page_limit(default=DEFAULT_PAGE_LIMIT):
+    """Read ?limit=, clamped to 1..PAGE_MAX_LIMIT; raises ValueError if not an int."""
+    cap = int(current_app.config.get("PAGE_MAX_LIMIT", MAX_PAGE_LIMIT))
+    limit = request.args.get("limit", default)
+    return max(1, min(int(limit), cap))
+
+
+def attach_next_cursor(response, token):
+    """Expose the next-page cursor on a list response without changing its body."""
+    if token:
+        response.headers["X-Next-Cursor"] = token
+        args = request.args.to_dict()
+        args["cursor"] = token
+        response.headers["Link"] = f'<{request.path}?{urlencode(args)}>; rel="next"'
+    return response
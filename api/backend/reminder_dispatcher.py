@@ -0,0 +1,321 @@
+#------------------------------------------------------------
+# In-process dispatcher that fires reminders when they come due
+#------------------------------------------------------------
+import datetime
+import heapq
+import json
+import queue
+import threading
+import urllib.request
+
+from backend.db_connection import db
+from backend.student_versions import students_for_reminder
+
+# Upper bound on one sleep, so a changed wall clock is noticed in time
+MAX_SLEEP_SECONDS = 300
+
+# Range-scans idx_reminder_active_due (migration 07) one block of days at a time
+DUE_REMINDERS_QUERY = """
+    SELECT reminderID, date, time
+    FROM reminder
+    WHERE isActive = TRUE
+      AND date BETWEEN %s AND %s
+    ORDER BY date, time, reminderID
+"""
+
+REMINDER_QUERY = """
+    SELECT reminderID, eventID, assignmentID, message, isActive, date, time
+    FROM reminder
+    WHERE reminderID = %s
+"""
+
+# Reminders that go away with an event, assignment or course. Read them
+# before the delete and cancel() them after the commit.
+LINKED_REMINDERS_QUERIES = {
+    "eventID": "SELECT reminderID FROM reminder WHERE eventID = %s",
+    "assignmentID": "SELECT reminderID FROM reminder WHERE assignmentID = %s",
+    "courseID": """
+        SELECT r.reminderID
+        FROM reminder r
+        JOIN assignment a ON a.assignmentID = r.assignmentID
+        WHERE a.courseID = %s
+    """,
+}
+
+
+def linked_reminder_ids(cursor, column, item_id):
+    cursor.execute(LINKED_REMINDERS_QUERIES[column], (item_id,))
+    return [row['reminderID'] for row in cursor.fetchall()]
+
+
+def _due_at(day, at):
+    """Combine a reminder's DATE and TIME (date/str, timedelta/time/str) into a datetime."""
+    if isinstance(day, str):
+        day = datetime.date.fromisoformat(day)
+    if isinstance(at, datetime.timedelta):
+        return datetime.datetime.combine(day, datetime.time()) + at
+    if isinstance(at, str):
+        at = datetime.time.fromisoformat(at)
+    return datetime.datetime.combine(day, at)
+
+
+# ============================================
+# SINKS
+# ============================================
+
+class LogSink:
+    """Writes each due reminder to the API log."""
+
+    def __init__(self, app):
+        self.logger = app.logger
+
+    def deliver(self, payload):
+        self.logger.info(f"Reminder {payload['reminderID']} due for students "
+                         f"{payload['studentIDs']}: {payload['message']}")
+
+
+class WebhookSink:
+    """POSTs each due reminder as JSON to REMINDER_WEBHOOK_URL."""
+
+    def __init__(self, app):
+        self.url = app.config.get("REMINDER_WEBHOOK_URL")
+        if not self.url:
+            raise ValueError("REMINDER_WEBHOOK_URL must be set to use the webhook reminder sink")
+
+    def deliver(self, payload):
+        req = urllib.request.Request(self.url, data=json.dumps(payload).encode(),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(req, timeout=5):
+            pass
+
+
+class QueueSink:
+    """Keeps due reminders in a bounded local queue for another consumer to drain."""
+
+    def __init__(self, app):
+        self.queue = queue.Queue(maxsize=int(app.config.get("REMINDER_QUEUE_SIZE", 1000)))
+
+    def deliver(self, payload):
+        while True:
+            try:
+                self.queue.put_nowait(payload)
+                return
+            except queue.Full:
+                # Drop the oldest rather than block the dispatcher
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def drain(self, max_items=100):
+        items = []
+        while len(items) < max_items:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+
+SINKS = {"log": LogSink, "webhook": WebhookSink, "queue": QueueSink}
+
+
+def register_sink(name, factory):
+    """Make factory(app) available as a REMINDER_SINKS name."""
+    SINKS[name] = factory
+
+
+# ============================================
+# DISPATCHER
+# ============================================
+
+class ReminderDispatcher:
+    """
+    Fires active reminders at their date + time.
+
+    Upcoming reminders sit in a min-heap of (due, reminderID). Only the next
+    REMINDER_LOOKAHEAD_DAYS of reminders are held; further days are loaded
+    one range scan at a time as the clock reaches them. The reminder routes
+    call schedule()/cancel() after they commit, so the heap follows writes
+    without re-reading the table. A changed or cancelled reminder leaves its
+    old heap entry behind; entries that no longer match _due are skipped
+    when popped. Each reminder is re-read by primary key just before it
+    fires, which also catches reminders removed by cascading deletes.
+
+    The thread starts on the first request, so the reloader's parent process
+    never runs one. Delivery is at most once per process: reminders that
+    came due while the API was down are not replayed.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.sinks = []
+        self.lookahead_days = 1
+        self._heap = []
+        self._due = {}
+        self._loaded_through = None
+        self._started = False
+        self._cond = threading.Condition()
+        self.delivered = 0
+        self.skipped = 0
+        self.failures = 0
+
+    def init_app(self, app):
+        app.config.setdefault("REMINDER_DISPATCH", True)
+        app.config.setdefault("REMINDER_SINKS", "log")
+        app.config.setdefault("REMINDER_LOOKAHEAD_DAYS", 1)
+        self.app = app
+        if not app.config["REMINDER_DISPATCH"]:
+            return
+        self.lookahead_days = int(app.config["REMINDER_LOOKAHEAD_DAYS"])
+        names = [n.strip() for n in str(app.config["REMINDER_SINKS"]).split(",") if n.strip()]
+        self.sinks = [(name, SINKS[name](app)) for name in names]
+        app.before_request(self._ensure_started)
+
+    def sink(self, name):
+        """The configured sink instance with this name, or None."""
+        return next((s for n, s in self.sinks if n == name), None)
+
+    def _ensure_started(self):
+        if self._started:
+            return
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._run, name="reminder-dispatcher", daemon=True).start()
+
+    # ---------- write hooks ----------
+
+    def schedule(self, reminder_id, day, at, is_active=True):
+        """A reminder was created or changed (call after commit)."""
+        if not self._started:
+            return
+        try:
+            due = _due_at(day, at)
+        except (TypeError, ValueError) as e:
+            # The write already committed; never fail it from here
+            self.app.logger.warning(f"Could not schedule reminder {reminder_id} at {day} {at}: {e}")
+            is_active, due = False, None
+        with self._cond:
+            if (not is_active or self._loaded_through is None
+                    or due.date() > self._loaded_through or due < datetime.datetime.now()):
+                # Past reminders are not fired; ones beyond the loaded window
+                # are picked up when their day is loaded
+                self._due.pop(reminder_id, None)
+            elif self._due.get(reminder_id) != due:
+                self._due[reminder_id] = due
+                heapq.heappush(self._heap, (due, reminder_id))
+            self._cond.notify()
+
+    def cancel(self, *reminder_ids):
+        """Reminders were deleted (call after commit)."""
+        with self._cond:
+            for reminder_id in reminder_ids:
+                self._due.pop(reminder_id, None)
+
+    # ---------- worker ----------
+
+    def _load_days(self, cursor, first, last):
+        cursor.execute(DUE_REMINDERS_QUERY, (first, last))
+        rows = cursor.fetchall()
+        now = datetime.datetime.now()
+        with self._cond:
+            for row in rows:
+                due = _due_at(row["date"], row["time"])
+                if due >= now and row["reminderID"] not in self._due:
+                    self._due[row["reminderID"]] = due
+                    heapq.heappush(self._heap, (due, row["reminderID"]))
+            self._loaded_through = last
+
+    def _extend_window(self):
+        """Load any days that have entered the lookahead window."""
+        target = datetime.date.today() + datetime.timedelta(days=self.lookahead_days)
+        if self._loaded_through is not None and self._loaded_through >= target:
+            return
+        first = (self._loaded_through + datetime.timedelta(days=1)
+                 if self._loaded_through is not None else datetime.date.today())
+        with db.connection() as conn:
+            cursor = conn.cursor()
+            self._load_days(cursor, first, target)
+            cursor.close()
+            conn.commit()
+
+    def _pop_due(self):
+        """Wait for the next due reminder; returns (reminderID, due), or None once the day rolls over."""
+        with self._cond:
+            while True:
+                while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                    heapq.heappop(self._heap)
+                now = datetime.datetime.now()
+                next_day = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+                if self._heap and self._heap[0][0] <= now:
+                    due, reminder_id = heapq.heappop(self._heap)
+                    del self._due[reminder_id]
+                    return reminder_id, due
+                wake = min(self._heap[0][0], next_day) if self._heap else next_day
+                self._cond.wait(min((wake - now).total_seconds(), MAX_SLEEP_SECONDS))
+                if datetime.datetime.now().date() != now.date():
+                    return None
+
+    def _fire(self, conn, reminder_id, due):
+        cursor = conn.cursor()
+        cursor.execute(REMINDER_QUERY, (reminder_id,))
+        row = cursor.fetchone()
+        if not row or not row["isActive"] or _due_at(row["date"], row["time"]) != due:
+            # Deleted or changed outside the routes since it was scheduled
+            cursor.close()
+            conn.commit()
+            self.skipped += 1
+            if row and row["isActive"]:
+                self.schedule(reminder_id, row["date"], row["time"])
+            return
+        payload = {
+            "reminderID": reminder_id,
+            "eventID": row["eventID"],
+            "assignmentID": row["assignmentID"],
+            "message": row["message"],
+            "dueAt": due.isoformat(),
+            "studentIDs": students_for_reminder(cursor, reminder_id),
+        }
+        cursor.close()
+        conn.commit()
+        for name, sink in self.sinks:
+            try:
+                sink.deliver(payload)
+            except Exception as e:
+                self.failures += 1
+                self.app.logger.error(f"Reminder {reminder_id} could not be delivered to {name}: {e}")
+        self.delivered += 1
+
+    def _run(self):
+        logger = self.app.logger
+        logger.info(f"Reminder dispatcher started (sinks: {', '.join(n for n, _ in self.sinks)})")
+        while True:
+            try:
+                self._extend_window()
+                due = self._pop_due()
+                if due is not None:
+                    with db.connection() as conn:
+                        self._fire(conn, *due)
+            except Exception as e:
+                logger.error(f"Reminder dispatcher error: {e}")
+                with self._cond:
+                    self._cond.wait(30)
+
+    def stats(self):
+        with self._cond:
+            upcoming = min(self._due.values()) if self._due else None
+            return {
+                "running": self._started,
+                "scheduled": len(self._due),
+                "nextDue": upcoming.isoformat() if upcoming else None,
+                "loadedThrough": self._loaded_through.isoformat() if self._loaded_through else None,
+                "delivered": self.delivered,
+                "skipped": self.skipped,
+                "failures": self.failures,
+                "sinks": [n for n, _ in self.sinks],
+            }
+
+
+reminder_dispatcher = ReminderDispatcher()
@@ -0,0 +1,141 @@
+#------------------------------------------------------------
+# In-process response cache for expensive read endpoints
+#------------------------------------------------------------
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+
+# Tags name the tables a cached response was computed from; write routes
+# invalidate by tag after they commit. There are no tags for student and
+# StudySummary: no route writes them (they are loaded with the database
+# scripts), so views reading only those rely on RESPONSE_CACHE_TTL.
+METRIC = "metric"
+ASSIGNMENT = "assignment"
+ENROLLMENT = "enrollment"  # CourseSelectionStudent
+
+
+class TTLCache:
+    """Thread-safe LRU map whose entries also expire after a TTL."""
+
+    def __init__(self, max_entries=512, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "maxEntries": self.max_entries,
+                    "hits": self.hits, "misses": self.misses}
+
+
+class ResponseCache:
+    """
+    Caches whole GET responses keyed by endpoint and query args.
+
+    Each cached view declares the tags it depends on; invalidate(tag) drops
+    every entry carrying that tag. A per-tag generation counter stops a
+    request that started before a write from storing its now-stale result.
+    """
+
+    def __init__(self):
+        self.store = TTLCache()
+        self._tag_keys = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault("RESPONSE_CACHE_MAX_ENTRIES", 512)
+        app.config.setdefault("RESPONSE_CACHE_TTL", 60)
+        self.store.max_entries = int(app.config["RESPONSE_CACHE_MAX_ENTRIES"])
+        self.store.ttl = float(app.config["RESPONSE_CACHE_TTL"])
+
+    def _generation(self, tags):
+        with self._lock:
+            return tuple(self._generations.get(t, 0) for t in tags)
+
+    def cached(self, *tags, ttl=None, key=None):
+        """
+        Decorator for views whose 200 responses can be shared. Entries are
+        keyed by the query args; key=fn() replaces those, e.g. to key a
+        read-only POST on a hash of its body.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                request_key = key() if key else tuple(sorted(request.args.items(multi=True)))
+                cache_key = (request.endpoint, tuple(sorted(kwargs.items())), request_key)
+                hit = self.store.get(cache_key)
+                if hit is not None:
+                    body, status, mimetype = hit
+                    response = current_app.response_class(body, status=status, mimetype=mimetype)
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                generation = self._generation(tags)
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    with self._lock:
+                        if generation == tuple(self._generations.get(t, 0) for t in tags):
+                            self.store.set(cache_key, (response.get_data(), response.status_code, response.mimetype), ttl)
+                            for t in tags:
+                                keys = self._tag_keys.setdefault(t, set())
+                                keys.add(cache_key)
+                                if len(keys) > 4 * self.store.max_entries:
+                                    # Forget keys the LRU/TTL already evicted
+                                    keys.intersection_update(self.store.keys())
+                response.headers["X-Cache"] = "MISS"
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        """Drop every cached response that depends on any of the tags."""
+        with self._lock:
+            for t in tags:
+                self._generations[t] = self._generations.get(t, 0) + 1
+                for key in self._tag_keys.pop(t, ()):
+                    self.store.delete(key)
+
+    def stats(self):
+        return self.store.stats()
+
+
+response_cache = ResponseCache()
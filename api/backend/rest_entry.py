@@ -5,6 +5,9 @@ import logging
 from logging.handlers import RotatingFileHandler
 
 from backend.db_connection import db
+from backend.json_provider import StudyLinkJSONProvider
+from backend.response_cache import response_cache
+from backend.reminder_dispatcher import reminder_dispatcher
 
 # =========================================================================
 # STUDYLINK BLUEPRINT IMPORTS
@@ -21,15 +24,16 @@ from backend.studylink.advisor.advisor_routes import advisor_bp
 # Student Routes - Import from student_routes.py (not maya_routes.py)
 # Make this optional in case the file doesn't have all the blueprints yet
 try:
-    from backend.studylink.student.student_routes import calendar, reminder, grades, workload, events, courses
+    from backend.studylink.student.student_routes import calendar, reminder, grades, workload, events, courses, home
     HAS_STUDENT_ROUTES = True
 except ImportError as e:
     print(f"Warning: Could not import student routes: {e}")
     HAS_STUDENT_ROUTES = False
-    calendar = reminder = grades = workload = events = courses = None
+    calendar = reminder = grades = workload = events = courses = home = None
 
 # System Admin Routes
 from backend.studylink.System_Admin.admin_routes import admin
+from backend.studylink.System_Admin.import_jobs import import_jobs
 
 # Optional: Generic demo routes (can be removed if not needed)
 try:
@@ -42,6 +46,10 @@ except ImportError:
 def create_app():
     app = Flask(__name__)
 
+    # One JSON encoder for every response: Decimal, date, time and TIME
+    # (timedelta) columns serialize natively, via orjson when installed
+    app.json = StudyLinkJSONProvider(app)
+
     app.logger.setLevel(logging.DEBUG)
     app.logger.info('API startup')
 
@@ -74,14 +82,54 @@ def create_app():
     app.config["MYSQL_DATABASE_PORT"] = int(get_env_var("DB_PORT"))
     app.config["MYSQL_DATABASE_DB"] = get_env_var("DB_NAME")
 
+    # Connection pool configuration
+    app.config["MYSQL_POOL_MIN_SIZE"] = int(get_env_var("DB_POOL_MIN_SIZE", "2"))
+    app.config["MYSQL_POOL_MAX_SIZE"] = int(get_env_var("DB_POOL_MAX_SIZE", "10"))
+    app.config["MYSQL_POOL_TIMEOUT"] = float(get_env_var("DB_POOL_TIMEOUT", "10"))
+    app.config["MYSQL_POOL_MAX_LIFETIME"] = float(get_env_var("DB_POOL_MAX_LIFETIME", "1800"))
+    app.config["MYSQL_POOL_PING_INTERVAL"] = float(get_env_var("DB_POOL_PING_INTERVAL", "30"))
+
+    # Rows per multi-row INSERT for metric imports
+    app.config["IMPORT_CHUNK_SIZE"] = int(get_env_var("IMPORT_CHUNK_SIZE", "1000"))
+    app.config["IMPORT_WORKERS"] = int(get_env_var("IMPORT_WORKERS", "2"))
+
+    # Extra pooled connections /home may hold at once for its side-by-side
+    # queries (one more always runs on the request's own connection). Keep it
+    # well below DB_POOL_MAX_SIZE: fan-out only takes idle connections and
+    # falls back to the request connection, so it never waits on the pool.
+    app.config["HOME_FANOUT_CONNECTIONS"] = int(get_env_var("HOME_FANOUT_CONNECTIONS", "3"))
+
+    # Server-side cap on ?limit= for paginated list endpoints
+    app.config["PAGE_MAX_LIMIT"] = int(get_env_var("PAGE_MAX_LIMIT", "1000"))
+
+    # Response cache for aggregate analyst endpoints
+    app.config["RESPONSE_CACHE_TTL"] = float(get_env_var("RESPONSE_CACHE_TTL", "60"))
+    app.config["RESPONSE_CACHE_MAX_ENTRIES"] = int(get_env_var("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+    # Background reminder delivery (sinks: log, webhook, queue)
+    app.config["REMINDER_DISPATCH"] = get_env_var("REMINDER_DISPATCH", "true").lower() == "true"
+    app.config["REMINDER_SINKS"] = get_env_var("REMINDER_SINKS", "log")
+    app.config["REMINDER_WEBHOOK_URL"] = get_env_var("REMINDER_WEBHOOK_URL", "")
+    app.config["REMINDER_LOOKAHEAD_DAYS"] = int(get_env_var("REMINDER_LOOKAHEAD_DAYS", "1"))
+
     # DEBUG: Print what we're actually using
     app.logger.info(f"DB_HOST = {app.config['MYSQL_DATABASE_HOST']}")
     app.logger.info(f"DB_PORT = {app.config['MYSQL_DATABASE_PORT']}")
+    app.logger.info(f"DB_POOL = {app.config['MYSQL_POOL_MIN_SIZE']}..{app.config['MYSQL_POOL_MAX_SIZE']}")
 
     # Initialize the database
     app.logger.info("current_app(): starting the database connection")
     db.init_app(app)
 
+    # Background worker pool for queued metric imports
+    import_jobs.init_app(app)
+
+    # Cache for analyst aggregate endpoints (invalidated by write routes)
+    response_cache.init_app(app)
+
+    # Fires due reminders from a min-heap (started on the first request)
+    reminder_dispatcher.init_app(app)
+
     # Register blueprints
     app.logger.info("create_app(): registering blueprints with Flask app object.")
     
@@ -105,6 +153,7 @@ def create_app():
         app.register_blueprint(workload, url_prefix='/student')
         app.register_blueprint(events, url_prefix='/student')
         app.register_blueprint(courses, url_prefix='/student')
+        app.register_blueprint(home, url_prefix='/student')
         app.logger.info("Registered student routes")
     else:
         app.logger.warning("Student routes not available, skipping registration")
@@ -0,0 +1,94 @@
+#------------------------------------------------------------
+# Streaming JSON / NDJSON responses straight from a server-side cursor
+#------------------------------------------------------------
+from flask import Response, request
+from pymysql import cursors
+
+from backend.db_connection import db
+from backend.json_provider import dumps_bytes
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# Rows pulled from the server per round trip, and bytes per response chunk
+FETCH_ROWS = 1000
+CHUNK_BYTES = 64 * 1024
+
+
+def wants_ndjson():
+    """?format=ndjson, or an Accept header that prefers NDJSON over JSON."""
+    if request.args.get("format") == "ndjson":
+        return True
+    # Ties (e.g. */*) go to the first entry, JSON
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+class _RowStream:
+    """
+    Response body that encodes rows as they are read from an unbuffered
+    SSDictCursor. Owns its pooled connection: close() (called by the WSGI
+    server when the response ends or the client goes away) returns it, and
+    throws it away if rows were left unread.
+    """
+
+    def __init__(self, pooled, cursor, ndjson):
+        self.pooled = pooled
+        self.cursor = cursor
+        self.ndjson = ndjson
+        self.finished = False
+
+    def __iter__(self):
+        buffer, size = [], 0
+        if not self.ndjson:
+            buffer.append(b"[")
+        first = True
+        while True:
+            rows = self.cursor.fetchmany(FETCH_ROWS)
+            if not rows:
+                break
+            for row in rows:
+                encoded = dumps_bytes(row)
+                if self.ndjson:
+                    encoded += b"\n"
+                elif not first:
+                    encoded = b"," + encoded
+                first = False
+                buffer.append(encoded)
+                size += len(encoded)
+            if size >= CHUNK_BYTES:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+        self.finished = True
+        if not self.ndjson:
+            buffer.append(b"]")
+        if buffer:
+            yield b"".join(buffer)
+
+    def close(self):
+        if self.pooled is None:
+            return
+        pooled, self.pooled = self.pooled, None
+        if self.finished:
+            self.cursor.close()
+        db.pool.release(pooled, discard=not self.finished)
+
+
+def stream_query(query, params=(), ndjson=None, headers=None):
+    """
+    Run query on a dedicated pooled connection and stream its rows as a
+    chunked JSON array (or NDJSON when the client asks for it), encoded the
+    same way as jsonify(). Memory stays
+    at about FETCH_ROWS rows whatever the result size. The query runs
+    before this returns, so SQL errors still surface as exceptions in the
+    route.
+    """
+    if ndjson is None:
+        ndjson = wants_ndjson()
+    pooled = db.pool.acquire()
+    try:
+        cursor = pooled.conn.cursor(cursors.SSDictCursor)
+        cursor.execute(query, params)
+    except Exception:
+        db.pool.release(pooled, discard=True)
+        raise
+    body = _RowStream(pooled, cursor, ndjson)
+    return Response(body, mimetype=NDJSON_MIMETYPE if ndjson else "application/json", headers=headers)
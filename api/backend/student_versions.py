@@ -0,0 +1,73 @@
+#------------------------------------------------------------
+# Per-student change versions
+#------------------------------------------------------------
+# student_version holds a counter per student that every write touching the
+# student's calendar, reminders, grades, courses or metrics increments in
+# the same transaction as the write. A reader that sees version N therefore
+# sees exactly the data committed with N, so caches (ETags, the Streamlit
+# helpers, push updates) can validate with one primary-key lookup.
+
+
+def current_version(cursor, student_id):
+    """Current version for a student; 0 if nothing was ever written."""
+    cursor.execute("SELECT version FROM student_version WHERE studentID = %s", (student_id,))
+    row = cursor.fetchone()
+    return row['version'] if row else 0
+
+
+def bump_versions(cursor, student_ids):
+    """
+    Increment the version of every given student. Call inside the write's
+    transaction, before commit. IDs are sorted so concurrent writers lock
+    the rows in the same order.
+    """
+    ids = sorted({int(student_id) for student_id in student_ids})
+    if not ids:
+        return
+    cursor.execute(
+        "INSERT INTO student_version (studentID, version) VALUES "
+        + ", ".join(["(%s, 1)"] * len(ids))
+        + " ON DUPLICATE KEY UPDATE version = version + 1",
+        ids
+    )
+
+
+# ------------------------------------------------------------
+# Who is affected by a write. Run these BEFORE deleting rows,
+# since the links they follow are removed with them.
+# ------------------------------------------------------------
+
+def _student_ids(cursor, query, params):
+    cursor.execute(query, params)
+    return [row['studentID'] for row in cursor.fetchall()]
+
+
+def students_in_course(cursor, course_id):
+    return _student_ids(cursor, "SELECT studentID FROM CourseSelectionStudent WHERE courseID = %s", (course_id,))
+
+
+def students_for_assignment(cursor, assignment_id):
+    return _student_ids(cursor, """
+        SELECT css.studentID
+        FROM assignment a
+        JOIN CourseSelectionStudent css ON a.courseID = css.courseID
+        WHERE a.assignmentID = %s
+    """, (assignment_id,))
+
+
+def students_for_event(cursor, event_id):
+    return _student_ids(cursor, "SELECT studentID FROM attEvent WHERE eventID = %s", (event_id,))
+
+
+def students_for_reminder(cursor, reminder_id):
+    return _student_ids(cursor, """
+        SELECT ae.studentID
+        FROM reminder r JOIN attEvent ae ON r.eventID = ae.eventID
+        WHERE r.reminderID = %s
+        UNION
+        SELECT css.studentID
+        FROM reminder r
+        JOIN assignment a ON r.assignmentID = a.assignmentID
+        JOIN CourseSelectionStudent css ON a.courseID = css.courseID
+        WHERE r.reminderID = %s
+    """, (reminder_id, reminder_id))
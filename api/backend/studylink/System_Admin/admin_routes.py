@@ -1,6 +1,31 @@
+import pymysql
 from flask import Blueprint, jsonify, request
 from backend.db_connection import db
 from flask import current_app
+from backend.studylink.System_Admin.metric_import import (
+    REQUIRED_METRIC_FIELDS,
+    auto_increment_step,
+    chunked,
+    create_import_job,
+    finish_import_job,
+    import_outcome,
+    insert_metric_chunk,
+    iter_lines,
+    iter_metric_rows,
+    log_row_errors,
+    missing_metric_fields,
+    normalize_metric,
+    resolve_chunk_size,
+    run_metric_import,
+)
+from backend.studylink.System_Admin.import_jobs import import_jobs
+from backend.columnar_export import export_response
+from backend.streaming import stream_query
+from backend.response_cache import ASSIGNMENT, ENROLLMENT, METRIC, response_cache
+from backend.reminder_dispatcher import linked_reminder_ids, reminder_dispatcher
+from backend.student_versions import bump_versions, students_in_course
+from backend.studylink.student import week_load
+from backend.studylink.student.prerequisites import parse_prerequisites, prerequisite_index
 
 # Blueprint for admin routes - NO url_prefix so routes are at root level
 admin = Blueprint("admin", __name__)
@@ -34,10 +59,6 @@ def get_calendar_connection(student_id):
         if not row:
             return jsonify({"error": "Student not found"}), 404
 
-        # Convert datetime to string
-        if row.get('lastSyncedAt'):
-            row['lastSyncedAt'] = str(row['lastSyncedAt'])
-
         return jsonify(row), 200
     except Exception as e:
         current_app.logger.error(f"Error in get_calendar_connection: {e}")
@@ -114,13 +135,6 @@ def get_terms():
         terms = cursor.fetchall()
         cursor.close()
 
-        # Convert dates to strings
-        for term in terms:
-            if term.get('startDate'):
-                term['startDate'] = str(term['startDate'])
-            if term.get('endDate'):
-                term['endDate'] = str(term['endDate'])
-
         return jsonify(terms), 200
     except Exception as e:
         current_app.logger.error(f"Error in get_terms: {e}")
@@ -165,7 +179,8 @@ def get_term_courses(term_id):
         cursor = db.get_db().cursor()
         cursor.execute("""
             SELECT courseID, termID, courseCode, courseName, location,
-                   credits, instructor, department, date, startTime, endTime
+                   credits, instructor, department, date, startTime, endTime,
+                   prerequisites
             FROM CourseSelection
             WHERE termID = %s
             ORDER BY courseCode
@@ -173,15 +188,6 @@ def get_term_courses(term_id):
         courses = cursor.fetchall()
         cursor.close()
 
-        # Convert date/time to strings
-        for course in courses:
-            if course.get('date'):
-                course['date'] = str(course['date'])
-            if course.get('startTime'):
-                course['startTime'] = str(course['startTime'])
-            if course.get('endTime'):
-                course['endTime'] = str(course['endTime'])
-
         return jsonify(courses), 200
     except Exception as e:
         current_app.logger.error(f"Error in get_term_courses: {e}")
@@ -199,12 +205,15 @@ def add_course_to_term(term_id):
             if field not in data or data.get(field) in (None, ""):
                 return jsonify({"error": f"Missing required field: {field}"}), 400
 
+        # Stored as a normalized comma-separated list of course codes
+        prerequisites = ", ".join(parse_prerequisites(data.get("prerequisites"))) or None
+
         cursor = db.get_db().cursor()
         cursor.execute("""
             INSERT INTO CourseSelection
                 (termID, courseCode, courseName, location, credits, 
-                 instructor, department, date, startTime, endTime)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                 instructor, department, date, startTime, endTime, prerequisites)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """, (
             term_id,
             data.get("courseCode"),
@@ -215,11 +224,13 @@ def add_course_to_term(term_id):
             data.get("department"),
             data.get("date"),
             data.get("startTime"),
-            data.get("endTime")
+            data.get("endTime"),
+            prerequisites
         ))
         db.get_db().commit()
         course_id = cursor.lastrowid
         cursor.close()
+        prerequisite_index.invalidate()
 
         return jsonify({"message": "Course added successfully", "courseID": course_id}), 201
     except Exception as e:
@@ -232,12 +243,27 @@ def delete_course(term_id, course_id):
     """Delete a course from a term."""
     try:
         cursor = db.get_db().cursor()
+        cursor.execute(
+            "SELECT courseID FROM CourseSelection WHERE courseID = %s AND termID = %s",
+            (course_id, term_id)
+        )
+        affected, reminder_ids = [], []
+        if cursor.fetchone():
+            # Enrollments, assignments and their reminders cascade away with
+            # the course, so settle the students' derived data first
+            affected = students_in_course(cursor, course_id)
+            reminder_ids = linked_reminder_ids(cursor, "courseID", course_id)
+            week_load.apply_course(cursor, course_id, sign=-1)
         cursor.execute(
             "DELETE FROM CourseSelection WHERE courseID = %s AND termID = %s",
             (course_id, term_id)
         )
+        bump_versions(cursor, affected)
         db.get_db().commit()
         cursor.close()
+        prerequisite_index.invalidate()
+        response_cache.invalidate(ASSIGNMENT, ENROLLMENT)
+        reminder_dispatcher.cancel(*reminder_ids)
 
         return jsonify({"message": "Course deleted successfully", "courseID": course_id}), 200
     except Exception as e:
@@ -249,73 +275,258 @@ def delete_course(term_id, course_id):
 # 3) IMPORT METRICS
 # ============================================
 
+def _validate_metric_import(data):
+    """Return an error message for an invalid /imports/metrics body, else None."""
+    if data.get("adminID") is None:
+        return "adminID is required"
+    metrics = data.get("metrics")
+    if not isinstance(metrics, list) or len(metrics) == 0:
+        return "metrics must be a non-empty list"
+    for m in metrics:
+        if not isinstance(m, dict) or missing_metric_fields(m):
+            return f"Each metric must include: {REQUIRED_METRIC_FIELDS}"
+    # Catch bad values here rather than as a failed chunk (a 500) later
+    for i, m in enumerate(metrics):
+        _, error = normalize_metric(m)
+        if error:
+            return f"metrics[{i}]: {error}"
+    try:
+        resolve_chunk_size(data.get("chunkSize"))
+    except (TypeError, ValueError):
+        return "chunkSize must be an integer"
+    return None
+
+
 @admin.route("/imports/metrics", methods=["POST"])
 def import_metrics():
-    """Import metrics and link to an import job."""
+    """Import metrics in chunked multi-row inserts and link them to an import job."""
     try:
         data = request.get_json(silent=True) or {}
-        admin_id = data.get("adminID")
+        error = _validate_metric_import(data)
+        if error:
+            return jsonify({"error": error}), 400
+
+        admin_id = data["adminID"]
         job_type = data.get("jobType", "Metric Import")
-        metrics = data.get("metrics")
+        metrics = data["metrics"]
+        chunk_size = resolve_chunk_size(data.get("chunkSize"))
 
-        if admin_id is None:
-            return jsonify({"error": "adminID is required"}), 400
-        if not isinstance(metrics, list) or len(metrics) == 0:
-            return jsonify({"error": "metrics must be a non-empty list"}), 400
+        conn = db.get_db()
+        cursor = conn.cursor()
 
-        required = ["studentID", "category", "privacyLevel", "unit", "metricType", "metricName", "metricValue"]
-        for m in metrics:
-            for field in required:
-                if field not in m or m.get(field) in (None, ""):
-                    return jsonify({"error": f"Each metric must include: {required}"}), 400
+        # Commit the job row first so it survives a failed chunk
+        job_id = create_import_job(cursor, admin_id, job_type)
+        conn.commit()
 
-        cursor = db.get_db().cursor()
+        inserted_metric_ids, error_count = run_metric_import(
+            conn, job_id, metrics, chunk_size, current_app.logger
+        )
 
-        # Create import job
-        cursor.execute("""
-            INSERT INTO importJob (errorCount, jobType, startTime, endTime, status, adminID)
-            VALUES (0, %s, NOW(), NOW(), 'Completed', %s)
-        """, (job_type, admin_id))
-        job_id = cursor.lastrowid
-
-        # Insert metrics
-        inserted_metric_ids = []
-        for m in metrics:
-            cursor.execute("""
-                INSERT INTO metric
-                    (studentID, courseID, category, privacyLevel, description, 
-                     unit, metricType, metricName, metricValue)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                m.get("studentID"),
-                m.get("courseID"),
-                m.get("category"),
-                m.get("privacyLevel"),
-                m.get("description"),
-                m.get("unit"),
-                m.get("metricType"),
-                m.get("metricName"),
-                m.get("metricValue")
-            ))
-            metric_id = cursor.lastrowid
-            inserted_metric_ids.append(metric_id)
-
-            # Link metric to job
-            cursor.execute(
-                "INSERT INTO ImportJob_Metric (jobID, metricID) VALUES (%s, %s)",
-                (job_id, metric_id)
-            )
+        status, code = import_outcome(len(inserted_metric_ids), error_count)
+        finish_import_job(cursor, job_id, status, error_count)
+        conn.commit()
+        cursor.close()
+        response_cache.invalidate(METRIC)
 
+        result = {
+            "jobID": job_id,
+            "status": status,
+            "errorCount": error_count,
+            "insertedMetricIDs": inserted_metric_ids
+        }
+        if error_count:
+            result["error"] = f"{error_count} of {len(metrics)} metrics failed to import"
+        else:
+            result["message"] = "Metrics imported"
+        return jsonify(result), code
+    except Exception as e:
+        current_app.logger.error(f"Error in import_metrics: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@admin.route("/imports/metrics/async", methods=["POST"])
+def queue_import_metrics():
+    """Queue a metric import on the background worker pool and return its jobID."""
+    try:
+        data = request.get_json(silent=True) or {}
+        error = _validate_metric_import(data)
+        if error:
+            return jsonify({"error": error}), 400
+
+        cursor = db.get_db().cursor()
+        job_id = create_import_job(cursor, data["adminID"], data.get("jobType", "Metric Import"), status="Queued")
         db.get_db().commit()
         cursor.close()
 
+        import_jobs.submit(job_id, data["metrics"], resolve_chunk_size(data.get("chunkSize")))
+
         return jsonify({
-            "message": "Metrics imported",
+            "message": "Import queued",
             "jobID": job_id,
-            "insertedMetricIDs": inserted_metric_ids
-        }), 201
+            "status": "Queued",
+            "statusUrl": f"/jobs/{job_id}"
+        }), 202
     except Exception as e:
-        current_app.logger.error(f"Error in import_metrics: {e}")
+        current_app.logger.error(f"Error in queue_import_metrics: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@admin.route("/jobs/<int:job_id>", methods=["GET"])
+def get_import_job(job_id):
+    """Report an import job's status, rows processed, throughput and error count."""
+    try:
+        cursor = db.get_db().cursor()
+        cursor.execute("""
+            SELECT jobID, jobType, status, errorCount, startTime, endTime, adminID
+            FROM importJob
+            WHERE jobID = %s
+        """, (job_id,))
+        job = cursor.fetchone()
+
+        if not job:
+            cursor.close()
+            return jsonify({"error": "Job not found"}), 404
+
+        progress = import_jobs.progress(job_id)
+        if progress:
+            # Live counters from this process are fresher than the job row
+            job.update(progress)
+        else:
+            cursor.execute("SELECT COUNT(*) AS rowsProcessed FROM ImportJob_Metric WHERE jobID = %s", (job_id,))
+            job["rowsProcessed"] = cursor.fetchone()["rowsProcessed"]
+            elapsed = None
+            if job.get("startTime") and job.get("endTime"):
+                elapsed = (job["endTime"] - job["startTime"]).total_seconds()
+            job["elapsedSeconds"] = elapsed
+            job["rowsPerSec"] = round(job["rowsProcessed"] / elapsed, 1) if elapsed else 0.0
+        cursor.close()
+
+        return jsonify(job), 200
+    except Exception as e:
+        current_app.logger.error(f"Error in get_import_job: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+def _fail_import_job(conn, job_id, error_count):
+    """Roll back and mark a job 'Failed', on a fresh connection if conn is unusable."""
+    try:
+        conn.rollback()
+        cursor = conn.cursor()
+        finish_import_job(cursor, job_id, "Failed", error_count)
+        conn.commit()
+        cursor.close()
+        return
+    except Exception as e:
+        current_app.logger.error(f"Could not mark import job {job_id} as Failed on the request connection: {e}")
+    try:
+        with db.connection() as fresh:
+            cursor = fresh.cursor()
+            finish_import_job(cursor, job_id, "Failed", error_count)
+            fresh.commit()
+            cursor.close()
+    except Exception as e:
+        current_app.logger.error(f"Could not mark import job {job_id} as Failed: {e}")
+
+
+@admin.route("/imports/metrics/stream", methods=["POST"])
+def stream_import_metrics():
+    """
+    Import metrics from an NDJSON or CSV request body, streamed row by row.
+    Invalid rows are logged to ImportJobError/DataError instead of failing the upload.
+    """
+    try:
+        admin_id = request.args.get("adminID", type=int)
+        job_type = request.args.get("jobType", "Metric Import")
+        fmt = request.args.get("format") or ("csv" if request.mimetype == "text/csv" else "ndjson")
+
+        if admin_id is None:
+            return jsonify({"error": "adminID is required"}), 400
+        if fmt not in ("ndjson", "csv"):
+            return jsonify({"error": "format must be 'ndjson' or 'csv'"}), 400
+
+        try:
+            chunk_size = resolve_chunk_size(request.args.get("chunkSize"))
+        except (TypeError, ValueError):
+            return jsonify({"error": "chunkSize must be an integer"}), 400
+
+        conn = db.get_db()
+        cursor = conn.cursor()
+
+        job_id = create_import_job(cursor, admin_id, job_type)
+        conn.commit()
+
+        step = auto_increment_step(cursor)
+        rows_processed = 0
+        inserted_count = 0
+        error_count = 0
+        failed_chunks = 0
+        error_samples = []
+
+        try:
+            rows = iter_metric_rows(iter_lines(request.stream), fmt)
+            for chunk in chunked(rows, chunk_size):
+                valid = [metric for _, metric, error in chunk if error is None]
+                invalid = [(row_num, error) for row_num, _, error in chunk if error is not None]
+                rows_processed += len(chunk)
+
+                try:
+                    insert_metric_chunk(cursor, job_id, valid, step)
+                    log_row_errors(cursor, job_id, admin_id, invalid, step)
+                    conn.commit()
+                    inserted_count += len(valid)
+                    error_count += len(invalid)
+                    error_samples.extend(invalid[:20 - len(error_samples)])
+                except pymysql.MySQLError as e:
+                    conn.rollback()
+                    failed_chunks += 1
+                    error_count += len(chunk)
+                    first_row, last_row = chunk[0][0], chunk[-1][0]
+                    current_app.logger.error(f"stream_import_metrics job {job_id}: rows {first_row}-{last_row} failed: {e}")
+                    log_row_errors(cursor, job_id, admin_id, [(f"{first_row}-{last_row}", f"insert failed: {e}")], step)
+                    conn.commit()
+
+            # Invalid rows are logged, not failures; only failed chunks count
+            # against the import (an upload with nothing valid at all is a 422)
+            status, code = import_outcome(inserted_count, failed_chunks, error_count)
+            finish_import_job(cursor, job_id, status, error_count)
+            conn.commit()
+        except Exception as e:
+            # A bad body, a dropped client, or a failure while logging a failed
+            # chunk or finishing the job ends the upload; the job must not be
+            # left 'Running'
+            current_app.logger.error(f"stream_import_metrics job {job_id} aborted after {rows_processed} rows: {e}")
+            # Rows read but not committed, including the chunk in flight
+            error_count = rows_processed - inserted_count
+            _fail_import_job(conn, job_id, error_count)
+            if inserted_count:
+                response_cache.invalidate(METRIC)
+            return jsonify({
+                "error": str(e),
+                "jobID": job_id,
+                "status": "Failed",
+                "rowsProcessed": rows_processed,
+                "insertedCount": inserted_count,
+                "errorCount": error_count
+            }), 500
+
+        cursor.close()
+        response_cache.invalidate(METRIC)
+
+        result = {
+            "jobID": job_id,
+            "status": status,
+            "rowsProcessed": rows_processed,
+            "insertedCount": inserted_count,
+            "errorCount": error_count,
+            "errors": [{"row": row_num, "error": error} for row_num, error in error_samples]
+        }
+        if code == 422:
+            result["error"] = f"None of the {rows_processed} rows were valid"
+        else:
+            result["message"] = "Metrics streamed"
+        return jsonify(result), code
+    except Exception as e:
+        current_app.logger.error(f"Error in stream_import_metrics: {e}")
         return jsonify({"error": str(e)}), 500
 
 
@@ -442,13 +653,6 @@ def find_overlapping_blocks(student_id):
         blocks = cursor.fetchall()
         cursor.close()
 
-        # Convert datetime to strings
-        for block in blocks:
-            if block.get('startTime'):
-                block['startTime'] = str(block['startTime'])
-            if block.get('endTime'):
-                block['endTime'] = str(block['endTime'])
-
         # Find overlaps
         overlaps = []
         for i in range(len(blocks) - 1):
@@ -467,9 +671,27 @@ def find_overlapping_blocks(student_id):
 # 7) WEEKLY USAGE EXPORT
 # ============================================
 
+WEEKLY_USAGE_QUERY = """
+    SELECT
+        s.studentID,
+        s.fName,
+        s.lName,
+        ss.summaryID,
+        ss.totalStudyHrs,
+        ss.avgStudyHrs,
+        ss.avgSleep,
+        ss.periodStart,
+        ss.periodEnd
+    FROM StudySummary ss
+    JOIN student s ON ss.studentID = s.studentID
+    WHERE ss.periodStart >= %s AND ss.periodEnd <= %s
+    ORDER BY ss.periodStart, s.studentID
+"""
+
+
 @admin.route("/usage/weekly", methods=["GET"])
 def weekly_usage():
-    """Export weekly usage summary."""
+    """Export weekly usage summary, streamed."""
     try:
         start = request.args.get("start")
         end = request.args.get("end")
@@ -477,45 +699,26 @@ def weekly_usage():
         if not start or not end:
             return jsonify({"error": "start and end query params are required"}), 400
 
-        cursor = db.get_db().cursor()
-        cursor.execute("""
-            SELECT
-                s.studentID,
-                s.fName,
-                s.lName,
-                ss.summaryID,
-                ss.totalStudyHrs,
-                ss.avgStudyHrs,
-                ss.avgSleep,
-                ss.periodStart,
-                ss.periodEnd
-            FROM StudySummary ss
-            JOIN student s ON ss.studentID = s.studentID
-            WHERE ss.periodStart >= %s AND ss.periodEnd <= %s
-            ORDER BY ss.periodStart, s.studentID
-        """, (start, end))
-        rows = cursor.fetchall()
-        cursor.close()
-
-        # Convert datetime/decimal to strings/floats
-        for row in rows:
-            if row.get('periodStart'):
-                row['periodStart'] = str(row['periodStart'])
-            if row.get('periodEnd'):
-                row['periodEnd'] = str(row['periodEnd'])
-            if row.get('totalStudyHrs'):
-                row['totalStudyHrs'] = float(row['totalStudyHrs'])
-            if row.get('avgStudyHrs'):
-                row['avgStudyHrs'] = float(row['avgStudyHrs'])
-            if row.get('avgSleep'):
-                row['avgSleep'] = float(row['avgSleep'])
-
-        return jsonify(rows), 200
+        # A semester of summaries can be large: rows are encoded as they are
+        # read (JSON array, or NDJSON with ?format=ndjson)
+        return stream_query(WEEKLY_USAGE_QUERY, (start, end))
     except Exception as e:
         current_app.logger.error(f"Error in weekly_usage: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+@admin.route("/usage/weekly/export", methods=["GET"])
+def export_weekly_usage():
+    """Weekly usage summary as a file: ?format=arrow (default) or ?format=parquet."""
+    start = request.args.get("start")
+    end = request.args.get("end")
+
+    if not start or not end:
+        return jsonify({"error": "start and end query params are required"}), 400
+
+    return export_response(WEEKLY_USAGE_QUERY, (start, end), "weekly_usage")
+
+
 # ============================================
 # ADMIN INFO ROUTES
 # ============================================
@@ -529,10 +732,6 @@ def get_admins():
         admins = cursor.fetchall()
         cursor.close()
 
-        for admin in admins:
-            if admin.get('DOB'):
-                admin['DOB'] = str(admin['DOB'])
-
         return jsonify(admins), 200
     except Exception as e:
         current_app.logger.error(f"Error in get_admins: {e}")
@@ -554,9 +753,6 @@ def get_admin(admin_id):
         if not admin:
             return jsonify({"error": "Admin not found"}), 404
 
-        if admin.get('DOB'):
-            admin['DOB'] = str(admin['DOB'])
-
         return jsonify(admin), 200
     except Exception as e:
         current_app.logger.error(f"Error in get_admin: {e}")
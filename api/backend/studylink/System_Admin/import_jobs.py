@@ -0,0 +1,154 @@
+"""
+Background runner for metric import jobs
+Location: api/backend/studylink/System_Admin/import_jobs.py
+
+Imports are queued to an in-process thread pool so the POST returns a jobID
+right away. Workers use their own pooled connections and move
+importJob.status through Queued -> Running -> Completed/Partial/Failed,
+while progress counters are kept in memory for GET /jobs/<id>. Nothing
+survives a restart, so jobs a previous process left Queued or Running are
+marked Failed at startup.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.db_connection import db
+from backend.response_cache import METRIC, response_cache
+from backend.studylink.System_Admin.metric_import import finish_import_job, import_outcome, run_metric_import
+
+# Finished jobs kept in memory for polling before the oldest are dropped
+MAX_TRACKED_JOBS = 1000
+
+# Jobs only ever run inside the process that queued them
+ORPHANED_JOBS_UPDATE = """
+    UPDATE importJob
+    SET status = 'Failed', endTime = NOW()
+    WHERE status IN ('Queued', 'Running')
+"""
+
+
+class ImportProgress:
+    """Live counters for one queued or running import."""
+
+    def __init__(self, job_id, total_rows):
+        self.job_id = job_id
+        self.total_rows = total_rows
+        self.rows_processed = 0
+        self.error_count = 0
+        self.status = "Queued"
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        elapsed = None
+        if self.started_at:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "jobID": self.job_id,
+            "status": self.status,
+            "totalRows": self.total_rows,
+            "rowsProcessed": self.rows_processed,
+            "errorCount": self.error_count,
+            "elapsedSeconds": round(elapsed, 3) if elapsed is not None else None,
+            "rowsPerSec": round(self.rows_processed / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+class ImportJobRunner:
+    """Thread pool that runs metric imports outside the request cycle."""
+
+    def __init__(self):
+        self.app = None
+        self._executor = None
+        self._progress = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault("IMPORT_WORKERS", 2)
+        self.app = app
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(app.config["IMPORT_WORKERS"]),
+            thread_name_prefix="metric-import"
+        )
+        self.fail_orphaned_jobs()
+
+    def fail_orphaned_jobs(self):
+        """Mark jobs a previous process left Queued/Running as Failed; returns how many."""
+        try:
+            with db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(ORPHANED_JOBS_UPDATE)
+                orphaned = cursor.rowcount
+                conn.commit()
+                cursor.close()
+        except Exception as e:
+            self.app.logger.warning(f"Could not check for orphaned import jobs: {e}")
+            return 0
+        if orphaned:
+            self.app.logger.warning(f"Marked {orphaned} orphaned import job(s) as Failed")
+        return orphaned
+
+    def submit(self, job_id, metrics, chunk_size):
+        """Queue an import for a job row that was already created as 'Queued'."""
+        progress = ImportProgress(job_id, len(metrics))
+        with self._lock:
+            self._progress[job_id] = progress
+            while len(self._progress) > MAX_TRACKED_JOBS:
+                oldest_id, oldest = next(iter(self._progress.items()))
+                if oldest.finished_at is None:
+                    break
+                del self._progress[oldest_id]
+        self._executor.submit(self._run, progress, metrics, chunk_size)
+        return progress
+
+    def progress(self, job_id):
+        with self._lock:
+            progress = self._progress.get(job_id)
+            return progress.to_dict() if progress else None
+
+    def _run(self, progress, metrics, chunk_size):
+        logger = self.app.logger
+        job_id = progress.job_id
+        try:
+            with db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "UPDATE importJob SET status = 'Running', startTime = NOW() WHERE jobID = %s",
+                    (job_id,)
+                )
+                conn.commit()
+                progress.status = "Running"
+                progress.started_at = time.time()
+
+                def on_chunk(rows_done, errors_done):
+                    progress.rows_processed = rows_done
+                    progress.error_count = errors_done
+
+                inserted, error_count = run_metric_import(conn, job_id, metrics, chunk_size, logger, on_chunk)
+
+                status, _ = import_outcome(len(inserted), error_count)
+                finish_import_job(cursor, job_id, status, error_count)
+                conn.commit()
+                cursor.close()
+                progress.status = status
+        except Exception as e:
+            logger.error(f"Import job {job_id} failed: {e}")
+            progress.status = "Failed"
+            try:
+                with db.connection() as conn:
+                    cursor = conn.cursor()
+                    finish_import_job(cursor, job_id, "Failed", progress.total_rows - progress.rows_processed + progress.error_count)
+                    conn.commit()
+                    cursor.close()
+            except Exception as e2:
+                logger.error(f"Could not mark import job {job_id} as Failed: {e2}")
+        finally:
+            progress.finished_at = time.time()
+            response_cache.invalidate(METRIC)
+
+
+import_jobs = ImportJobRunner()
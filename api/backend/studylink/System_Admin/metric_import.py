@@ -0,0 +1,240 @@
+"""
+Batched insert helpers for metric imports
+Location: api/backend/studylink/System_Admin/metric_import.py
+
+Metrics are written with one multi-row INSERT per chunk instead of one
+round trip per row. InnoDB hands out consecutive auto-increment values to a
+single multi-row INSERT, so the generated metricIDs are recovered from
+LAST_INSERT_ID() and the session's auto_increment_increment.
+
+Streamed uploads (NDJSON/CSV) are parsed lazily by generators so only one
+chunk of rows is ever held in memory.
+"""
+
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+
+import pymysql
+from flask import current_app
+
+from backend.student_versions import bump_versions
+from backend.studylink.data_analyst import metric_rollup
+
+METRIC_COLUMNS = ["studentID", "courseID", "category", "privacyLevel", "description",
+                  "unit", "metricType", "metricName", "metricValue"]
+
+REQUIRED_METRIC_FIELDS = ["studentID", "category", "privacyLevel", "unit",
+                          "metricType", "metricName", "metricValue"]
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 10000
+
+
+def missing_metric_fields(m):
+    """Return the required fields that are absent or empty in a metric dict."""
+    return [f for f in REQUIRED_METRIC_FIELDS if m.get(f) in (None, "")]
+
+
+def normalize_metric(raw):
+    """
+    Validate one uploaded row and coerce it to insertable values.
+    Returns (metric, None) on success or (None, error message) on failure.
+    """
+    if not isinstance(raw, dict):
+        return None, "row is not an object"
+
+    metric = {c: (None if raw.get(c) == "" else raw.get(c)) for c in METRIC_COLUMNS}
+    missing = missing_metric_fields(metric)
+    if missing:
+        return None, f"missing {', '.join(missing)}"
+
+    try:
+        metric["studentID"] = int(metric["studentID"])
+        if metric["courseID"] is not None:
+            metric["courseID"] = int(metric["courseID"])
+    except (TypeError, ValueError):
+        return None, "studentID/courseID must be integers"
+
+    try:
+        metric["metricValue"] = Decimal(str(metric["metricValue"]))
+    except InvalidOperation:
+        return None, "metricValue must be numeric"
+    if not metric["metricValue"].is_finite():
+        return None, "metricValue must be finite"
+
+    return metric, None
+
+
+def iter_lines(stream, block_size=64 * 1024):
+    """
+    Yield decoded lines (newline included) from a binary stream, reading
+    fixed-size blocks so memory stays flat for any body size.
+    """
+    pending = b""
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        pending += block
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8", errors="replace") + "\n"
+    if pending:
+        yield pending.decode("utf-8", errors="replace")
+
+
+def iter_metric_rows(lines, fmt="ndjson"):
+    """
+    Parse NDJSON or CSV lines lazily, yielding (rowNumber, metric, error)
+    for every data row. Exactly one of metric/error is set.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # line_num is the physical line the row ended on (header is line 1)
+            yield (reader.line_num,) + normalize_metric(row)
+        return
+
+    for line_num, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            raw = json.loads(line)
+        except ValueError as e:
+            yield line_num, None, f"invalid JSON: {e.msg}"
+            continue
+        yield (line_num,) + normalize_metric(raw)
+
+
+def resolve_chunk_size(requested=None):
+    """Pick the chunk size from the request, falling back to IMPORT_CHUNK_SIZE."""
+    size = requested if requested not in (None, "") else current_app.config.get("IMPORT_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    return max(1, min(int(size), MAX_CHUNK_SIZE))
+
+
+def chunked(items, size):
+    """Yield lists of at most size items from any iterable."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def auto_increment_step(cursor):
+    cursor.execute("SELECT @@SESSION.auto_increment_increment AS step")
+    return int(cursor.fetchone()["step"])
+
+
+def insert_rows(cursor, table, columns, rows, step=1):
+    """
+    Insert rows with a single multi-row INSERT and return the generated
+    auto-increment ids in row order.
+    """
+    if not rows:
+        return []
+    placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ", ".join([placeholders] * len(rows))
+    cursor.execute(query, [value for row in rows for value in row])
+    first_id = cursor.lastrowid
+    return list(range(first_id, first_id + len(rows) * step, step))
+
+
+def insert_metric_chunk(cursor, job_id, metrics, step=1):
+    """
+    Insert a chunk of metrics, link them to an import job, roll them up by
+    day and bump the affected students' versions.
+    """
+    rows = [tuple(m.get(c) for c in METRIC_COLUMNS) for m in metrics]
+    metric_ids = insert_rows(cursor, "metric", METRIC_COLUMNS, rows, step)
+
+    # executemany rewrites this into multi-row INSERT statements
+    cursor.executemany(
+        "INSERT INTO ImportJob_Metric (jobID, metricID) VALUES (%s, %s)",
+        [(job_id, metric_id) for metric_id in metric_ids]
+    )
+    metric_rollup.add_metrics(cursor, metric_ids)
+    bump_versions(cursor, [m["studentID"] for m in metrics])
+    return metric_ids
+
+
+def log_row_errors(cursor, job_id, admin_id, errors, step=1):
+    """
+    Record per-row failures as ImportJobError/DataError pairs.
+    errors is a list of (rowNumber, message).
+    """
+    if not errors:
+        return
+    error_ids = insert_rows(cursor, "ImportJobError", ["jobID"], [(job_id,) for _ in errors], step)
+    cursor.executemany("""
+        INSERT INTO DataError (errorID, adminID, errorType, errorStatus)
+        VALUES (%s, %s, %s, %s)
+    """, [
+        (error_id, admin_id, f"Row {row_num}: {message}"[:100], "open")
+        for error_id, (row_num, message) in zip(error_ids, errors)
+    ])
+
+
+def run_metric_import(conn, job_id, metrics, chunk_size, logger, on_chunk=None):
+    """
+    Insert metrics chunk by chunk, committing each chunk on its own.
+    A failed chunk is rolled back and counted as errors; the rest continue.
+    on_chunk(rows_done, errors_done) is called after every chunk.
+    Returns (inserted metricIDs in order, error count).
+    """
+    cursor = conn.cursor()
+    step = auto_increment_step(cursor)
+    inserted_metric_ids = []
+    error_count = 0
+    rows_done = 0
+    for chunk in chunked(metrics, chunk_size):
+        try:
+            inserted_metric_ids.extend(insert_metric_chunk(cursor, job_id, chunk, step))
+            conn.commit()
+        except pymysql.MySQLError as e:
+            conn.rollback()
+            error_count += len(chunk)
+            logger.error(f"Metric import job {job_id}: chunk of {len(chunk)} failed: {e}")
+        rows_done += len(chunk)
+        if on_chunk:
+            on_chunk(rows_done, error_count)
+    cursor.close()
+    return inserted_metric_ids, error_count
+
+
+def import_outcome(inserted_count, failed_count, invalid_count=0):
+    """
+    (job status, HTTP status) for a chunked import. failed_count is rows
+    lost to database errors, invalid_count rows rejected by validation.
+    Chunks commit on their own, so once anything was inserted a later
+    failure is 'Partial' with a 200: a 5xx would invite a retry that
+    duplicates the committed rows. With nothing inserted, a database
+    failure is a 500, but an upload where every row was invalid is the
+    client's data and gets a 422 (retrying it would fail the same way).
+    """
+    if failed_count:
+        return ("Partial", 200) if inserted_count else ("Failed", 500)
+    if invalid_count and not inserted_count:
+        return "Failed", 422
+    return "Completed", 201
+
+
+def create_import_job(cursor, admin_id, job_type, status="Running"):
+    cursor.execute("""
+        INSERT INTO importJob (errorCount, jobType, startTime, endTime, status, adminID)
+        VALUES (0, %s, NOW(), NULL, %s, %s)
+    """, (job_type, status, admin_id))
+    return cursor.lastrowid
+
+
+def finish_import_job(cursor, job_id, status, error_count):
+    cursor.execute("""
+        UPDATE importJob
+        SET status = %s, errorCount = %s, endTime = NOW()
+        WHERE jobID = %s
+    """, (status, error_count, job_id))
@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from backend.db_connection import db
+from backend.studylink.student import grade_engine
 from flask import current_app
 
 advisor_bp = Blueprint('advisor', __name__, url_prefix='/api/advisor')
@@ -117,11 +118,6 @@ def get_advisor_students(advisor_id):
         
         cursor.close()
         
-        # Convert Decimal GPA to float for JSON
-        for student in students:
-            if student.get('GPA'):
-                student['GPA'] = float(student['GPA'])
-        
         return jsonify(students), 200
     except Exception as e:
         current_app.logger.error(f"Error fetching students: {e}")
@@ -160,11 +156,6 @@ def get_advisor_reports(advisor_id):
         reports = cursor.fetchall()
         cursor.close()
         
-        # Convert datetime to string for JSON
-        for report in reports:
-            if report.get('dateCreated'):
-                report['dateCreated'] = str(report['dateCreated'])
-        
         return jsonify(reports), 200
     except Exception as e:
         current_app.logger.error(f"Error fetching reports: {e}")
@@ -201,9 +192,6 @@ def get_report(report_id):
         if not report:
             return jsonify({"error": "Report not found"}), 404
         
-        if report.get('dateCreated'):
-            report['dateCreated'] = str(report['dateCreated'])
-        
         return jsonify(report), 200
     except Exception as e:
         current_app.logger.error(f"Error fetching report: {e}")
@@ -355,11 +343,32 @@ def get_student_reports(student_id):
         reports = cursor.fetchall()
         cursor.close()
         
-        for report in reports:
-            if report.get('dateCreated'):
-                report['dateCreated'] = str(report['dateCreated'])
-        
         return jsonify(reports), 200
     except Exception as e:
         current_app.logger.error(f"Error fetching student reports: {e}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+# ============================================
+# GRADE STANDINGS FOR EVERY STUDENT IN A COURSE
+# ============================================
+@advisor_bp.route("/courses/<int:course_id>/grades", methods=["GET"])
+def get_course_grade_standings(course_id):
+    """Return every enrolled student's weighted standing in a course in one call."""
+    try:
+        try:
+            target = grade_engine.parse_target(request.args.get('target'))
+        except ValueError:
+            return jsonify({"error": "target must be a number between 0 and 100"}), 400
+
+        cursor = db.get_db().cursor()
+        cursor.execute("SELECT courseID FROM CourseSelection WHERE courseID = %s", (course_id,))
+        if not cursor.fetchone():
+            cursor.close()
+            return jsonify({"error": "Course not found"}), 404
+
+        standings = grade_engine.course_standings(cursor, course_id, target)
+        cursor.close()
+        return jsonify(standings), 200
+    except Exception as e:
+        current_app.logger.error(f"Error computing course grade standings: {e}")
+        return jsonify({"error": str(e)}), 500
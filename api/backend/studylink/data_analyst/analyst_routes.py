@@ -8,6 +8,11 @@ FIXED: Removed strict date filters that were causing empty results
 
 from flask import Blueprint, request, jsonify, make_response, current_app
 from backend.db_connection import db
+from backend.response_cache import ASSIGNMENT, ENROLLMENT, METRIC, response_cache
+from backend.reminder_dispatcher import reminder_dispatcher
+from backend.columnar_export import export_response
+from backend.pagination import attach_next_cursor, decode_cursor, encode_cursor, page_limit
+from backend.studylink.data_analyst import cohorts
 
 # Create Blueprint
 analyst = Blueprint('analyst', __name__)
@@ -45,7 +50,10 @@ def health_check():
                 "metrics": metric_count['count'] if metric_count else 0,
                 "datasets": dataset_count['count'] if dataset_count else 0,
                 "study_summaries": summary_count['count'] if summary_count else 0
-            }
+            },
+            "pool": db.stats(),
+            "cache": response_cache.stats(),
+            "reminders": reminder_dispatcher.stats()
         }
         
         return make_response(jsonify(response_data), 200)
@@ -66,56 +74,52 @@ def health_check():
 def get_dashboard_summary():
     """
     1.1 - Get dashboard summarizing study time, sleep, and GPA
-    Returns student data with their most recent study summaries
+    Returns student data with their most recent study summaries, read from
+    the trigger-maintained StudentLatestSummary table. Keyset-paginated on
+    studentID (?limit=, ?cursor=; next cursor in X-Next-Cursor).
     """
     current_app.logger.info('GET /analyst/dashboard route')
-    cursor = db.get_db().cursor()
     
-    # FIXED: Removed date filter, get most recent summary per student
+    try:
+        limit = page_limit(default=50)
+        page_cursor = request.args.get('cursor')
+        after_id = decode_cursor(page_cursor, 1)[0] if page_cursor else 0
+    except ValueError:
+        return make_response(jsonify({"error": "Invalid limit or cursor"}), 400)
+    
+    cursor = db.get_db().cursor()
     query = '''
         SELECT
             s.studentID,
             CONCAT(s.fName, ' ', s.lName) AS studentName,
             s.GPA,
             s.riskFlag,
-            ss.periodStart,
-            ss.periodEnd,
-            ss.totalStudyHrs,
-            ss.avgStudyHrs,
-            ss.avgSleep
+            ls.periodStart,
+            ls.periodEnd,
+            ls.totalStudyHrs,
+            ls.avgStudyHrs,
+            ls.avgSleep
         FROM student s
-        LEFT JOIN StudySummary ss ON s.studentID = ss.studentID
-        WHERE ss.summaryID = (
-            SELECT ss2.summaryID 
-            FROM StudySummary ss2 
-            WHERE ss2.studentID = s.studentID 
-            ORDER BY ss2.periodStart DESC 
-            LIMIT 1
-        )
-        OR ss.summaryID IS NULL
+        LEFT JOIN StudentLatestSummary ls ON s.studentID = ls.studentID
+        WHERE s.studentID > %s
         ORDER BY s.studentID
-        LIMIT 50
+        LIMIT %s
     '''
+    cursor.execute(query, (after_id, limit + 1))
+    theData = cursor.fetchall()
     
-    try:
-        cursor.execute(query)
-        theData = cursor.fetchall()
-        current_app.logger.info(f'Dashboard returned {len(theData)} records')
-    except Exception as e:
-        current_app.logger.error(f'Dashboard query error: {str(e)}')
-        # Fallback to simpler query
-        cursor.execute('''
-            SELECT s.studentID, CONCAT(s.fName, ' ', s.lName) AS studentName,
-                   s.GPA, s.riskFlag, NULL as periodStart, NULL as periodEnd,
-                   NULL as totalStudyHrs, NULL as avgStudyHrs, NULL as avgSleep
-            FROM student s LIMIT 50
-        ''')
-        theData = cursor.fetchall()
+    next_cursor = None
+    if len(theData) > limit:
+        theData = theData[:limit]
+        next_cursor = encode_cursor(theData[-1]['studentID'])
     
-    return make_response(jsonify(theData), 200)
+    current_app.logger.info(f'Dashboard returned {len(theData)} records')
+    return attach_next_cursor(make_response(jsonify(theData), 200), next_cursor)
 
 
 @analyst.route('/dashboard/summary', methods=['GET'])
+# student and StudySummary only: expires with the TTL
+@response_cache.cached()
 def get_aggregate_summary():
     """
     1.1 - Get aggregate summary statistics across all students
@@ -177,6 +181,7 @@ def get_aggregate_summary():
 # ============================================================================
 
 @analyst.route('/engagement', methods=['GET'])
+@response_cache.cached(METRIC)
 def get_engagement_trends():
     """
     1.2 - Get daily and weekly engagement trends
@@ -184,19 +189,18 @@ def get_engagement_trends():
     current_app.logger.info('GET /analyst/engagement route')
     cursor = db.get_db().cursor()
     
-    # FIXED: Simplified query to ensure data returns
+    # Reads the per-day rollup, newest days first via idx_rollup_day
     query = '''
         SELECT
             s.studentID,
             CONCAT(s.fName, ' ', s.lName) AS student_name,
-            DATE(m.metricDate) AS metric_date,
-            WEEK(m.metricDate) AS week_number,
-            COUNT(DISTINCT m.metricID) AS daily_metric_entries,
-            SUM(CASE WHEN m.category = 'Study' THEN COALESCE(m.metricValue, 0) ELSE 0 END) AS total_study_hours
-        FROM student s
-        INNER JOIN metric m ON s.studentID = m.studentID
-        GROUP BY s.studentID, s.fName, s.lName, DATE(m.metricDate), WEEK(m.metricDate)
-        ORDER BY metric_date DESC
+            r.metricDay AS metric_date,
+            WEEK(r.metricDay) AS week_number,
+            r.entryCount AS daily_metric_entries,
+            r.studyHours AS total_study_hours
+        FROM metric_daily_rollup r
+        INNER JOIN student s ON s.studentID = r.studentID
+        ORDER BY r.metricDay DESC
         LIMIT 100
     '''
     
@@ -204,11 +208,6 @@ def get_engagement_trends():
         cursor.execute(query)
         theData = cursor.fetchall()
         
-        # Convert any Decimal values to float
-        for row in theData:
-            if 'total_study_hours' in row and row['total_study_hours'] is not None:
-                row['total_study_hours'] = float(row['total_study_hours'])
-                
         current_app.logger.info(f'Engagement returned {len(theData)} records')
         
     except Exception as e:
@@ -230,14 +229,13 @@ def get_student_engagement(student_id):
         SELECT
             s.studentID,
             CONCAT(s.fName, ' ', s.lName) AS student_name,
-            DATE(m.metricDate) AS metric_date,
-            COUNT(DISTINCT m.metricID) AS daily_metric_entries,
-            SUM(CASE WHEN m.category = 'Study' THEN COALESCE(m.metricValue, 0) ELSE 0 END) AS total_study_hours
+            r.metricDay AS metric_date,
+            COALESCE(r.entryCount, 0) AS daily_metric_entries,
+            COALESCE(r.studyHours, 0) AS total_study_hours
         FROM student s
-        LEFT JOIN metric m ON s.studentID = m.studentID
+        LEFT JOIN metric_daily_rollup r ON s.studentID = r.studentID
         WHERE s.studentID = %s
-        GROUP BY s.studentID, s.fName, s.lName, DATE(m.metricDate)
-        ORDER BY metric_date DESC
+        ORDER BY r.metricDay DESC
     '''
     
     cursor.execute(query, (student_id,))
@@ -253,15 +251,40 @@ def get_student_engagement(student_id):
 # STUDENT REPORT ROUTES (User Story 1.6)
 # ============================================================================
 
-@analyst.route('/students/<int:student_id>/report', methods=['GET'])
-def get_student_report(student_id):
+# Largest batch accepted by POST /analyst/students/reports/batch
+MAX_REPORT_BATCH = 500
+
+
+def _fetch_student_reports(cursor, student_ids):
     """
-    1.6 - Get comprehensive student report for advisor presentations
+    Build full reports for the given students in one round trip. Each CTE
+    pre-aggregates one child table for just these students, so the final
+    join is one row per student.
     """
-    current_app.logger.info(f'GET /analyst/students/{student_id}/report route')
-    cursor = db.get_db().cursor()
-    
-    query = '''
+    ids = ", ".join(["%s"] * len(student_ids))
+    query = f'''
+        WITH study AS (
+            SELECT studentID, AVG(avgStudyHrs) AS avg_daily_study, AVG(avgSleep) AS avg_sleep_hours
+            FROM StudySummary WHERE studentID IN ({ids})
+            GROUP BY studentID
+        ),
+        courses AS (
+            SELECT studentID, COUNT(*) AS enrolled_courses
+            FROM CourseSelectionStudent WHERE studentID IN ({ids})
+            GROUP BY studentID
+        ),
+        events AS (
+            SELECT studentID, COUNT(*) AS events_attended
+            FROM attEvent WHERE studentID IN ({ids})
+            GROUP BY studentID
+        ),
+        scores AS (
+            SELECT css.studentID, AVG(a.scoreReceived) AS avg_assignment_score
+            FROM CourseSelectionStudent css
+            INNER JOIN assignment a ON a.courseID = css.courseID AND a.status = 'graded'
+            WHERE css.studentID IN ({ids})
+            GROUP BY css.studentID
+        )
         SELECT
             s.studentID,
             CONCAT(s.fName, ' ', s.lName) AS student_name,
@@ -278,67 +301,92 @@ def get_student_report(student_id):
                 WHEN s.riskFlag = 1 THEN 'At Risk'
                 WHEN s.GPA < 2.5 THEN 'Warning'
                 ELSE 'Good Standing'
-            END AS status_summary
+            END AS status_summary,
+            COALESCE(study.avg_daily_study, 0) AS avg_daily_study,
+            COALESCE(study.avg_sleep_hours, 0) AS avg_sleep_hours,
+            COALESCE(courses.enrolled_courses, 0) AS enrolled_courses,
+            COALESCE(events.events_attended, 0) AS events_attended,
+            COALESCE(scores.avg_assignment_score, 0) AS avg_assignment_score
         FROM student s
         LEFT JOIN advisor a ON s.advisorID = a.advisorID
-        WHERE s.studentID = %s
+        LEFT JOIN study ON study.studentID = s.studentID
+        LEFT JOIN courses ON courses.studentID = s.studentID
+        LEFT JOIN events ON events.studentID = s.studentID
+        LEFT JOIN scores ON scores.studentID = s.studentID
+        WHERE s.studentID IN ({ids})
     '''
-    
-    cursor.execute(query, (student_id,))
-    theData = cursor.fetchone()
-    
-    if not theData:
+    cursor.execute(query, list(student_ids) * 5)
+    return cursor.fetchall()
+
+
+@analyst.route('/students/<int:student_id>/report', methods=['GET'])
+def get_student_report(student_id):
+    """
+    1.6 - Get comprehensive student report for advisor presentations
+    """
+    current_app.logger.info(f'GET /analyst/students/{student_id}/report route')
+    cursor = db.get_db().cursor()
+
+    reports = _fetch_student_reports(cursor, [student_id])
+    if not reports:
         return make_response(jsonify({"message": "Student not found"}), 404)
-    
-    # Add additional stats via separate queries
+
+    return make_response(jsonify(reports[0]), 200)
+
+
+@analyst.route('/students/reports/batch', methods=['POST'])
+def get_student_reports_batch():
+    """
+    1.6 - Get comprehensive reports for a list of students in one request
+    Body: {"studentIDs": [1, 2, 3]}
+    """
+    current_app.logger.info('POST /analyst/students/reports/batch route')
+
+    data = request.get_json(silent=True) or {}
+    student_ids = data.get('studentIDs')
+    if not isinstance(student_ids, list) or not student_ids:
+        return make_response(jsonify({"error": "studentIDs must be a non-empty list"}), 400)
     try:
-        # Get study summary stats
-        cursor.execute('''
-            SELECT AVG(avgStudyHrs) as avg_daily_study, AVG(avgSleep) as avg_sleep_hours
-            FROM StudySummary WHERE studentID = %s
-        ''', (student_id,))
-        study_stats = cursor.fetchone()
-        if study_stats:
-            theData['avg_daily_study'] = float(study_stats['avg_daily_study'] or 0)
-            theData['avg_sleep_hours'] = float(study_stats['avg_sleep_hours'] or 0)
-        
-        # Get course count
-        cursor.execute('''
-            SELECT COUNT(*) as enrolled_courses 
-            FROM CourseSelectionStudent WHERE studentID = %s
-        ''', (student_id,))
-        course_count = cursor.fetchone()
-        theData['enrolled_courses'] = course_count['enrolled_courses'] if course_count else 0
-        
-        # Get events attended
-        cursor.execute('''
-            SELECT COUNT(*) as events_attended 
-            FROM attEvent WHERE studentID = %s
-        ''', (student_id,))
-        events = cursor.fetchone()
-        theData['events_attended'] = events['events_attended'] if events else 0
-        
-        # Get avg assignment score
-        cursor.execute('''
-            SELECT AVG(a.scoreReceived) as avg_assignment_score
-            FROM assignment a
-            INNER JOIN CourseSelectionStudent css ON a.courseID = css.courseID
-            WHERE css.studentID = %s AND a.status = 'graded'
-        ''', (student_id,))
-        scores = cursor.fetchone()
-        theData['avg_assignment_score'] = float(scores['avg_assignment_score'] or 0) if scores else 0
-        
+        # Dedupe but keep the caller's order for the response
+        student_ids = list(dict.fromkeys(int(sid) for sid in student_ids))
+    except (TypeError, ValueError):
+        return make_response(jsonify({"error": "studentIDs must be integers"}), 400)
+    if len(student_ids) > MAX_REPORT_BATCH:
+        return make_response(jsonify({"error": f"At most {MAX_REPORT_BATCH} studentIDs per request"}), 400)
+
+    try:
+        cursor = db.get_db().cursor()
+        by_id = {row['studentID']: row for row in _fetch_student_reports(cursor, student_ids)}
     except Exception as e:
-        current_app.logger.error(f'Error fetching additional stats: {str(e)}')
-    
-    # Convert GPA to float
-    if 'GPA' in theData and theData['GPA'] is not None:
-        theData['GPA'] = float(theData['GPA'])
-    
-    return make_response(jsonify(theData), 200)
+        current_app.logger.error(f'Batch report query error: {str(e)}')
+        return make_response(jsonify({"error": str(e)}), 500)
+
+    return make_response(jsonify({
+        "reports": [by_id[sid] for sid in student_ids if sid in by_id],
+        "notFound": [sid for sid in student_ids if sid not in by_id]
+    }), 200)
+
+
+STUDENT_REPORTS_QUERY = '''
+    SELECT
+        s.studentID,
+        CONCAT(s.fName, ' ', s.lName) AS student_name,
+        s.major,
+        s.GPA,
+        s.riskFlag,
+        CASE
+            WHEN s.riskFlag = 1 THEN 'At Risk'
+            WHEN s.GPA < 2.5 THEN 'Warning'
+            ELSE 'Good Standing'
+        END AS status_summary
+    FROM student s
+    ORDER BY s.riskFlag DESC, s.GPA ASC
+'''
 
 
 @analyst.route('/students/reports', methods=['GET'])
+# student only: expires with the TTL
+@response_cache.cached()
 def get_all_student_reports():
     """
     1.6 - Get summary reports for all students (for export)
@@ -346,30 +394,60 @@ def get_all_student_reports():
     current_app.logger.info('GET /analyst/students/reports route')
     cursor = db.get_db().cursor()
     
-    query = '''
-        SELECT
-            s.studentID,
-            CONCAT(s.fName, ' ', s.lName) AS student_name,
-            s.major,
-            s.GPA,
-            s.riskFlag,
-            CASE
-                WHEN s.riskFlag = 1 THEN 'At Risk'
-                WHEN s.GPA < 2.5 THEN 'Warning'
-                ELSE 'Good Standing'
-            END AS status_summary
-        FROM student s
-        ORDER BY s.riskFlag DESC, s.GPA ASC
-    '''
-    
-    cursor.execute(query)
+    cursor.execute(STUDENT_REPORTS_QUERY)
     theData = cursor.fetchall()
     
-    # Convert Decimal GPA to float
-    for row in theData:
-        if 'GPA' in row and row['GPA'] is not None:
-            row['GPA'] = float(row['GPA'])
-    
     current_app.logger.info(f'Student reports returned {len(theData)} records')
     
-    return make_response(jsonify(theData), 200)
\ No newline at end of file
+    return make_response(jsonify(theData), 200)
+
+
+@analyst.route('/students/reports/export', methods=['GET'])
+def export_student_reports():
+    """
+    1.6 - The student report summaries as a file: ?format=arrow (default)
+    or ?format=parquet
+    """
+    current_app.logger.info('GET /analyst/students/reports/export route')
+    return export_response(STUDENT_REPORTS_QUERY, (), "student_reports")
+
+
+# ============================================================================
+# COHORT COMPARISON ROUTES (User Story 1.6)
+# ============================================================================
+
+def _cohort_cache_key():
+    return cohorts.definition_hash(request.get_json(silent=True))
+
+
+@analyst.route('/cohorts/compare', methods=['POST'])
+@response_cache.cached(ASSIGNMENT, ENROLLMENT, key=_cohort_cache_key)
+def compare_cohorts():
+    """
+    1.6 - Compare GPA, study hours, sleep and assignment score distributions
+    across cohorts of students
+    Body: {"cohorts": [{"name": "CS 2024", "filters": {"major": "Computer Science",
+           "enrollmentYear": [2024], "GPA": {"min": 2.0, "max": 4.0}}}, ...],
+           "bins": 10}
+    Identical definitions are answered from the cache.
+    """
+    current_app.logger.info('POST /analyst/cohorts/compare route')
+
+    body = request.get_json(silent=True)
+    try:
+        definitions, bins = cohorts.parse_cohorts(body)
+        query, params = cohorts.cohort_query(definitions)
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
+
+    try:
+        cursor = db.get_db().cursor()
+        cursor.execute(query, params)
+        result = cohorts.compare(cursor.fetchall(), definitions, bins)
+    except Exception as e:
+        current_app.logger.error(f'Cohort comparison error: {str(e)}')
+        return make_response(jsonify({"error": str(e)}), 500)
+
+    result["definitionHash"] = cohorts.definition_hash(body)
+    current_app.logger.info(f'Compared {len(definitions)} cohorts over {result["students"]} students')
+    return make_response(jsonify(result), 200)
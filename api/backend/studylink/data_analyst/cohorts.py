@@ -0,0 +1,239 @@
+"""
+Cohort comparison over student outcome distributions
+Location: api/backend/studylink/data_analyst/cohorts.py
+
+A cohort is a set of filters over student columns, e.g.
+{"major": "Computer Science", "enrollmentYear": [2023, 2024],
+"GPA": {"min": 3.0}}. One query joins every matching student to their
+study, sleep and assignment-score averages and returns a 0/1 membership
+column per cohort, so cohorts may overlap. The statistics for all cohorts
+are then computed together: counts and means are matrix products of the
+(cohorts x students) membership matrix, quantiles run along one axis of
+a masked 2-D array, and histograms share bin edges per metric so cohorts
+can be compared bin for bin.
+"""
+
+import hashlib
+import json
+import warnings
+
+import numpy as np
+
+MAX_COHORTS = 20
+DEFAULT_BINS = 10
+MAX_BINS = 50
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# Filterable student columns and how their values are checked
+COHORT_COLUMNS = {
+    "major": "text",
+    "minor": "text",
+    "enrollmentStatus": "text",
+    "enrollmentYear": "number",
+    "GPA": "number",
+    "totalCredits": "number",
+    "advisorID": "number",
+    "riskFlag": "bool",
+}
+
+# Response name -> column of the joined query
+METRICS = {
+    "GPA": "GPA",
+    "studyHours": "studyHours",
+    "sleepHours": "sleepHours",
+    "assignmentScore": "assignmentScore",
+}
+
+COHORT_ROWS_QUERY = '''
+    SELECT
+        s.studentID,
+        s.GPA,
+        study.studyHours,
+        study.sleepHours,
+        scores.assignmentScore,
+        {membership}
+    FROM student s
+    LEFT JOIN (
+        SELECT studentID, AVG(avgStudyHrs) AS studyHours, AVG(avgSleep) AS sleepHours
+        FROM StudySummary
+        GROUP BY studentID
+    ) study ON study.studentID = s.studentID
+    LEFT JOIN (
+        SELECT css.studentID, AVG(a.scoreReceived) AS assignmentScore
+        FROM CourseSelectionStudent css
+        INNER JOIN assignment a ON a.courseID = css.courseID AND a.scoreReceived IS NOT NULL
+        GROUP BY css.studentID
+    ) scores ON scores.studentID = s.studentID
+    WHERE {any_cohort}
+'''
+
+
+def definition_hash(body):
+    """Stable hash of a request body; key order does not matter."""
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _check_value(column, kind, value):
+    if kind == "bool":
+        if not isinstance(value, (bool, int)):
+            raise ValueError(f"{column} must be true or false")
+        return bool(value)
+    if kind == "number":
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{column} values must be numbers")
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"{column} values must be strings")
+    return value
+
+
+def _filter_sql(filters):
+    """(SQL condition, params) for one cohort's filters; {} matches every student."""
+    if not isinstance(filters, dict):
+        raise ValueError("filters must be an object of column: value")
+    conditions, params = [], []
+    for column, value in sorted(filters.items()):
+        kind = COHORT_COLUMNS.get(column)
+        if kind is None:
+            raise ValueError(f"Cannot filter on '{column}'; use one of {', '.join(COHORT_COLUMNS)}")
+        if value is None:
+            conditions.append(f"s.{column} IS NULL")
+        elif isinstance(value, list):
+            if not value:
+                raise ValueError(f"{column} needs at least one value")
+            conditions.append(f"s.{column} IN ({', '.join(['%s'] * len(value))})")
+            params.extend(_check_value(column, kind, v) for v in value)
+        elif isinstance(value, dict):
+            if kind != "number" or not value or set(value) - {"min", "max"}:
+                raise ValueError(f"{column} ranges take 'min' and/or 'max' and need a numeric column")
+            if "min" in value:
+                conditions.append(f"s.{column} >= %s")
+                params.append(_check_value(column, kind, value["min"]))
+            if "max" in value:
+                conditions.append(f"s.{column} <= %s")
+                params.append(_check_value(column, kind, value["max"]))
+        else:
+            conditions.append(f"s.{column} = %s")
+            params.append(_check_value(column, kind, value))
+    return (" AND ".join(conditions) if conditions else "TRUE"), params
+
+
+def parse_cohorts(body):
+    """
+    [{name, filters}] from {"cohorts": [...], "bins": N}, plus the bin
+    count. Raises ValueError on anything malformed.
+    """
+    cohorts = body.get("cohorts") if isinstance(body, dict) else None
+    if not isinstance(cohorts, list) or not cohorts:
+        raise ValueError("cohorts must be a non-empty list")
+    if len(cohorts) > MAX_COHORTS:
+        raise ValueError(f"At most {MAX_COHORTS} cohorts per comparison")
+    bins = body.get("bins", DEFAULT_BINS)
+    if isinstance(bins, bool) or not isinstance(bins, int) or not 1 <= bins <= MAX_BINS:
+        raise ValueError(f"bins must be an integer between 1 and {MAX_BINS}")
+
+    parsed = []
+    for i, cohort in enumerate(cohorts):
+        if not isinstance(cohort, dict):
+            raise ValueError("Each cohort must be an object with 'filters'")
+        name = str(cohort.get("name") or f"Cohort {i + 1}")
+        parsed.append({"name": name, "filters": cohort.get("filters") or {}})
+    return parsed, bins
+
+
+def cohort_query(cohorts):
+    """The joined query with one cohort_<i> membership column per cohort."""
+    membership, any_cohort, params = [], [], []
+    for i, cohort in enumerate(cohorts):
+        condition, condition_params = _filter_sql(cohort["filters"])
+        membership.append(f"COALESCE(({condition}), FALSE) AS cohort_{i}")
+        any_cohort.append(f"({condition})")
+        params.extend(condition_params)
+    query = COHORT_ROWS_QUERY.format(membership=",\n        ".join(membership),
+                                     any_cohort=" OR ".join(any_cohort))
+    # The conditions appear twice: once as membership columns, once in WHERE
+    return query, params * 2
+
+
+def _floats(values, digits=4):
+    return [None if np.isnan(v) else round(float(v), digits) for v in values]
+
+
+def _edges(values, bins):
+    """bins equal-width bins over the observed range, shared by every cohort."""
+    observed = values[~np.isnan(values)]
+    if not observed.size:
+        return np.linspace(0.0, 1.0, bins + 1)
+    low, high = float(observed.min()), float(observed.max())
+    if low == high:
+        high = low + 1.0
+    return np.linspace(low, high, bins + 1)
+
+
+def _metric_stats(values, members, bins):
+    """Per-cohort stats for one metric; values (students,), members (cohorts, students)."""
+    edges = _edges(values, bins)
+    if not values.size:
+        # No student matched any cohort: the reductions below need a column
+        empty = {
+            "count": 0,
+            "mean": None,
+            "std": None,
+            "min": None,
+            "max": None,
+            "quantiles": {f"p{int(q * 100)}": None for q in QUANTILES},
+            "histogram": [0] * bins,
+        }
+        return [dict(empty, quantiles=dict(empty["quantiles"])) for _ in range(members.shape[0])], _floats(edges)
+
+    valid = members & ~np.isnan(values)
+    weights = valid.astype(np.float64)
+    filled = np.nan_to_num(values)
+
+    count = valid.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (weights @ filled) / count
+        std = np.sqrt(np.maximum((weights @ (filled * filled)) / count - mean * mean, 0.0))
+
+    masked = np.where(valid, values, np.nan)
+    with warnings.catch_warnings():
+        # Cohorts with no values for this metric come back as NaN -> null
+        warnings.simplefilter("ignore", RuntimeWarning)
+        low = np.nanmin(masked, axis=1)
+        high = np.nanmax(masked, axis=1)
+        quantiles = np.nanquantile(masked, QUANTILES, axis=1)
+
+    slot = np.clip(np.searchsorted(edges, filled, side="right") - 1, 0, bins - 1)
+    one_hot = (slot[:, None] == np.arange(bins)) & ~np.isnan(values)[:, None]
+    histograms = valid.astype(np.int64) @ one_hot.astype(np.int64)
+
+    stats = []
+    for c in range(members.shape[0]):
+        stats.append({
+            "count": int(count[c]),
+            "mean": _floats([mean[c]])[0],
+            "std": _floats([std[c]])[0],
+            "min": _floats([low[c]])[0],
+            "max": _floats([high[c]])[0],
+            "quantiles": dict(zip((f"p{int(q * 100)}" for q in QUANTILES), _floats(quantiles[:, c]))),
+            "histogram": histograms[c].tolist(),
+        })
+    return stats, _floats(edges)
+
+
+def compare(rows, cohorts, bins):
+    """Distribution of every metric for every cohort from cohort_query's rows."""
+    members = np.array([[bool(row[f"cohort_{i}"]) for row in rows] for i in range(len(cohorts))],
+                       dtype=bool).reshape(len(cohorts), len(rows))
+
+    results = [{"name": c["name"], "filters": c["filters"], "size": int(members[i].sum()), "metrics": {}}
+               for i, c in enumerate(cohorts)]
+    edges = {}
+    for metric, column in METRICS.items():
+        values = np.array([np.nan if row[column] is None else float(row[column]) for row in rows],
+                          dtype=np.float64)
+        stats, edges[metric] = _metric_stats(values, members, bins)
+        for result, metric_stats in zip(results, stats):
+            result["metrics"][metric] = metric_stats
+    return {"students": len(rows), "binEdges": edges, "cohorts": results}
@@ -0,0 +1,57 @@
+"""
+Incremental maintenance of metric_daily_rollup
+Location: api/backend/studylink/data_analyst/metric_rollup.py
+
+metric_daily_rollup holds one row per (studentID, day) with the number of
+metric entries and the summed 'Study' hours, so the engagement endpoints read
+one row per day shown instead of grouping raw metrics. Writers call
+add_metrics() with sign=+1 after inserting metrics, or sign=-1 before
+updating/deleting them, in the same transaction as the metric change.
+"""
+
+# Per-day contribution of a set of metric rows, scaled by +1 or -1 and merged
+# into the rollup. The derived table lets ON DUPLICATE KEY UPDATE refer to the
+# new values without the deprecated VALUES() function.
+ROLLUP_MERGE = '''
+    INSERT INTO metric_daily_rollup (studentID, metricDay, entryCount, studyHours)
+    SELECT studentID, metricDay, entryCount, studyHours FROM (
+        SELECT
+            m.studentID,
+            DATE(m.metricDate) AS metricDay,
+            %s * COUNT(*) AS entryCount,
+            %s * SUM(CASE WHEN m.category = 'Study' THEN COALESCE(m.metricValue, 0) ELSE 0 END) AS studyHours
+        FROM metric m
+        WHERE {where}
+        GROUP BY m.studentID, DATE(m.metricDate)
+    ) AS delta
+    ON DUPLICATE KEY UPDATE
+        entryCount = metric_daily_rollup.entryCount + delta.entryCount,
+        studyHours = metric_daily_rollup.studyHours + delta.studyHours
+'''
+
+
+def add_metrics(cursor, metric_ids, sign=1):
+    """Add (sign=1) or subtract (sign=-1) the given metrics from the rollup."""
+    if not metric_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(metric_ids))
+    cursor.execute(ROLLUP_MERGE.format(where=f"m.metricID IN ({placeholders})"),
+                   [sign, sign] + list(metric_ids))
+    if sign < 0:
+        cursor.execute(f'''
+            DELETE r FROM metric_daily_rollup r
+            JOIN (SELECT DISTINCT studentID FROM metric WHERE metricID IN ({placeholders})) m
+              ON r.studentID = m.studentID
+            WHERE r.entryCount <= 0
+        ''', list(metric_ids))
+
+
+def rebuild(cursor, student_id=None):
+    """Recompute the rollup from metric, for one student or for everyone."""
+    if student_id is None:
+        cursor.execute("DELETE FROM metric_daily_rollup")
+        cursor.execute(ROLLUP_MERGE.format(where="1 = 1"), (1, 1))
+    else:
+        cursor.execute("DELETE FROM metric_daily_rollup WHERE studentID = %s", (student_id,))
+        cursor.execute(ROLLUP_MERGE.format(where="m.studentID = %s"), (1, 1, student_id))
+    return cursor.rowcount
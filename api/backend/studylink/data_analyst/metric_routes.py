@@ -4,29 +4,33 @@ Location: api/backend/studylink/data_analyst/metric_routes.py
 User Stories: 1.1, 1.2, 1.3, 1.4
 """
 
+import datetime
+
 from flask import Blueprint, request, jsonify, make_response, current_app
 from backend.db_connection import db
+from backend.response_cache import ASSIGNMENT, METRIC, response_cache
+from backend.student_versions import bump_versions, students_for_assignment
+from backend.studylink.data_analyst import metric_rollup
+from backend.studylink.data_analyst.metric_series import BUCKETS, MIN_POINTS, build_series, series_query
+from backend.columnar_export import export_response
+from backend.streaming import stream_query, wants_ndjson
+from backend.pagination import attach_next_cursor, decode_cursor, encode_cursor, page_limit
 
 # Create Blueprint
 metrics = Blueprint('metrics', __name__)
 
+# Limits for GET /data/metrics/series
+MAX_SERIES_STUDENTS = 50
+MAX_SERIES_POINTS = 5000
+DEFAULT_SERIES_DAYS = 30
+
 
 # ============================================================================
 # METRICS ROUTES (User Stories 1.1, 1.2, 1.3, 1.4)
 # ============================================================================
 
-@metrics.route('/metrics', methods=['GET'])
-def get_metrics():
-    """
-    1.1/1.2 - Retrieve metric data with optional filtering
-    """
-    current_app.logger.info('GET /data/metrics route')
-    cursor = db.get_db().cursor()
-    
-    student_id = request.args.get('studentID', None)
-    category = request.args.get('category', None)
-    metric_type = request.args.get('metricType', None)
-    
+def _metric_list_query(student_id, category, metric_type):
+    """The metric list SELECT with the optional filters applied (no ORDER BY)."""
     query = '''
         SELECT
             m.metricID,
@@ -56,19 +60,136 @@ def get_metrics():
     if metric_type and metric_type != 'All':
         query += " AND m.metricType = %s"
         params.append(metric_type)
+    return query, params
+
+
+@metrics.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    1.1/1.2 - Retrieve metric data with optional filtering
+    Keyset-paginated on (metricDate, metricID), newest first. Pass the
+    X-Next-Cursor header from one page as ?cursor= to get the next one.
+    """
+    current_app.logger.info('GET /data/metrics route')
+    cursor = db.get_db().cursor()
+    
+    student_id = request.args.get('studentID', None)
+    category = request.args.get('category', None)
+    metric_type = request.args.get('metricType', None)
+    page_cursor = request.args.get('cursor', None)
+    
+    try:
+        limit = page_limit()
+        after = decode_cursor(page_cursor, 2) if page_cursor else None
+    except ValueError:
+        return make_response(jsonify({"error": "Invalid limit or cursor"}), 400)
+    
+    query, params = _metric_list_query(student_id, category, metric_type)
+    if after:
+        # Seek past the last row of the previous page instead of OFFSET
+        query += " AND (m.metricDate < %s OR (m.metricDate = %s AND m.metricID < %s))"
+        params.extend([after[0], after[0], after[1]])
         
-    query += " ORDER BY m.metricDate DESC LIMIT 100"
+    # Fetch one extra row to learn whether another page exists
+    query += " ORDER BY m.metricDate DESC, m.metricID DESC LIMIT %s"
+    params.append(limit + 1)
     
     cursor.execute(query, params)
     theData = cursor.fetchall()
     
-    # Convert Decimal to float for JSON
-    for row in theData:
-        if 'metricValue' in row and row['metricValue'] is not None:
-            row['metricValue'] = float(row['metricValue'])
+    next_cursor = None
+    if len(theData) > limit:
+        theData = theData[:limit]
+        last = theData[-1]
+        next_cursor = encode_cursor(last['metricDate'], last['metricID'])
     
     current_app.logger.info(f'Metrics returned {len(theData)} records')
-    return make_response(jsonify(theData), 200)
+    return attach_next_cursor(make_response(jsonify(theData), 200), next_cursor)
+
+
+@metrics.route('/metrics/export', methods=['GET'])
+def export_metrics():
+    """
+    1.1/1.2 - Every metric matching the GET /metrics filters as one file:
+    ?format=arrow (default) or ?format=parquet
+    """
+    current_app.logger.info('GET /data/metrics/export route')
+    query, params = _metric_list_query(
+        request.args.get('studentID'), request.args.get('category'), request.args.get('metricType')
+    )
+    return export_response(query + " ORDER BY m.metricDate DESC, m.metricID DESC", params, "metrics")
+
+
+def _series_bound(value, end=False):
+    """ISO date or datetime; a bare end date includes that whole day."""
+    parsed = datetime.datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += datetime.timedelta(days=1)
+    return parsed
+
+
+@metrics.route('/metrics/series', methods=['GET'])
+@response_cache.cached(METRIC)
+def get_metric_series():
+    """
+    1.2 - One metric over time, bucketed server-side for charting
+    ?studentID=1&studentID=2 (or 1,2), ?metricName=, ?start=/?end= (ISO
+    dates or datetimes, default the last 30 days), ?bucket=hour|day|week
+    (default day) and optional ?points=N to downsample each student's
+    series to at most N buckets with LTTB.
+    """
+    current_app.logger.info('GET /data/metrics/series route')
+
+    metric_name = request.args.get('metricName')
+    bucket = request.args.get('bucket', 'day')
+    if not metric_name:
+        return make_response(jsonify({"error": "metricName is required"}), 400)
+    if bucket not in BUCKETS:
+        return make_response(jsonify({"error": f"bucket must be one of {', '.join(BUCKETS)}"}), 400)
+
+    try:
+        raw_ids = [part for value in request.args.getlist('studentID') for part in value.split(',') if part.strip()]
+        student_ids = list(dict.fromkeys(int(sid) for sid in raw_ids))
+    except ValueError:
+        return make_response(jsonify({"error": "studentID must be an integer"}), 400)
+    if not student_ids:
+        return make_response(jsonify({"error": "At least one studentID is required"}), 400)
+    if len(student_ids) > MAX_SERIES_STUDENTS:
+        return make_response(jsonify({"error": f"At most {MAX_SERIES_STUDENTS} students per series request"}), 400)
+
+    try:
+        end = (_series_bound(request.args['end'], end=True) if request.args.get('end')
+               else datetime.datetime.combine(datetime.date.today() + datetime.timedelta(days=1), datetime.time()))
+        start = (_series_bound(request.args['start']) if request.args.get('start')
+                 else end - datetime.timedelta(days=DEFAULT_SERIES_DAYS))
+    except ValueError:
+        return make_response(jsonify({"error": "start and end must be ISO dates or datetimes"}), 400)
+    try:
+        points = int(request.args['points']) if request.args.get('points') else None
+    except ValueError:
+        return make_response(jsonify({"error": "points must be an integer"}), 400)
+    if start >= end:
+        return make_response(jsonify({"error": "start must be before end"}), 400)
+    if points is not None and not MIN_POINTS <= points <= MAX_SERIES_POINTS:
+        return make_response(jsonify({"error": f"points must be between {MIN_POINTS} and {MAX_SERIES_POINTS}"}), 400)
+
+    try:
+        cursor = db.get_db().cursor()
+        cursor.execute(series_query(len(student_ids), bucket), student_ids + [metric_name, start, end])
+        series = build_series(cursor.fetchall(), student_ids, points)
+    except Exception as e:
+        current_app.logger.error(f'Metric series query error: {str(e)}')
+        return make_response(jsonify({"error": str(e)}), 500)
+
+    current_app.logger.info(f'Metric series returned {sum(len(s["points"]) for s in series)} points')
+    return make_response(jsonify({
+        "metricName": metric_name,
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        "points": points,
+        "series": series
+    }), 200)
 
 
 @metrics.route('/metrics/<int:metric_id>', methods=['GET'])
@@ -101,9 +222,6 @@ def get_metric(metric_id):
     if not theData:
         return make_response(jsonify({"error": "Metric not found"}), 404)
     
-    if 'metricValue' in theData and theData['metricValue'] is not None:
-        theData['metricValue'] = float(theData['metricValue'])
-    
     return make_response(jsonify(theData), 200)
 
 
@@ -140,9 +258,12 @@ def create_metric():
         data['metricName'],
         data['metricValue']
     ))
+    new_id = cursor.lastrowid
+    metric_rollup.add_metrics(cursor, [new_id])
+    bump_versions(cursor, [data['studentID']])
     db.get_db().commit()
+    response_cache.invalidate(METRIC)
     
-    new_id = cursor.lastrowid
     return make_response(jsonify({"message": "Metric created", "metricID": new_id}), 201)
 
 
@@ -158,7 +279,7 @@ def update_metric(metric_id):
     cursor = db.get_db().cursor()
     
     # Check if metric exists
-    cursor.execute("SELECT metricID, description FROM metric WHERE metricID = %s", (metric_id,))
+    cursor.execute("SELECT metricID, studentID, description FROM metric WHERE metricID = %s", (metric_id,))
     existing = cursor.fetchone()
     
     if not existing:
@@ -188,8 +309,13 @@ def update_metric(metric_id):
     params.append(metric_id)
     query = f"UPDATE metric SET {', '.join(updates)} WHERE metricID = %s"
     
+    # Swap this metric's old contribution to the daily rollup for the new one
+    metric_rollup.add_metrics(cursor, [metric_id], sign=-1)
     cursor.execute(query, params)
+    metric_rollup.add_metrics(cursor, [metric_id])
+    bump_versions(cursor, [existing['studentID']])
     db.get_db().commit()
+    response_cache.invalidate(METRIC)
     
     return make_response(jsonify({"message": "Metric updated"}), 200)
 
@@ -200,12 +326,16 @@ def delete_metric(metric_id):
     current_app.logger.info(f'DELETE /data/metrics/{metric_id} route')
     cursor = db.get_db().cursor()
     
-    cursor.execute("SELECT metricID FROM metric WHERE metricID = %s", (metric_id,))
-    if not cursor.fetchone():
+    cursor.execute("SELECT metricID, studentID FROM metric WHERE metricID = %s", (metric_id,))
+    existing = cursor.fetchone()
+    if not existing:
         return make_response(jsonify({"error": "Metric not found"}), 404)
     
+    metric_rollup.add_metrics(cursor, [metric_id], sign=-1)
     cursor.execute("DELETE FROM metric WHERE metricID = %s", (metric_id,))
+    bump_versions(cursor, [existing['studentID']])
     db.get_db().commit()
+    response_cache.invalidate(METRIC)
     
     return make_response(jsonify({"message": "Metric deleted"}), 200)
 
@@ -301,9 +431,11 @@ def update_data_error(error_id, admin_id):
 
 @metrics.route('/assignments', methods=['GET'])
 def get_assignments():
-    """1.2/1.6 - Retrieve assignment data"""
+    """
+    1.2/1.6 - Retrieve assignment data (the 100 most recent). With
+    ?format=ndjson every matching assignment is streamed, one per line.
+    """
     current_app.logger.info('GET /data/assignments route')
-    cursor = db.get_db().cursor()
     
     course_id = request.args.get('courseID', None)
     status = request.args.get('status', None)
@@ -339,20 +471,11 @@ def get_assignments():
         query += " AND a.assignmentType = %s"
         params.append(assignment_type)
         
-    query += " ORDER BY a.assignmentDate DESC LIMIT 100"
-    
-    cursor.execute(query, params)
-    theData = cursor.fetchall()
+    query += " ORDER BY a.assignmentDate DESC"
+    if not wants_ndjson():
+        query += " LIMIT 100"
     
-    # Convert Decimal to float
-    for row in theData:
-        if 'scoreReceived' in row and row['scoreReceived'] is not None:
-            row['scoreReceived'] = float(row['scoreReceived'])
-        if 'weight' in row and row['weight'] is not None:
-            row['weight'] = float(row['weight'])
-    
-    current_app.logger.info(f'Assignments returned {len(theData)} records')
-    return make_response(jsonify(theData), 200)
+    return stream_query(query, params)
 
 
 @metrics.route('/assignments/<int:assignment_id>', methods=['PUT'])
@@ -386,9 +509,13 @@ def update_assignment(assignment_id):
     query = f"UPDATE assignment SET {', '.join(updates)} WHERE assignmentID = %s"
     
     cursor.execute(query, params)
+    updated = cursor.rowcount
+    affected = students_for_assignment(cursor, assignment_id)
+    bump_versions(cursor, affected)
     db.get_db().commit()
+    response_cache.invalidate(ASSIGNMENT)
     
-    if cursor.rowcount == 0:
+    if updated == 0:
         return make_response(jsonify({"error": "Assignment not found"}), 404)
     
     return make_response(jsonify({"message": "Assignment updated"}), 200)
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Bucketed metric time series with LTTB downsampling
+Location: api/backend/studylink/data_analyst/metric_series.py
+
+MySQL groups the raw metric rows into hour/day/week buckets (min, max, avg
+and count per student and bucket), so only one row per bucket leaves the
+database. When the caller asks for at most N points, each student's bucket
+averages are thinned with Largest-Triangle-Three-Buckets, which keeps the
+peaks and dips a line chart needs while dropping the flat stretches. Kept
+buckets carry their own min/max/count, so nothing shown is interpolated.
+"""
+
+import numpy as np
+
+# Bucket start per metric row; weeks start on Monday like the rest of the API
+BUCKETS = {
+    "hour": "DATE_ADD(DATE(m.metricDate), INTERVAL HOUR(m.metricDate) HOUR)",
+    "day": "DATE(m.metricDate)",
+    "week": "DATE_SUB(DATE(m.metricDate), INTERVAL WEEKDAY(m.metricDate) DAY)",
+}
+
+# Fewer than three points leaves LTTB nothing to choose
+MIN_POINTS = 3
+
+
+def series_query(student_count, bucket):
+    """GROUP BY query over one metricName for student_count students in [start, end)."""
+    expr = BUCKETS[bucket]
+    return f'''
+        SELECT
+            m.studentID,
+            {expr} AS bucketStart,
+            COUNT(*) AS count,
+            MIN(m.metricValue) AS min,
+            MAX(m.metricValue) AS max,
+            AVG(m.metricValue) AS avg
+        FROM metric m
+        WHERE m.studentID IN ({", ".join(["%s"] * student_count)})
+          AND m.metricName = %s
+          AND m.metricDate >= %s AND m.metricDate < %s
+          AND m.metricValue IS NOT NULL
+        GROUP BY m.studentID, bucketStart
+        ORDER BY m.studentID, bucketStart
+    '''
+
+
+def lttb(x, y, threshold):
+    """
+    Indices of the threshold points Largest-Triangle-Three-Buckets keeps
+    from (x, y), x ascending. The first and last points are always kept;
+    every other bucket contributes the point forming the largest triangle
+    with the previous pick and the next bucket's average.
+    """
+    n = len(x)
+    if threshold >= n or threshold < MIN_POINTS:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    # Bucket i covers [bounds[i], bounds[i + 1]); the last one ends at n - 1
+    bounds = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    bounds[-1] = n - 1
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = bounds[i], bounds[i + 1]
+        next_stop = bounds[i + 2] if i + 2 < len(bounds) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def build_series(rows, student_ids, points=None):
+    """
+    [{studentID, buckets, points: [...]}] in student_ids order from the
+    series_query rows. buckets is the count before downsampling.
+    """
+    by_student = {student_id: [] for student_id in student_ids}
+    for row in rows:
+        by_student[row["studentID"]].append(row)
+
+    series = []
+    for student_id, student_rows in by_student.items():
+        kept = student_rows
+        if points and len(student_rows) > points:
+            x = np.array([np.datetime64(row["bucketStart"], "s") for row in student_rows]).astype(np.float64)
+            y = np.array([float(row["avg"]) for row in student_rows])
+            kept = [student_rows[i] for i in lttb(x, y, points)]
+        series.append({
+            "studentID": student_id,
+            "buckets": len(student_rows),
+            "points": [{
+                "bucketStart": row["bucketStart"],
+                "count": row["count"],
+                "min": row["min"],
+                "max": row["max"],
+                "avg": round(float(row["avg"]), 4),
+            } for row in kept],
+        })
+    return series
@@ -0,0 +1,202 @@
+"""
+Weighted course grades, computed over many (student, course) pairs at once
+Location: api/backend/studylink/student/grade_engine.py
+
+Takes assignment rows tagged with studentID and courseID and returns one
+standing per pair. Everything is done with numpy group sums over the whole
+row set, so a student's courses or a course's whole roster cost one pass.
+
+Per pair, with w = assignment weight and p = scoreReceived / maxScore:
+    averageScore     unweighted mean of p over assignments with a score
+    currentGrade     sum(w * p) / sum(w) over graded work
+    projectedGrade   final grade if each remaining assignment scores what the
+                     student averages on that assignmentType in the course
+                     (or their overall course rate for a type not graded yet)
+    floorGrade       final grade if every remaining assignment scores 0
+    ceilingGrade     final grade if every remaining assignment scores 100%
+    neededOnRemaining  average % needed on the remaining work to finish at target
+totalAssignments and gradedAssignments keep the old summary's meaning:
+every assignment in the course, and those whose status is 'graded'.
+Grades are normalized by the course's total assigned weight. In a course
+where no assignment has a weight, assignments are weighted by maxScore
+(points-based grading). In a course where only some have one, each
+unweighted assignment is given the course's weight per point of the weighted
+ones times its maxScore, so it counts like a weighted assignment of the same
+size; the standing reports this as weighting 'mixed' with the number of
+inferredWeights. Rows without an assignment (courses with no work yet) just
+produce an empty standing.
+"""
+
+import numpy as np
+
+# Lower bounds of the letter grades on the grades page's GPA scale
+LETTER_CUTOFFS = np.array([60, 63, 67, 70, 73, 77, 80, 83, 87, 90, 93])
+LETTERS = np.array(["F", "D-", "D", "D+", "C-", "C", "C+", "B-", "B", "B+", "A-", "A"])
+GPA_POINTS = np.array([0.0, 0.7, 1.0, 1.3, 1.7, 2.0, 2.3, 2.7, 3.0, 3.3, 3.7, 4.0])
+
+DEFAULT_TARGET = 90.0
+
+# One row per (student, course, assignment); courses without assignments
+# still appear once with NULL assignment columns
+STANDING_ROWS_QUERY = """
+    SELECT css.studentID,
+           CONCAT(s.fName, ' ', s.lName) AS studentName,
+           cs.courseID,
+           cs.courseName,
+           cs.courseCode,
+           a.assignmentID,
+           a.status,
+           a.assignmentType,
+           a.weight,
+           a.maxScore,
+           a.scoreReceived
+    FROM CourseSelectionStudent css
+    JOIN student s ON s.studentID = css.studentID
+    JOIN CourseSelection cs ON cs.courseID = css.courseID
+    LEFT JOIN assignment a ON a.courseID = cs.courseID
+    WHERE {where}
+    ORDER BY {order}
+"""
+
+
+def _column(rows, key):
+    """Numeric column with NULLs as NaN."""
+    return np.array([np.nan if row[key] is None else float(row[key]) for row in rows])
+
+
+def _pct(numerator, denominator):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator * 100, np.nan)
+
+
+def compute_standings(rows, target=DEFAULT_TARGET):
+    """
+    rows: dicts with studentID, courseID, assignmentID, status, weight,
+    maxScore, scoreReceived and optionally assignmentType (any other keys,
+    e.g. courseName, are carried through from the first row of each pair).
+    Returns one dict per (studentID, courseID) in first-seen order.
+    """
+    if not rows:
+        return []
+
+    pairs = np.array([(row["studentID"], row["courseID"]) for row in rows], dtype=np.int64)
+    keys, first, group = np.unique(pairs, axis=0, return_index=True, return_inverse=True)
+    group = group.ravel()
+    n = len(keys)
+
+    weight = _column(rows, "weight")
+    max_score = _column(rows, "maxScore")
+    score = _column(rows, "scoreReceived")
+
+    present = ~np.isnan(max_score) & (max_score > 0)
+    graded = present & ~np.isnan(score)
+
+    # Courses with no weights at all fall back to points (maxScore) weighting;
+    # unweighted work in a weighted course gets the weighted work's weight per point
+    has_weight = present & ~np.isnan(weight)
+    weighted_rows = np.bincount(group, weights=has_weight, minlength=n)
+    weighted_points = np.bincount(group, weights=np.where(has_weight, max_score, 0.0), minlength=n)
+    weight_sum = np.bincount(group, weights=np.where(has_weight, weight, 0.0), minlength=n)
+    per_point = np.divide(weight_sum, weighted_points, out=np.ones(n), where=weighted_points > 0)
+    w = np.where(has_weight, weight, max_score * per_point[group])
+    w = np.where(present, w, 0.0)
+    inferred_count = np.bincount(group, weights=present & ~has_weight & (weighted_rows[group] > 0),
+                                 minlength=n).astype(int)
+
+    ratio = np.where(graded, score / np.where(present, max_score, 1.0), 0.0)
+    total_weight = np.bincount(group, weights=w, minlength=n)
+    graded_weight = np.bincount(group, weights=np.where(graded, w, 0.0), minlength=n)
+    earned = np.bincount(group, weights=w * ratio, minlength=n)
+    remaining_weight = total_weight - graded_weight
+
+    current = _pct(earned, graded_weight)
+    floor = _pct(earned, total_weight)
+    ceiling = _pct(earned + remaining_weight, total_weight)
+    rate = np.divide(earned, graded_weight, out=np.full(n, np.nan), where=graded_weight > 0)
+
+    # Same sums per (pair, assignmentType) for the projection
+    types = np.array([row.get("assignmentType") or "" for row in rows])
+    _, type_code = np.unique(types, return_inverse=True)
+    _, sub = np.unique(np.column_stack([group, type_code.ravel()]), axis=0, return_inverse=True)
+    sub = sub.ravel()
+    sub_graded = np.bincount(sub, weights=np.where(graded, w, 0.0))
+    sub_earned = np.bincount(sub, weights=w * ratio)
+    sub_rate = np.divide(sub_earned, sub_graded, out=np.full(len(sub_graded), np.nan), where=sub_graded > 0)
+    expected = np.where(np.isnan(sub_rate[sub]), rate[group], sub_rate[sub])
+    remaining_expected = np.bincount(group, weights=np.where(present & ~graded, w * expected, 0.0), minlength=n)
+    projected = np.where(np.isnan(rate), np.nan, _pct(earned + remaining_expected, total_weight))
+    # Already at or past the target on earned work alone: nothing more is needed
+    needed = np.maximum(_pct(target / 100 * total_weight - earned, remaining_weight), 0.0)
+
+    graded_pct = np.bincount(group, weights=ratio, minlength=n)
+    scored_count = np.bincount(group, weights=graded, minlength=n)
+    listed = np.array([row.get("assignmentID") is not None for row in rows])
+    marked_graded = np.array([row.get("status") == "graded" for row in rows])
+    total_count = np.bincount(group, weights=listed, minlength=n).astype(int)
+    graded_count = np.bincount(group, weights=marked_graded, minlength=n).astype(int)
+
+    # Letter grade from the projected grade, or the current one if nothing is left
+    standing = np.where(np.isnan(projected), current, projected)
+    letter_idx = np.searchsorted(LETTER_CUTOFFS, np.nan_to_num(standing), side="right")
+
+    average = _pct(graded_pct, scored_count)
+
+    def value(arr, i):
+        return None if np.isnan(arr[i]) else round(float(arr[i]), 2)
+
+    results = []
+    for i in np.argsort(first, kind="stable"):
+        row = dict(rows[first[i]])
+        for key in ("weight", "maxScore", "scoreReceived", "assignmentID", "assignmentType", "status"):
+            row.pop(key, None)
+        has_grade = not np.isnan(standing[i])
+        if not total_weight[i]:
+            weighting = None
+        elif not weighted_rows[i]:
+            weighting = "points"
+        else:
+            weighting = "mixed" if inferred_count[i] else "weighted"
+        row.update({
+            "totalAssignments": int(total_count[i]),
+            "gradedAssignments": int(graded_count[i]),
+            "averageScore": value(average, i),
+            "totalWeight": round(float(total_weight[i]), 2),
+            "gradedWeight": round(float(graded_weight[i]), 2),
+            "weighting": weighting,
+            "inferredWeights": int(inferred_count[i]),
+            "currentGrade": value(current, i),
+            "projectedGrade": value(projected, i),
+            "floorGrade": value(floor, i),
+            "ceilingGrade": value(ceiling, i),
+            "targetGrade": target,
+            "neededOnRemaining": value(needed, i),
+            "targetReachable": bool(ceiling[i] >= target) if not np.isnan(ceiling[i]) else None,
+            "letterGrade": str(LETTERS[letter_idx[i]]) if has_grade else None,
+            "gpaPoints": float(GPA_POINTS[letter_idx[i]]) if has_grade else None,
+        })
+        results.append(row)
+    return results
+
+
+def student_standings(cursor, student_id, target=DEFAULT_TARGET):
+    """Standing in each of a student's courses."""
+    cursor.execute(STANDING_ROWS_QUERY.format(where="css.studentID = %s", order="cs.courseName, cs.courseID"),
+                   (student_id,))
+    return compute_standings(cursor.fetchall(), target)
+
+
+def course_standings(cursor, course_id, target=DEFAULT_TARGET):
+    """Standing of every student enrolled in a course."""
+    cursor.execute(STANDING_ROWS_QUERY.format(where="css.courseID = %s", order="s.lName, s.fName, css.studentID"),
+                   (course_id,))
+    return compute_standings(cursor.fetchall(), target)
+
+
+def parse_target(value):
+    """?target= as a percentage in [0, 100]; raises ValueError otherwise."""
+    if value is None:
+        return DEFAULT_TARGET
+    target = float(value)
+    if not 0 <= target <= 100:
+        raise ValueError("target must be between 0 and 100")
+    return target
@@ -0,0 +1,170 @@
+"""
+Course prerequisite graph and eligibility checks
+Location: api/backend/studylink/student/prerequisites.py
+
+CourseSelection.prerequisites (migration 08) holds a comma-separated list
+of course codes. Prerequisites belong to a course code rather than one
+term's offering; the lists of every offering of a code are merged. The
+graph is parsed once, ordered topologically, and each code's full
+transitive closure is precomputed, so checking eligibility is just
+closure - taken. It is rebuilt lazily after the admin course routes call
+invalidate(). Codes on a cycle can never be satisfied and are reported
+as blocked.
+"""
+
+import re
+import threading
+from collections import deque
+
+PREREQUISITE_ROWS_QUERY = """
+    SELECT courseCode, prerequisites
+    FROM CourseSelection
+"""
+
+# Codes the student already has: every course they are or were enrolled in
+TAKEN_CODES_QUERY = """
+    SELECT DISTINCT cs.courseCode
+    FROM CourseSelectionStudent css
+    JOIN CourseSelection cs ON cs.courseID = css.courseID
+    WHERE css.studentID = %s
+"""
+
+_SEPARATORS = re.compile(r"\s*(?:,|;|\band\b)\s*", re.IGNORECASE)
+
+
+def normalize_code(code):
+    return " ".join(str(code).split()).upper()
+
+
+def parse_prerequisites(value):
+    """'CS 2500, cs 1800; MATH 1365' (or a list) -> ['CS 2500', 'CS 1800', 'MATH 1365']."""
+    if not value:
+        return []
+    parts = value if isinstance(value, (list, tuple)) else _SEPARATORS.split(str(value))
+    codes = []
+    for part in parts:
+        code = normalize_code(part) if part is not None else ""
+        if code and code not in codes:
+            codes.append(code)
+    return codes
+
+
+class PrerequisiteGraph:
+    """Direct prerequisites and precomputed transitive closures per course code."""
+
+    def __init__(self, direct):
+        self.direct = direct
+        self.closure = {}
+        self.cyclic = set()
+        self._build()
+
+    @classmethod
+    def from_rows(cls, rows):
+        direct = {}
+        for row in rows:
+            code = normalize_code(row["courseCode"])
+            prereqs = direct.setdefault(code, set())
+            prereqs.update(parse_prerequisites(row["prerequisites"]))
+        for prereqs in list(direct.values()):
+            for code in prereqs:
+                direct.setdefault(code, set())
+        for code in direct:
+            direct[code].discard(code)
+        return cls(direct)
+
+    def _build(self):
+        # Kahn's algorithm: a code is finished once all of its prerequisites are
+        dependents = {code: [] for code in self.direct}
+        remaining = {code: len(prereqs) for code, prereqs in self.direct.items()}
+        for code, prereqs in self.direct.items():
+            for prereq in prereqs:
+                dependents[prereq].append(code)
+
+        ready = deque(code for code, count in remaining.items() if count == 0)
+        while ready:
+            code = ready.popleft()
+            closure = set(self.direct[code])
+            for prereq in self.direct[code]:
+                closure |= self.closure[prereq]
+            self.closure[code] = frozenset(closure)
+            for dependent in dependents[code]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        # Whatever never became ready is on, or depends on, a cycle
+        self.cyclic = {code for code in self.direct if code not in self.closure}
+
+    def prerequisites(self, code):
+        return sorted(self.direct.get(normalize_code(code), ()))
+
+    def missing(self, code, taken):
+        """Prerequisite codes (transitively) not in taken; None if code sits on a cycle."""
+        code = normalize_code(code)
+        if code in self.cyclic:
+            return None
+        return sorted(self.closure.get(code, frozenset()) - taken)
+
+
+class PrerequisiteIndex:
+    """Process-wide PrerequisiteGraph, rebuilt on first use after invalidate()."""
+
+    def __init__(self):
+        self._graph = None
+        self._lock = threading.Lock()
+
+    def graph(self, cursor):
+        with self._lock:
+            if self._graph is None:
+                cursor.execute(PREREQUISITE_ROWS_QUERY)
+                self._graph = PrerequisiteGraph.from_rows(cursor.fetchall())
+            return self._graph
+
+    def invalidate(self):
+        with self._lock:
+            self._graph = None
+
+    def taken_codes(self, cursor, student_id):
+        cursor.execute(TAKEN_CODES_QUERY, (student_id,))
+        return {normalize_code(row["courseCode"]) for row in cursor.fetchall()}
+
+    def taken_codes_by_student(self, cursor, student_ids):
+        """{studentID: taken codes} for many students in one query."""
+        taken = {student_id: set() for student_id in student_ids}
+        if not taken:
+            return taken
+        cursor.execute(f"""
+            SELECT DISTINCT css.studentID, cs.courseCode
+            FROM CourseSelectionStudent css
+            JOIN CourseSelection cs ON cs.courseID = css.courseID
+            WHERE css.studentID IN ({", ".join(["%s"] * len(taken))})
+        """, list(taken))
+        for row in cursor.fetchall():
+            taken[row["studentID"]].add(normalize_code(row["courseCode"]))
+        return taken
+
+    @staticmethod
+    def status(graph, code, taken):
+        """(status, missing) of one code against a set of taken codes."""
+        code = normalize_code(code)
+        missing = graph.missing(code, taken)
+        if code in taken:
+            return "enrolled", []
+        if missing is None:
+            return "blocked", None
+        if missing:
+            return "blocked", missing
+        return "eligible", []
+
+    def eligibility(self, cursor, student_id, course_codes):
+        """
+        {code: (status, missing)} for each code, with status 'enrolled',
+        'eligible' or 'blocked'. missing lists the prerequisite codes the
+        student lacks (None for a prerequisite cycle).
+        """
+        graph = self.graph(cursor)
+        taken = self.taken_codes(cursor, student_id)
+        return {normalize_code(code): self.status(graph, code, taken) for code in course_codes}
+
+
+prerequisite_index = PrerequisiteIndex()
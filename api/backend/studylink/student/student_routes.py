@@ -1,5 +1,28 @@
-from flask import Blueprint, jsonify, request
-from backend.db_connection import db
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Blueprint, g, jsonify, request
+from backend.db_connection import db, PoolTimeout
+from backend.pagination import attach_next_cursor, decode_cursor, encode_cursor, page_limit
+from backend.etags import etag_by_student
+from backend.streaming import stream_query, wants_ndjson
+from backend.reminder_dispatcher import linked_reminder_ids, reminder_dispatcher
+from backend.response_cache import ASSIGNMENT, ENROLLMENT, response_cache
+from backend.student_versions import (
+    bump_versions,
+    current_version,
+    students_for_assignment,
+    students_for_event,
+    students_for_reminder,
+    students_in_course,
+)
+from backend.studylink.student import grade_engine, week_load
+from backend.studylink.student.prerequisites import (
+    normalize_code,
+    parse_prerequisites,
+    prerequisite_index,
+)
 from flask import current_app
 
 
@@ -9,15 +32,61 @@ from flask import current_app
 calendar = Blueprint("calendar", __name__)
 
 
-@calendar.route("/calendar", methods=["GET"])
-def get_student_calendar():
-    """Get calendar items for a specific student or all students."""
-    try:
-        cursor = db.get_db().cursor()
-        student_id = request.args.get('studentID')
+def _parse_date_arg(name):
+    """Read an optional YYYY-MM-DD query arg; raises ValueError if malformed."""
+    value = request.args.get(name)
+    return datetime.date.fromisoformat(value) if value else None
+
+
+def _after_keyset(columns, values, inclusive=False):
+    """
+    Expand (c1, c2, ...) > (v1, v2, ...) into OR/AND form, which MySQL can
+    turn into index range scans. inclusive makes the last comparison >=.
+    """
+    clauses, params = [], []
+    for i, column in enumerate(columns):
+        op = ">=" if inclusive and i == len(columns) - 1 else ">"
+        parts = [f"{c} = %s" for c in columns[:i]] + [f"{column} {op} %s"]
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(values[:i + 1])
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def _calendar_half(item_type, select_sql, date_col, time_col, id_col, window, after, limit):
+    """
+    Bound one half of the calendar UNION by the date window and the page
+    cursor, and cap it at limit rows so neither half is read past the page.
+    """
+    student_id, date_from, date_to = window
+    conditions, params = [], []
+    if student_id is not None:
+        conditions.append("s.studentID = %s")
+        params.append(student_id)
+    if date_from:
+        conditions.append(f"{date_col} >= %s")
+        params.append(date_from)
+    if date_to:
+        conditions.append(f"{date_col} <= %s")
+        params.append(date_to)
+    if after:
+        # Sort key is (dueDate, dueTime, itemType, id, studentID); itemType is
+        # constant within a half, so compare it to the cursor's type up front
+        cur_date, cur_time, cur_type, cur_id, cur_student = after
+        if item_type == cur_type:
+            clause, extra = _after_keyset([date_col, time_col, id_col, "s.studentID"],
+                                          [cur_date, cur_time, cur_id, cur_student])
+        else:
+            clause, extra = _after_keyset([date_col, time_col], [cur_date, cur_time],
+                                          inclusive=item_type > cur_type)
+        conditions.append(clause)
+        params.extend(extra)
 
-        # Base query for assignments
-        assignment_query = """
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"({select_sql}{where} ORDER BY {date_col}, {time_col}, {id_col}, s.studentID LIMIT %s)"
+    return query, params + [limit]
+
+
+CALENDAR_ASSIGNMENT_SELECT = """
             SELECT s.studentID,
                 CONCAT(s.fName, ' ', s.lName) AS studentName,
                 cs.courseCode,
@@ -33,12 +102,10 @@ def get_student_calendar():
             FROM student s
             JOIN CourseSelectionStudent css ON s.studentID = css.studentID
             JOIN CourseSelection cs ON css.courseID = cs.courseID
-            LEFT JOIN assignment a ON cs.courseID = a.courseID
-            WHERE a.assignmentID IS NOT NULL
-        """
-        
-        # Base query for events
-        event_query = """
+            JOIN assignment a ON cs.courseID = a.courseID
+            """
+
+CALENDAR_EVENT_SELECT = """
             SELECT s.studentID,
                 CONCAT(s.fName, ' ', s.lName) AS studentName,
                 NULL AS courseCode,
@@ -54,33 +121,83 @@ def get_student_calendar():
             FROM student s
             JOIN attEvent ae ON s.studentID = ae.studentID
             JOIN event e ON ae.eventID = e.eventID
-        """
-        
-        if student_id:
-            assignment_query += f" AND s.studentID = {int(student_id)}"
-            event_query += f" WHERE s.studentID = {int(student_id)}"
-        
-        full_query = f"""
+            """
+
+
+# MySQL's "no limit" LIMIT, for the streamed form of the calendar
+ALL_ROWS = 18446744073709551615
+
+
+def _calendar_query(window, after, limit):
+    """
+    The assignment/event UNION for a (studentID, from, to) window, starting
+    after the cursor key and returning at most limit rows.
+    """
+    assignment_query, assignment_params = _calendar_half(
+        "assignment", CALENDAR_ASSIGNMENT_SELECT,
+        "a.assignmentDate", "a.assignmentTime", "a.assignmentID",
+        window, after, limit
+    )
+    event_query, event_params = _calendar_half(
+        "event", CALENDAR_EVENT_SELECT,
+        "e.date", "e.startTime", "e.eventID",
+        window, after, limit
+    )
+    full_query = f"""
                 SELECT * FROM (
                     {assignment_query}
                     UNION ALL
                     {event_query}
                 ) AS combined
-                ORDER BY dueDate, dueTime
+                ORDER BY dueDate, dueTime, itemType, assignmentID, studentID
+                LIMIT %s
                 """
-        
-        cursor.execute(full_query)
+    return full_query, assignment_params + event_params + [limit]
+
+
+@calendar.route("/calendar", methods=["GET"])
+@etag_by_student()
+def get_student_calendar():
+    """
+    Get calendar items for a specific student or all students.
+    Optional from/to (YYYY-MM-DD, inclusive) bound the window; results are
+    paged by limit/cursor with the next cursor in X-Next-Cursor, unless
+    ?format=ndjson asks for the whole window as a stream.
+    """
+    try:
+        try:
+            student_id = request.args.get('studentID')
+            student_id = int(student_id) if student_id else None
+            date_from = _parse_date_arg('from')
+            date_to = _parse_date_arg('to')
+            limit = page_limit(default=500)
+            cursor_arg = request.args.get('cursor')
+            after = decode_cursor(cursor_arg, 5) if cursor_arg else None
+            if after and after[2] not in ("assignment", "event"):
+                raise ValueError("Invalid cursor")
+        except ValueError as e:
+            return jsonify({"error": f"Invalid query parameter: {e}"}), 400
+
+        if wants_ndjson():
+            # Bulk consumers get the whole window in one streamed response
+            full_query, params = _calendar_query((student_id, date_from, date_to), after, ALL_ROWS)
+            return stream_query(full_query, params, ndjson=True)
+
+        full_query, params = _calendar_query((student_id, date_from, date_to), after, limit + 1)
+
+        cursor = db.get_db().cursor()
+        cursor.execute(full_query, params)
         results = cursor.fetchall()
         cursor.close()
-        
-        # Convert date/time objects to strings for JSON serialization
-        for row in results:
-            if row.get('dueDate'):
-                row['dueDate'] = str(row['dueDate'])
-            if row.get('dueTime'):
-                row['dueTime'] = str(row['dueTime'])
-        
-        return jsonify(results), 200
+
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            last = results[-1]
+            next_cursor = encode_cursor(last['dueDate'], last['dueTime'], last['itemType'],
+                                        last['assignmentID'], last['studentID'])
+
+        return attach_next_cursor(jsonify(results), next_cursor), 200
 
     except Exception as e:
         current_app.logger.error(f"Database error: {str(e)}")
@@ -122,6 +239,8 @@ def add_calendar_item():
                 VALUES (%s, %s)
             """, (data["studentID"], event_id))
 
+            week_load.apply_event(cursor, event_id)
+            bump_versions(cursor, [int(data["studentID"])])
             db.get_db().commit()
             cursor.close()
 
@@ -151,8 +270,12 @@ def add_calendar_item():
             ))
 
             assignment_id = cursor.lastrowid
+            week_load.apply_assignment(cursor, assignment_id)
+            affected = students_in_course(cursor, data["courseID"])
+            bump_versions(cursor, affected)
             db.get_db().commit()
             cursor.close()
+            response_cache.invalidate(ASSIGNMENT)
 
             return jsonify({
                 "message": "Assignment created successfully",
@@ -189,12 +312,16 @@ def update_calendar(item_type, item_id):
 
             params.append(item_id)
 
+            week_load.apply_event(cursor, item_id, sign=-1)
             cursor.execute(f"""
                 UPDATE event
                 SET {', '.join(update_fields)}
                 WHERE eventID = %s
             """, params)
+            week_load.apply_event(cursor, item_id)
 
+            affected = students_for_event(cursor, item_id)
+            bump_versions(cursor, affected)
             db.get_db().commit()
             cursor.close()
             return jsonify({"message": "Event updated successfully"}), 200
@@ -215,14 +342,21 @@ def update_calendar(item_type, item_id):
 
             params.append(item_id)
 
+            # Students of both the old and (if courseID changed) new course
+            affected = students_for_assignment(cursor, item_id)
+            week_load.apply_assignment(cursor, item_id, sign=-1)
             cursor.execute(f"""
                 UPDATE assignment
                 SET {', '.join(update_fields)}
                 WHERE assignmentID = %s
             """, params)
+            week_load.apply_assignment(cursor, item_id)
+            affected += students_for_assignment(cursor, item_id)
 
+            bump_versions(cursor, affected)
             db.get_db().commit()
             cursor.close()
+            response_cache.invalidate(ASSIGNMENT)
             return jsonify({"message": "Assignment updated successfully"}), 200
 
         else:
@@ -245,12 +379,17 @@ def delete_calendar(item_type, item_id):
                 cursor.close()
                 return jsonify({"error": "Event not found"}), 404
 
+            affected = students_for_event(cursor, item_id)
+            reminder_ids = linked_reminder_ids(cursor, "eventID", item_id)
+            week_load.apply_event(cursor, item_id, sign=-1)
             cursor.execute("DELETE FROM attEvent WHERE eventID = %s", (item_id,))
             cursor.execute("DELETE FROM reminder WHERE eventID = %s", (item_id,))
             cursor.execute("DELETE FROM event WHERE eventID = %s", (item_id,))
             
+            bump_versions(cursor, affected)
             db.get_db().commit()
             cursor.close()
+            reminder_dispatcher.cancel(*reminder_ids)
             return jsonify({"message": "Event deleted successfully"}), 200
 
         elif item_type == "assignment":
@@ -259,10 +398,16 @@ def delete_calendar(item_type, item_id):
                 cursor.close()
                 return jsonify({"error": "Assignment not found"}), 404
 
+            affected = students_for_assignment(cursor, item_id)
+            reminder_ids = linked_reminder_ids(cursor, "assignmentID", item_id)
+            week_load.apply_assignment(cursor, item_id, sign=-1)
             cursor.execute("DELETE FROM reminder WHERE assignmentID = %s", (item_id,))
             cursor.execute("DELETE FROM assignment WHERE assignmentID = %s", (item_id,))
+            bump_versions(cursor, affected)
             db.get_db().commit()
             cursor.close()
+            reminder_dispatcher.cancel(*reminder_ids)
+            response_cache.invalidate(ASSIGNMENT)
             return jsonify({"message": "Assignment deleted successfully"}), 200
 
         else:
@@ -279,7 +424,57 @@ def delete_calendar(item_type, item_id):
 reminder = Blueprint("reminder", __name__)
 
 
+# A student's due reminders come from two independent paths: events they
+# attend and assignments in courses they take. Each branch is an indexed
+# join driven by the student's own rows (attEvent / CourseSelectionStudent
+# primary keys), instead of one OR across two outer joins that needed
+# DISTINCT to undo the fan-out.
+STUDENT_REMINDERS_QUERY = """
+    SELECT * FROM (
+        SELECT r.reminderID,
+               r.message AS reminderMessage,
+               r.date AS reminderDate,
+               r.time AS reminderTime,
+               r.isActive,
+               NULL AS assignmentTitle,
+               NULL AS assignmentDate,
+               NULL AS assignmentTime,
+               e.name AS eventName,
+               e.date AS eventDate,
+               e.startTime AS eventTime
+        FROM attEvent ae
+        JOIN reminder r ON r.eventID = ae.eventID
+        JOIN event e ON e.eventID = ae.eventID
+        WHERE ae.studentID = %s
+          AND r.isActive = TRUE
+          AND r.date >= CURDATE()
+
+        UNION ALL
+
+        SELECT r.reminderID,
+               r.message AS reminderMessage,
+               r.date AS reminderDate,
+               r.time AS reminderTime,
+               r.isActive,
+               a.title AS assignmentTitle,
+               a.assignmentDate,
+               a.assignmentTime,
+               NULL AS eventName,
+               NULL AS eventDate,
+               NULL AS eventTime
+        FROM CourseSelectionStudent css
+        JOIN assignment a ON a.courseID = css.courseID
+        JOIN reminder r ON r.assignmentID = a.assignmentID
+        WHERE css.studentID = %s
+          AND r.isActive = TRUE
+          AND r.date >= CURDATE()
+    ) AS due
+    ORDER BY reminderDate, reminderTime, reminderID
+"""
+
+
 @reminder.route("/reminders", methods=["GET"])
+@etag_by_student(daily=True)
 def get_reminders():
     """Get all active reminders for upcoming events or assignments."""
     try:
@@ -287,29 +482,7 @@ def get_reminders():
         student_id = request.args.get('studentID')
 
         if student_id:
-            query = """
-                SELECT DISTINCT r.reminderID,
-                       r.message AS reminderMessage,
-                       r.date AS reminderDate,
-                       r.time AS reminderTime,
-                       r.isActive,
-                       a.title AS assignmentTitle,
-                       a.assignmentDate,
-                       a.assignmentTime,
-                       e.name AS eventName,
-                       e.date AS eventDate,
-                       e.startTime AS eventTime
-                FROM reminder r
-                LEFT JOIN assignment a ON r.assignmentID = a.assignmentID
-                LEFT JOIN event e ON r.eventID = e.eventID
-                LEFT JOIN attEvent ae ON e.eventID = ae.eventID
-                LEFT JOIN CourseSelectionStudent css ON a.courseID = css.courseID
-                WHERE r.isActive = TRUE
-                  AND r.date >= CURDATE()
-                  AND (ae.studentID = %s OR css.studentID = %s)
-                ORDER BY r.date, r.time
-            """
-            cursor.execute(query, (student_id, student_id))
+            cursor.execute(STUDENT_REMINDERS_QUERY, (student_id, student_id))
         else:
             query = """
                 SELECT r.reminderID,
@@ -333,15 +506,6 @@ def get_reminders():
         results = cursor.fetchall()
         cursor.close()
         
-        # Convert date/time objects to strings
-        for row in results:
-            for key in ['reminderDate', 'assignmentDate', 'eventDate']:
-                if row.get(key):
-                    row[key] = str(row[key])
-            for key in ['reminderTime', 'assignmentTime', 'eventTime']:
-                if row.get(key):
-                    row[key] = str(row[key])
-        
         return jsonify(results), 200
 
     except Exception as e:
@@ -386,8 +550,15 @@ def add_reminder():
         ))
 
         reminder_id = cursor.lastrowid
+        # Schedule from the stored row: MySQL accepts date/time strings
+        # (e.g. '9:00') that Python's ISO parsers do not
+        cursor.execute("SELECT date, time FROM reminder WHERE reminderID = %s", (reminder_id,))
+        stored = cursor.fetchone()
+        affected = students_for_reminder(cursor, reminder_id)
+        bump_versions(cursor, affected)
         db.get_db().commit()
         cursor.close()
+        reminder_dispatcher.schedule(reminder_id, stored["date"], stored["time"])
 
         return jsonify({
             "message": "Reminder created successfully",
@@ -431,8 +602,13 @@ def update_reminder(reminder_id):
             WHERE reminderID = %s
         """, params)
 
+        cursor.execute("SELECT date, time, isActive FROM reminder WHERE reminderID = %s", (reminder_id,))
+        updated = cursor.fetchone()
+        affected = students_for_reminder(cursor, reminder_id)
+        bump_versions(cursor, affected)
         db.get_db().commit()
         cursor.close()
+        reminder_dispatcher.schedule(reminder_id, updated["date"], updated["time"], bool(updated["isActive"]))
         return jsonify({"message": "Reminder updated successfully"}), 200
 
     except Exception as e:
@@ -451,9 +627,12 @@ def delete_reminder(reminder_id):
             cursor.close()
             return jsonify({"error": "Reminder not found"}), 404
 
+        affected = students_for_reminder(cursor, reminder_id)
         cursor.execute("DELETE FROM reminder WHERE reminderID = %s", (reminder_id,))
+        bump_versions(cursor, affected)
         db.get_db().commit()
         cursor.close()
+        reminder_dispatcher.cancel(reminder_id)
 
         return jsonify({"message": "Reminder deleted successfully"}), 200
 
@@ -469,6 +648,7 @@ grades = Blueprint("grades", __name__)
 
 
 @grades.route("/grades", methods=["GET"])
+@etag_by_student()
 def get_grades():
     """Get grades and calculate weighted scores for a student."""
     try:
@@ -522,38 +702,30 @@ def get_grades():
 
 
 @grades.route("/grades/summary", methods=["GET"])
+@etag_by_student()
 def get_grade_summary():
-    """Get aggregated grade summary by course for a student."""
+    """
+    Per-course standing for a student: current, projected, floor and ceiling
+    weighted grades and the average needed on remaining work to reach
+    ?target= (default 90).
+    """
     try:
-        cursor = db.get_db().cursor()
         student_id = request.args.get('studentID')
         
         if not student_id:
             return jsonify({"error": "studentID is required"}), 400
 
-        query = """
-            SELECT cs.courseID,
-                   cs.courseName,
-                   cs.courseCode,
-                   COUNT(a.assignmentID) AS totalAssignments,
-                   COUNT(CASE WHEN a.status = 'graded' THEN 1 END) AS gradedAssignments,
-                   ROUND(AVG(CASE 
-                       WHEN a.scoreReceived IS NOT NULL AND a.maxScore > 0 
-                       THEN (a.scoreReceived / a.maxScore) * 100 
-                       ELSE NULL 
-                   END), 2) AS averageScore
-            FROM student s
-            JOIN CourseSelectionStudent css ON s.studentID = css.studentID
-            JOIN CourseSelection cs ON css.courseID = cs.courseID
-            LEFT JOIN assignment a ON cs.courseID = a.courseID
-            WHERE s.studentID = %s
-            GROUP BY cs.courseID, cs.courseName, cs.courseCode
-            ORDER BY cs.courseName
-        """
+        try:
+            target = grade_engine.parse_target(request.args.get('target'))
+        except ValueError:
+            return jsonify({"error": "target must be a number between 0 and 100"}), 400
 
-        cursor.execute(query, (student_id,))
-        results = cursor.fetchall()
+        cursor = db.get_db().cursor()
+        results = grade_engine.student_standings(cursor, student_id, target)
         cursor.close()
+        for row in results:
+            row.pop('studentID', None)
+            row.pop('studentName', None)
         return jsonify(results), 200
 
     except Exception as e:
@@ -567,81 +739,120 @@ def get_grade_summary():
 workload = Blueprint("workload", __name__)
 
 
+# Longest span the range mode of /workload returns in one response
+MAX_WORKLOAD_WEEKS = 104
+
+
+def _parse_week(value):
+    """
+    Monday of the ISO week given as 'YYYY-Www' or as any 'YYYY-MM-DD' date
+    inside it; raises ValueError if malformed.
+    """
+    if "W" in value.upper():
+        year, week = value.upper().split("-W")
+        return datetime.date.fromisocalendar(int(year), int(week), 1)
+    return week_load.week_start(datetime.date.fromisoformat(value))
+
+
+def _iso_week_label(monday):
+    year, week, _ = monday.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _workload_category(total):
+    if total <= 1:
+        return 'Low-intensity', 'Good day for rest or catching up'
+    if total <= 3:
+        return 'Moderate', 'Normal workload day'
+    return 'High-intensity', 'Heavy day - plan study time carefully'
+
+
 @workload.route("/workload", methods=["GET"])
+@etag_by_student(daily=True)
 def get_workload():
-    """Analyze total study hours, assignments, and events to suggest workload intensity."""
+    """
+    Day-by-day workload forecast for one ISO week (?week=YYYY-Www or a date
+    in it; defaults to the current week), or per-week load vectors for a
+    range of weeks (?from=...&to=...) for trend charts. Reads the
+    precomputed student_week_load rows.
+    """
     try:
-        cursor = db.get_db().cursor()
         student_id = request.args.get('studentID')
         
         if not student_id:
             return jsonify({"error": "studentID is required"}), 400
 
-        # Get assignments per day
-        assignment_query = """
-            SELECT DAYNAME(a.assignmentDate) AS weekday,
-                   DAYOFWEEK(a.assignmentDate) AS dayNum,
-                   COUNT(DISTINCT a.assignmentID) AS totalAssignments
-            FROM student s
-            JOIN CourseSelectionStudent css ON s.studentID = css.studentID
-            JOIN assignment a ON css.courseID = a.courseID
-            WHERE s.studentID = %s
-              AND a.assignmentDate >= CURDATE()
-              AND a.assignmentDate <= DATE_ADD(CURDATE(), INTERVAL 7 DAY)
-            GROUP BY DAYNAME(a.assignmentDate), DAYOFWEEK(a.assignmentDate)A
-        """
-        
-        cursor.execute(assignment_query, (student_id,))
-        assignment_data = {row['dayNum']: row for row in cursor.fetchall()}
-        
-        # Get events per day
-        event_query = """
-            SELECT DAYNAME(e.date) AS weekday,
-                   DAYOFWEEK(e.date) AS dayNum,
-                   COUNT(DISTINCT e.eventID) AS totalEvents
+        try:
+            student_id = int(student_id)
+            week_arg = request.args.get('week')
+            first = _parse_week(request.args['from']) if request.args.get('from') else None
+            last = _parse_week(request.args['to']) if request.args.get('to') else None
+            monday = _parse_week(week_arg) if week_arg else week_load.week_start(datetime.date.today())
+        except (KeyError, ValueError) as e:
+            return jsonify({"error": f"Invalid week parameter: {e}"}), 400
+
+        cursor = db.get_db().cursor()
+        columns = ", ".join(f"w.{col}" for col in week_load.LOAD_COLUMNS)
+
+        if first or last:
+            first = first or monday
+            last = last or first
+            weeks = (last - first).days // 7 + 1
+            if weeks < 1 or weeks > MAX_WORKLOAD_WEEKS:
+                return jsonify({"error": f"from/to must span 1 to {MAX_WORKLOAD_WEEKS} weeks"}), 400
+
+            cursor.execute(f"""
+                SELECT w.weekStart, {columns}
+                FROM student_week_load w
+                WHERE w.studentID = %s AND w.weekStart BETWEEN %s AND %s
+            """, (student_id, first, last))
+            rows = {row['weekStart']: row for row in cursor.fetchall()}
+            cursor.close()
+
+            results = []
+            for n in range(weeks):
+                week = first + datetime.timedelta(weeks=n)
+                row = rows.get(week, {})
+                assignments = [row.get(col, 0) for col in week_load.ASSIGNMENT_COLUMNS]
+                events = [row.get(col, 0) for col in week_load.EVENT_COLUMNS]
+                results.append({
+                    'weekStart': str(week),
+                    'week': _iso_week_label(week),
+                    'assignments': assignments,
+                    'events': events,
+                    'totalAssignments': sum(assignments),
+                    'totalEvents': sum(events),
+                    'highIntensityDays': sum(1 for a, e in zip(assignments, events) if a + e > 3)
+                })
+            return jsonify(results), 200
+
+        # One primary-key lookup for the week, joined to the student's name
+        cursor.execute(f"""
+            SELECT CONCAT(s.fName, ' ', s.lName) AS studentName, {columns}
             FROM student s
-            JOIN attEvent ae ON s.studentID = ae.studentID
-            JOIN event e ON ae.eventID = e.eventID
+            LEFT JOIN student_week_load w ON w.studentID = s.studentID AND w.weekStart = %s
             WHERE s.studentID = %s
-              AND e.date >= CURDATE()
-              AND e.date <= DATE_ADD(CURDATE(), INTERVAL 7 DAY)
-            GROUP BY DAYNAME(e.date), DAYOFWEEK(e.date)
-        """
-        
-        cursor.execute(event_query, (student_id,))
-        event_data = {row['dayNum']: row for row in cursor.fetchall()}
-        
-        # Get student info
-        cursor.execute("SELECT CONCAT(fName, ' ', lName) AS studentName FROM student WHERE studentID = %s", (student_id,))
-        student_info = cursor.fetchone()
-        student_name = student_info['studentName'] if student_info else 'Unknown'
-        
+        """, (monday, student_id))
+        row = cursor.fetchone() or {}
         cursor.close()
-        
-        # Combine results
-        days = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+        student_name = row.get('studentName') or 'Unknown'
+        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         results = []
-        
-        for day_num in range(1, 8):
-            assignments = assignment_data.get(day_num, {}).get('totalAssignments', 0)
-            events = event_data.get(day_num, {}).get('totalEvents', 0)
-            total = assignments + events
-            
-            if total <= 1:
-                category = 'Low-intensity'
-                suggestion = 'Good day for rest or catching up'
-            elif total <= 3:
-                category = 'Moderate'
-                suggestion = 'Normal workload day'
-            else:
-                category = 'High-intensity'
-                suggestion = 'Heavy day - plan study time carefully'
-            
+
+        for i, day in enumerate(days):
+            assignments = row.get(week_load.ASSIGNMENT_COLUMNS[i]) or 0
+            events = row.get(week_load.EVENT_COLUMNS[i]) or 0
+            category, suggestion = _workload_category(assignments + events)
+
             results.append({
                 'studentID': student_id,
                 'studentName': student_name,
-                'weekday': days[day_num - 1],
-                'dayNum': day_num,
+                'weekStart': str(monday),
+                'week': _iso_week_label(monday),
+                'date': str(monday + datetime.timedelta(days=i)),
+                'weekday': day,
+                'dayNum': i + 1,
                 'totalAssignments': assignments,
                 'totalEvents': events,
                 'workloadCategory': category,
@@ -686,15 +897,6 @@ def get_study_summary():
         results = cursor.fetchall()
         cursor.close()
         
-        # Convert datetime objects to strings
-        for row in results:
-            if row.get('periodStart'):
-                row['periodStart'] = str(row['periodStart'])
-            if row.get('periodEnd'):
-                row['periodEnd'] = str(row['periodEnd'])
-            if row.get('GPA'):
-                row['GPA'] = float(row['GPA'])
-        
         return jsonify(results), 200
 
     except Exception as e:
@@ -745,15 +947,7 @@ def get_events():
         results = cursor.fetchall()
         cursor.close()
         
-        # Convert date/time objects to strings
-        for row in results:
-            if row.get('date'):
-                row['date'] = str(row['date'])
-            if row.get('startTime'):
-                row['startTime'] = str(row['startTime'])
-            if row.get('endTime'):
-                row['endTime'] = str(row['endTime'])
-        
+        # Convert date/time objects to strings: done by the app's JSON provider
         return jsonify(results), 200
 
     except Exception as e:
@@ -796,6 +990,8 @@ def add_event():
             VALUES (%s, %s)
         """, (data["studentID"], event_id))
 
+        week_load.apply_event(cursor, event_id)
+        bump_versions(cursor, [int(data["studentID"])])
         db.get_db().commit()
         cursor.close()
 
@@ -835,12 +1031,16 @@ def update_event(event_id):
             cursor.close()
             return jsonify({"error": "Event not found"}), 404
 
+        week_load.apply_event(cursor, event_id, sign=-1)
         cursor.execute(f"""
             UPDATE event
             SET {', '.join(update_fields)}
             WHERE eventID = %s
         """, params)
+        week_load.apply_event(cursor, event_id)
 
+        affected = students_for_event(cursor, event_id)
+        bump_versions(cursor, affected)
         db.get_db().commit()
         cursor.close()
         return jsonify({"message": "Event updated successfully"}), 200
@@ -861,12 +1061,17 @@ def delete_event(event_id):
             cursor.close()
             return jsonify({"error": "Event not found"}), 404
 
+        affected = students_for_event(cursor, event_id)
+        reminder_ids = linked_reminder_ids(cursor, "eventID", event_id)
+        week_load.apply_event(cursor, event_id, sign=-1)
         cursor.execute("DELETE FROM attEvent WHERE eventID = %s", (event_id,))
         cursor.execute("DELETE FROM reminder WHERE eventID = %s", (event_id,))
         cursor.execute("DELETE FROM event WHERE eventID = %s", (event_id,))
         
+        bump_versions(cursor, affected)
         db.get_db().commit()
         cursor.close()
+        reminder_dispatcher.cancel(*reminder_ids)
 
         return jsonify({"message": "Event deleted successfully"}), 200
 
@@ -882,6 +1087,7 @@ courses = Blueprint("courses", __name__)
 
 
 @courses.route("/courses", methods=["GET"])
+@etag_by_student()
 def get_courses():
     """Get all courses for a student with prerequisite status."""
     try:
@@ -917,13 +1123,6 @@ def get_courses():
         results = cursor.fetchall()
         cursor.close()
         
-        # Convert date objects to strings
-        for row in results:
-            if row.get('termStart'):
-                row['termStart'] = str(row['termStart'])
-            if row.get('termEnd'):
-                row['termEnd'] = str(row['termEnd'])
-        
         return jsonify(results), 200
 
     except Exception as e:
@@ -933,7 +1132,11 @@ def get_courses():
 
 @courses.route("/courses", methods=["POST"])
 def add_course():
-    """Add a course to a student's plan."""
+    """
+    Add a course to a student's plan. Missing prerequisites are reported
+    in missingPrerequisites but do not stop the enrollment unless the body
+    sets enforcePrerequisites (advisors and admins can still force-enroll).
+    """
     try:
         data = request.get_json()
         cursor = db.get_db().cursor()
@@ -952,14 +1155,163 @@ def add_course():
             cursor.close()
             return jsonify({"error": "Student is already enrolled in this course"}), 400
 
+        cursor.execute("SELECT courseCode FROM CourseSelection WHERE courseID = %s", (data["courseID"],))
+        course = cursor.fetchone()
+        if not course:
+            cursor.close()
+            return jsonify({"error": "Course not found"}), 404
+
+        eligibility = prerequisite_index.eligibility(cursor, data["studentID"], [course["courseCode"]])
+        status, missing = next(iter(eligibility.values()))
+        if status == "blocked" and data.get("enforcePrerequisites"):
+            cursor.close()
+            return jsonify({
+                "error": "Student has not completed the prerequisites for this course",
+                "missingPrerequisites": missing
+            }), 400
+
         cursor.execute("""
             INSERT INTO CourseSelectionStudent (studentID, courseID)
             VALUES (%s, %s)
         """, (data["studentID"], data["courseID"]))
 
+        week_load.apply_course(cursor, data["courseID"], student_id=data["studentID"])
+        bump_versions(cursor, [int(data["studentID"])])
+        db.get_db().commit()
+        cursor.close()
+        response_cache.invalidate(ENROLLMENT)
+
+        result = {"message": "Course added to student plan successfully"}
+        if status == "blocked":
+            result["missingPrerequisites"] = missing
+        return jsonify(result), 201
+
+    except Exception as e:
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+# Pairs accepted by one POST /courses/bulk, and pairs per set-based statement
+MAX_BULK_ENROLLMENTS = 10000
+BULK_CHUNK_SIZE = 1000
+
+
+def _id_set(cursor, table, column, ids):
+    """The subset of ids that exist in table.column."""
+    found = set()
+    ids = list(ids)
+    for start in range(0, len(ids), BULK_CHUNK_SIZE):
+        chunk = ids[start:start + BULK_CHUNK_SIZE]
+        cursor.execute(
+            f"SELECT {column} FROM {table} WHERE {column} IN ({', '.join(['%s'] * len(chunk))})",
+            chunk
+        )
+        found.update(row[column] for row in cursor.fetchall())
+    return found
+
+
+def _enrolled_pairs(cursor, pairs):
+    """The subset of (studentID, courseID) pairs already in CourseSelectionStudent."""
+    found = set()
+    for start in range(0, len(pairs), BULK_CHUNK_SIZE):
+        chunk = pairs[start:start + BULK_CHUNK_SIZE]
+        cursor.execute(
+            "SELECT studentID, courseID FROM CourseSelectionStudent "
+            "WHERE (studentID, courseID) IN (" + ", ".join(["(%s, %s)"] * len(chunk)) + ")",
+            [v for pair in chunk for v in pair]
+        )
+        found.update((row['studentID'], row['courseID']) for row in cursor.fetchall())
+    return found
+
+
+@courses.route("/courses/bulk", methods=["POST"])
+def add_courses_bulk():
+    """
+    Enroll many students at once, e.g. for a registration wave. Takes
+    {"enrollments": [{"studentID": 1, "courseID": 2}, ...]} and returns an
+    outcome per pair: enrolled, alreadyEnrolled, duplicate (repeated in the
+    request), notFound or blocked (missing prerequisites, checked against
+    enrollments from before this request). All inserts commit together.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        enrollments = data.get("enrollments")
+        if not isinstance(enrollments, list) or not enrollments:
+            return jsonify({"error": "enrollments must be a non-empty list"}), 400
+        if len(enrollments) > MAX_BULK_ENROLLMENTS:
+            return jsonify({"error": f"At most {MAX_BULK_ENROLLMENTS} enrollments per request"}), 400
+
+        pairs = []
+        for item in enrollments:
+            try:
+                pairs.append((int(item["studentID"]), int(item["courseID"])))
+            except (TypeError, KeyError, ValueError):
+                return jsonify({"error": "Each enrollment needs an integer studentID and courseID"}), 400
+
+        cursor = db.get_db().cursor()
+        unique_pairs = list(dict.fromkeys(pairs))
+        students = _id_set(cursor, "student", "studentID", {p[0] for p in unique_pairs})
+        course_ids = sorted({p[1] for p in unique_pairs})
+        course_codes = {}
+        for start in range(0, len(course_ids), BULK_CHUNK_SIZE):
+            chunk = course_ids[start:start + BULK_CHUNK_SIZE]
+            cursor.execute(
+                f"SELECT courseID, courseCode FROM CourseSelection WHERE courseID IN ({', '.join(['%s'] * len(chunk))})",
+                chunk
+            )
+            course_codes.update((row['courseID'], row['courseCode']) for row in cursor.fetchall())
+
+        valid = [p for p in unique_pairs if p[0] in students and p[1] in course_codes]
+        existing = _enrolled_pairs(cursor, valid)
+        candidates = [p for p in valid if p not in existing]
+
+        graph = prerequisite_index.graph(cursor)
+        taken = prerequisite_index.taken_codes_by_student(cursor, {p[0] for p in candidates})
+        outcomes = {}
+        for pair in candidates:
+            status, missing = prerequisite_index.status(graph, course_codes[pair[1]], taken[pair[0]])
+            if status == "blocked":
+                outcomes[pair] = {"outcome": "blocked", "missingPrerequisites": missing}
+        new_pairs = [p for p in candidates if p not in outcomes]
+
+        # executemany sends multi-row INSERTs. A pair enrolled by a concurrent
+        # request since the check above is skipped by IGNORE; then this batch
+        # cannot tell which pairs it added, so it backs out instead of
+        # double-counting their workload.
+        for start in range(0, len(new_pairs), BULK_CHUNK_SIZE):
+            chunk = new_pairs[start:start + BULK_CHUNK_SIZE]
+            cursor.executemany(
+                "INSERT IGNORE INTO CourseSelectionStudent (studentID, courseID) VALUES (%s, %s)",
+                chunk
+            )
+            if cursor.rowcount != len(chunk):
+                db.get_db().rollback()
+                cursor.close()
+                return jsonify({"error": "Enrollments changed concurrently, please retry"}), 409
+            week_load.apply_enrollments(cursor, chunk)
+        bump_versions(cursor, [p[0] for p in new_pairs])
         db.get_db().commit()
         cursor.close()
-        return jsonify({"message": "Course added to student plan successfully"}), 201
+        response_cache.invalidate(ENROLLMENT)
+
+        for pair in new_pairs:
+            outcomes[pair] = {"outcome": "enrolled"}
+        for pair in existing:
+            outcomes[pair] = {"outcome": "alreadyEnrolled"}
+
+        results, seen = [], set()
+        for pair in pairs:
+            if pair in seen:
+                outcome = {"outcome": "duplicate"}
+            else:
+                seen.add(pair)
+                outcome = outcomes.get(pair, {"outcome": "notFound"})
+            results.append({"studentID": pair[0], "courseID": pair[1], **outcome})
+
+        counts = {}
+        for row in results:
+            counts[row["outcome"]] = counts.get(row["outcome"], 0) + 1
+        return jsonify({"counts": counts, "results": results}), 200
 
     except Exception as e:
         current_app.logger.error(f"Database error: {str(e)}")
@@ -981,13 +1333,16 @@ def delete_course(student_id, course_id):
             cursor.close()
             return jsonify({"error": "Course selection not found"}), 404
 
+        week_load.apply_course(cursor, course_id, sign=-1, student_id=student_id)
         cursor.execute("""
             DELETE FROM CourseSelectionStudent
             WHERE studentID = %s AND courseID = %s
         """, (student_id, course_id))
 
+        bump_versions(cursor, [student_id])
         db.get_db().commit()
         cursor.close()
+        response_cache.invalidate(ENROLLMENT)
 
         return jsonify({"message": "Course removed from student plan"}), 200
 
@@ -998,11 +1353,16 @@ def delete_course(student_id, course_id):
 
 @courses.route("/courses/catalog", methods=["GET"])
 def get_course_catalog():
-    """Get all available courses in the catalog."""
+    """
+    Get all available courses in the catalog. With ?studentID=, each course
+    is also marked enrolled/eligible/blocked for that student, with the
+    prerequisite codes they are missing.
+    """
     try:
         cursor = db.get_db().cursor()
         term_id = request.args.get('termID')
         department = request.args.get('department')
+        student_id = request.args.get('studentID')
 
         query = """
             SELECT cs.courseID,
@@ -1015,6 +1375,7 @@ def get_course_catalog():
                    cs.date,
                    cs.startTime,
                    cs.endTime,
+                   cs.prerequisites,
                    t.name AS termName
             FROM CourseSelection cs
             LEFT JOIN term t ON cs.termID = t.termID
@@ -1035,19 +1396,165 @@ def get_course_catalog():
         
         cursor.execute(query, params)
         results = cursor.fetchall()
+
+        eligibility = {}
+        if student_id:
+            eligibility = prerequisite_index.eligibility(
+                cursor, int(student_id), [row['courseCode'] for row in results]
+            )
         cursor.close()
         
-        # Convert date/time objects to strings
+        # Prerequisites as a list, plus eligibility when a student was given
         for row in results:
-            if row.get('date'):
-                row['date'] = str(row['date'])
-            if row.get('startTime'):
-                row['startTime'] = str(row['startTime'])
-            if row.get('endTime'):
-                row['endTime'] = str(row['endTime'])
+            row['prerequisites'] = parse_prerequisites(row['prerequisites'])
+            if student_id:
+                status, missing = eligibility[normalize_code(row['courseCode'])]
+                row['eligibility'] = status
+                row['missingPrerequisites'] = missing
         
         return jsonify(results), 200
 
     except Exception as e:
         current_app.logger.error(f"Database error: {str(e)}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+# ============================================
+# HOME BLUEPRINT - Maya dashboard
+# ============================================
+home = Blueprint("home", __name__)
+
+# Most upcoming calendar items /home returns
+MAX_HOME_ITEMS = 50
+
+# The independent /home queries run side by side. Across all requests at
+# most HOME_FANOUT_CONNECTIONS (see rest_entry) of them hold an extra pooled
+# connection; the rest run on the request's own connection, so /home never
+# holds one connection while it waits for another. Set at registration.
+_home_executor = None
+_home_slots = None
+
+
+@home.record_once
+def _size_home_fanout(state):
+    global _home_executor, _home_slots
+    slots = max(0, int(state.app.config.get("HOME_FANOUT_CONNECTIONS", 3)))
+    _home_executor = ThreadPoolExecutor(max_workers=max(1, slots), thread_name_prefix="student-home")
+    _home_slots = threading.BoundedSemaphore(slots)
+
+
+def _fanout_fetch(student_id, query, params):
+    """
+    (student version, rows) read in one transaction on an idle pooled
+    connection, or None if the pool has none to spare right now.
+    """
+    try:
+        with db.connection(timeout=0) as conn:
+            cursor = conn.cursor()
+            version = current_version(cursor, student_id)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        return version, rows
+    except PoolTimeout:
+        return None
+    finally:
+        _home_slots.release()
+
+
+@home.route("/<int:student_id>/home", methods=["GET"])
+@etag_by_student(daily=True)
+def get_student_home(student_id):
+    """
+    Everything the student home page shows in one response: the next
+    ?limit= calendar items (default 5), active reminders, enrolled courses
+    and upcoming counts.
+    """
+    try:
+        try:
+            limit = max(1, min(int(request.args.get("limit", 5)), MAX_HOME_ITEMS))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+
+        today = datetime.date.today()
+        queries = {
+            "calendar": _calendar_query((student_id, today, None), None, limit),
+            "reminders": (STUDENT_REMINDERS_QUERY, (student_id, student_id)),
+            "courses": ("""
+                SELECT cs.courseID, cs.courseCode, cs.courseName, cs.credits, t.name AS termName
+                FROM CourseSelectionStudent css
+                JOIN CourseSelection cs ON css.courseID = cs.courseID
+                LEFT JOIN term t ON cs.termID = t.termID
+                WHERE css.studentID = %s
+                ORDER BY t.startDate, cs.courseCode
+            """, (student_id,)),
+            "counts": ("""
+                SELECT
+                    (SELECT COUNT(*)
+                     FROM CourseSelectionStudent css
+                     JOIN assignment a ON a.courseID = css.courseID
+                     WHERE css.studentID = %s AND a.assignmentDate >= %s) AS upcomingAssignments,
+                    (SELECT COUNT(*)
+                     FROM attEvent ae
+                     JOIN event e ON e.eventID = ae.eventID
+                     WHERE ae.studentID = %s AND e.date >= %s) AS upcomingEvents
+            """, (student_id, today, student_id, today)),
+        }
+
+        # The request connection's snapshot is the one the ETag describes
+        cursor = db.get_db().cursor()
+        version = g.get("student_version")
+        if version is None:
+            version = current_version(cursor, student_id)
+
+        # counts always stays on the request connection
+        futures = {}
+        for name in ("calendar", "reminders", "courses"):
+            if not _home_slots.acquire(blocking=False):
+                break
+            try:
+                futures[name] = _home_executor.submit(_fanout_fetch, student_id, *queries[name])
+            except Exception:
+                _home_slots.release()
+                raise
+
+        results = {}
+        for name, (query, params) in queries.items():
+            if name not in futures:
+                cursor.execute(query, params)
+                results[name] = cursor.fetchall()
+        for name, future in futures.items():
+            fetched = future.result()
+            if fetched is not None and fetched[0] == version:
+                results[name] = fetched[1]
+            else:
+                # No spare connection, or a write landed in between: re-read
+                # on the request connection so every section matches the ETag
+                cursor.execute(*queries[name])
+                results[name] = cursor.fetchall()
+        cursor.close()
+
+        calendar_items = results["calendar"]
+        for item in calendar_items:
+            # Same student on every row; keep the payload compact
+            item.pop("studentID", None)
+            item.pop("studentName", None)
+        reminders = results["reminders"]
+        counts = results["counts"][0]
+
+        return jsonify({
+            "studentID": student_id,
+            "calendar": calendar_items,
+            "reminders": reminders,
+            "courses": results["courses"],
+            "counts": {
+                "courses": len(results["courses"]),
+                "upcomingAssignments": int(counts["upcomingAssignments"]),
+                "upcomingEvents": int(counts["upcomingEvents"]),
+                "activeReminders": len(reminders)
+            }
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
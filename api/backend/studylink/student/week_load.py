@@ -0,0 +1,99 @@
+"""
+Per-student, per-ISO-week workload vectors
+Location: api/backend/studylink/student/week_load.py
+
+student_week_load holds one row per (studentID, weekStart) where weekStart
+is the ISO week's Monday, with the number of assignments due and events
+attended on each day of that week. /student/workload reads a week (or a
+range of weeks) straight from it.
+
+Writers keep it current incrementally: call the matching helper with
+sign=-1 before an assignment/event/enrollment changes or is deleted, and
+with sign=+1 after it is created or changed, in the same transaction.
+"""
+
+import datetime
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+ASSIGNMENT_COLUMNS = [f"{d}Assignments" for d in DAYS]
+EVENT_COLUMNS = [f"{d}Events" for d in DAYS]
+LOAD_COLUMNS = ASSIGNMENT_COLUMNS + EVENT_COLUMNS
+
+# Each source yields (studentID, item date) pairs for the rows matching {where}
+ASSIGNMENT_SOURCE = ("css.studentID", "a.assignmentDate",
+                     "FROM assignment a JOIN CourseSelectionStudent css ON css.courseID = a.courseID")
+EVENT_SOURCE = ("ae.studentID", "e.date",
+                "FROM event e JOIN attEvent ae ON ae.eventID = e.eventID")
+
+
+def week_start(day):
+    """Monday of the ISO week containing day."""
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def _merge(cursor, source, columns, where, params, sign):
+    """Add sign x the per-day counts of the matching items into the vectors."""
+    student_col, date_col, from_sql = source
+    counts = ",\n                ".join(
+        f"%s * SUM(WEEKDAY({date_col}) = {i}) AS {col}" for i, col in enumerate(columns)
+    )
+    updates = ",\n            ".join(f"{col} = student_week_load.{col} + delta.{col}" for col in columns)
+    cursor.execute(f'''
+        INSERT INTO student_week_load (studentID, weekStart, {", ".join(columns)})
+        SELECT studentID, weekStart, {", ".join(columns)} FROM (
+            SELECT
+                {student_col} AS studentID,
+                DATE_SUB({date_col}, INTERVAL WEEKDAY({date_col}) DAY) AS weekStart,
+                {counts}
+            {from_sql}
+            WHERE {where}
+            GROUP BY {student_col}, DATE_SUB({date_col}, INTERVAL WEEKDAY({date_col}) DAY)
+        ) AS delta
+        ON DUPLICATE KEY UPDATE
+            {updates}
+    ''', [sign] * len(columns) + list(params))
+
+
+def apply_assignment(cursor, assignment_id, sign=1):
+    """An assignment was added/changed (+1) or is about to change/go (-1)."""
+    _merge(cursor, ASSIGNMENT_SOURCE, ASSIGNMENT_COLUMNS, "a.assignmentID = %s", [assignment_id], sign)
+
+
+def apply_course(cursor, course_id, sign=1, student_id=None):
+    """All of a course's assignments, for every enrolled student or just one."""
+    where, params = "a.courseID = %s", [course_id]
+    if student_id is not None:
+        where, params = where + " AND css.studentID = %s", params + [student_id]
+    _merge(cursor, ASSIGNMENT_SOURCE, ASSIGNMENT_COLUMNS, where, params, sign)
+
+
+def apply_enrollments(cursor, pairs, sign=1):
+    """Several (studentID, courseID) enrollments at once."""
+    if not pairs:
+        return
+    where = "(css.studentID, css.courseID) IN (" + ", ".join(["(%s, %s)"] * len(pairs)) + ")"
+    _merge(cursor, ASSIGNMENT_SOURCE, ASSIGNMENT_COLUMNS, where, [v for pair in pairs for v in pair], sign)
+
+
+def apply_event(cursor, event_id, sign=1, student_id=None):
+    """An event for all its attendees, or one attendee's link to it."""
+    where, params = "e.eventID = %s", [event_id]
+    if student_id is not None:
+        where, params = where + " AND ae.studentID = %s", params + [student_id]
+    _merge(cursor, EVENT_SOURCE, EVENT_COLUMNS, where, params, sign)
+
+
+def rebuild(cursor, student_id=None):
+    """Recompute the vectors from assignments and events."""
+    if student_id is None:
+        cursor.execute("DELETE FROM student_week_load")
+        _merge(cursor, ASSIGNMENT_SOURCE, ASSIGNMENT_COLUMNS, "1 = 1", [], 1)
+        _merge(cursor, EVENT_SOURCE, EVENT_COLUMNS, "1 = 1", [], 1)
+    else:
+        cursor.execute("DELETE FROM student_week_load WHERE studentID = %s", (student_id,))
+        _merge(cursor, ASSIGNMENT_SOURCE, ASSIGNMENT_COLUMNS, "css.studentID = %s", [student_id], 1)
+        _merge(cursor, EVENT_SOURCE, EVENT_COLUMNS, "ae.studentID = %s", [student_id], 1)
+    cursor.execute("SELECT COUNT(*) AS weeks FROM student_week_load" +
+                   (" WHERE studentID = %s" if student_id is not None else ""),
+                   (student_id,) if student_id is not None else ())
+    return cursor.fetchone()['weeks']
@@ -0,0 +1,137 @@
+"""
+Benchmark JSON serialization of large database result sets
+Location: api/backend/tools/bench_json.py
+
+Generates rows shaped like PyMySQL DictCursor output (ints, strings,
+DECIMAL, DATE, DATETIME and TIME as timedelta) and times three ways of
+turning them into a JSON response body:
+
+  * the old per-route fix-up loop (str()/float() per column) followed by
+    Flask's default provider
+  * StudyLinkJSONProvider with orjson, as the API now runs
+  * StudyLinkJSONProvider's stdlib fallback (no orjson installed)
+
+It also checks that the new paths produce the same JSON as the old one.
+No database is needed.
+
+Usage (from the api/ folder):
+    python -m backend.tools.bench_json [--rows N] [--repeats N] [--seed N]
+"""
+
+import argparse
+import datetime
+import decimal
+import json
+import random
+import statistics
+import sys
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from backend import json_provider
+from backend.json_provider import StudyLinkJSONProvider
+
+DATE_COLUMNS = ("metricDate", "createdAt", "dueTime")
+DECIMAL_COLUMNS = ("metricValue", "GPA")
+
+
+def generate(rows, rng):
+    start = datetime.date(2025, 1, 6)
+    names = ["study_hours", "sleep_hours", "focus_score", "assignment_score"]
+    return [{
+        "metricID": i,
+        "studentID": rng.randint(1, 5000),
+        "metricName": rng.choice(names),
+        "metricValue": decimal.Decimal(f"{rng.uniform(0, 100):.2f}"),
+        "GPA": decimal.Decimal(f"{rng.uniform(2, 4):.2f}") if rng.random() > 0.05 else None,
+        "metricDate": start + datetime.timedelta(days=rng.randint(0, 120)),
+        "createdAt": datetime.datetime(2025, 1, 6, 8) + datetime.timedelta(minutes=rng.randint(0, 200000)),
+        "dueTime": datetime.timedelta(hours=rng.randint(8, 22), minutes=rng.choice((0, 15, 30, 45))),
+        "privacyLevel": rng.choice(["public", "private"]),
+    } for i in range(1, rows + 1)]
+
+
+def legacy_fixup(rows):
+    """What the routes did before the JSON provider handled these types."""
+    for row in rows:
+        for key in DATE_COLUMNS:
+            if row.get(key):
+                row[key] = str(row[key])
+        for key in DECIMAL_COLUMNS:
+            if row.get(key) is not None:
+                row[key] = float(row[key])
+    return rows
+
+
+class StdlibJSONProvider(StudyLinkJSONProvider):
+    """StudyLinkJSONProvider pinned to its no-orjson code path."""
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = json_provider._dumps_stdlib(obj, sort_keys=self.sort_keys) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def time_path(app, provider, make_rows, repeats):
+    """Seconds per run of provider.response() on fresh rows, and the last body."""
+    timings, body = [], None
+    with app.app_context():
+        for _ in range(repeats):
+            rows = make_rows()
+            started = time.perf_counter()
+            body = provider.response(rows).get_data()
+            timings.append(time.perf_counter() - started)
+    return timings, body
+
+
+class _TimedPrepare:
+    """Runs prepare() on the rows before handing them to the provider."""
+
+    def __init__(self, provider, prepare):
+        self.provider = provider
+        self.prepare = prepare
+
+    def response(self, rows):
+        return self.provider.response(self.prepare(rows))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="rows per payload")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per encoder")
+    parser.add_argument("--seed", type=int, default=7, help="random seed for the dataset")
+    args = parser.parse_args(argv)
+
+    rows = generate(args.rows, random.Random(args.seed))
+    print(f"Generated {len(rows)} rows of {len(rows[0])} columns")
+
+    app = Flask(__name__)
+    legacy = DefaultJSONProvider(app)
+    paths = [
+        ("fix-up loop + Flask default", legacy_fixup, legacy),
+        ("StudyLinkJSONProvider, stdlib", lambda r: r, StdlibJSONProvider(app)),
+    ]
+    if json_provider.orjson is not None:
+        paths.append(("StudyLinkJSONProvider, orjson", lambda r: r, StudyLinkJSONProvider(app)))
+    else:
+        print("orjson is not installed; skipping the orjson path")
+
+    baseline, expected = None, None
+    for label, prepare, provider in paths:
+        # The fix-up loop runs inside the timed section, as it did in the routes
+        wrapped = _TimedPrepare(provider, prepare)
+        timings, body = time_path(app, wrapped, lambda: [dict(row) for row in rows], args.repeats)
+        median = statistics.median(timings)
+        decoded = json.loads(body)
+        if expected is None:
+            baseline, expected = median, decoded
+        same = "same output" if decoded == expected else "OUTPUT DIFFERS"
+        print(f"  {label:<32} median {median * 1000:8.1f} ms  "
+              f"{baseline / median:5.1f}x  {len(body) / 1e6:6.1f} MB  {same}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
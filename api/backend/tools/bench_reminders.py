@@ -0,0 +1,184 @@
+"""
+Benchmark the student reminder query on generated data
+Location: api/backend/tools/bench_reminders.py
+
+Builds a scratch schema next to the configured database (same table
+definitions via CREATE TABLE ... LIKE), fills it with a synthetic term of
+students, enrollments, assignments, events and reminders, then EXPLAINs and
+times the old single-query form (LEFT JOINs + OR + DISTINCT) against the
+two-branch STUDENT_REMINDERS_QUERY the API now uses, with and without
+idx_reminder_active_due (migration 07). The scratch schema is dropped
+afterwards unless --keep is given.
+
+Usage (from the api/ folder, with the same .env the API uses):
+    python -m backend.tools.bench_reminders [--students N] [--samples N] [--seed N] [--keep]
+"""
+
+import argparse
+import datetime
+import random
+import statistics
+import sys
+import time
+
+from backend.studylink.student.student_routes import STUDENT_REMINDERS_QUERY
+from backend.tools.common import connect
+from backend.tools.index_advisor import review_plan
+
+BENCH_SCHEMA = "study_link_reminder_bench"
+TABLES = ["student", "term", "CourseSelection", "CourseSelectionStudent",
+          "assignment", "event", "attEvent", "reminder"]
+INDEX_NAME = "idx_reminder_active_due"
+BATCH_SIZE = 5000
+
+# The query the reminders route ran before the rewrite, kept for comparison
+LEGACY_REMINDERS_QUERY = """
+    SELECT DISTINCT r.reminderID,
+           r.message AS reminderMessage,
+           r.date AS reminderDate,
+           r.time AS reminderTime,
+           r.isActive,
+           a.title AS assignmentTitle,
+           a.assignmentDate,
+           a.assignmentTime,
+           e.name AS eventName,
+           e.date AS eventDate,
+           e.startTime AS eventTime
+    FROM reminder r
+    LEFT JOIN assignment a ON r.assignmentID = a.assignmentID
+    LEFT JOIN event e ON r.eventID = e.eventID
+    LEFT JOIN attEvent ae ON ae.eventID = e.eventID
+    LEFT JOIN CourseSelectionStudent css ON css.courseID = a.courseID
+    WHERE (ae.studentID = %s OR css.studentID = %s)
+      AND r.isActive = TRUE
+      AND r.date >= CURDATE()
+    ORDER BY r.date, r.time
+"""
+
+
+def insert_rows(cursor, table, columns, rows):
+    """executemany in batches; PyMySQL folds each batch into one INSERT."""
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    for start in range(0, len(rows), BATCH_SIZE):
+        cursor.executemany(sql, rows[start:start + BATCH_SIZE])
+
+
+def create_schema(cursor, source_schema):
+    cursor.execute(f"DROP DATABASE IF EXISTS {BENCH_SCHEMA}")
+    cursor.execute(f"CREATE DATABASE {BENCH_SCHEMA}")
+    for table in TABLES:
+        cursor.execute(f"CREATE TABLE {BENCH_SCHEMA}.{table} LIKE {source_schema}.{table}")
+    cursor.execute(f"USE {BENCH_SCHEMA}")
+
+
+def generate(cursor, students, rng):
+    """One term: 4 courses per student, 12 assignments per course, ~3 events each."""
+    today = datetime.date.today()
+    start = today - datetime.timedelta(days=60)
+
+    def some_day():
+        return start + datetime.timedelta(days=rng.randrange(120))
+
+    def some_time():
+        return datetime.time(rng.randrange(8, 22), rng.choice([0, 15, 30, 45]))
+
+    courses = max(1, students // 20)
+    events = students * 3
+
+    insert_rows(cursor, "term", ["termID", "name", "startDate", "endDate"],
+                [(1, "Bench Term", start, start + datetime.timedelta(days=120))])
+    insert_rows(cursor, "student", ["studentID", "fName", "lName", "email", "GPA", "enrollmentStatus"],
+                [(s, "Bench", f"Student{s}", f"bench{s}@example.edu", 3.0, "Full-Time")
+                 for s in range(1, students + 1)])
+    insert_rows(cursor, "CourseSelection",
+                ["courseID", "termID", "courseCode", "courseName", "credits", "department"],
+                [(c, 1, f"BENCH {c}", f"Bench Course {c}", 4, "Bench") for c in range(1, courses + 1)])
+    insert_rows(cursor, "CourseSelectionStudent", ["studentID", "courseID"],
+                [(s, c) for s in range(1, students + 1)
+                 for c in rng.sample(range(1, courses + 1), min(4, courses))])
+
+    assignments = [(a, (a - 1) // 12 + 1, f"Assignment {a}", some_day(), some_time(), 100)
+                   for a in range(1, courses * 12 + 1)]
+    insert_rows(cursor, "assignment",
+                ["assignmentID", "courseID", "title", "assignmentDate", "assignmentTime", "maxScore"],
+                assignments)
+    event_rows = [(e, f"Event {e}", some_day(), some_time()) for e in range(1, events + 1)]
+    insert_rows(cursor, "event", ["eventID", "name", "date", "startTime"], event_rows)
+    insert_rows(cursor, "attEvent", ["studentID", "eventID"],
+                [(rng.randrange(1, students + 1), e) for e in range(1, events + 1)])
+
+    # One reminder per assignment and per event, a day before it, 80% active
+    reminders = [(None, a[0], "Due tomorrow", rng.random() < 0.8, a[3] - datetime.timedelta(days=1), a[4])
+                 for a in assignments]
+    reminders += [(e[0], None, "Starts tomorrow", rng.random() < 0.8, e[2] - datetime.timedelta(days=1), e[3])
+                  for e in event_rows]
+    insert_rows(cursor, "reminder", ["eventID", "assignmentID", "message", "isActive", "date", "time"],
+                reminders)
+    cursor.execute(f"ANALYZE TABLE {', '.join(TABLES)}")
+    cursor.fetchall()
+    return len(reminders)
+
+
+def has_index(cursor):
+    cursor.execute("SHOW INDEX FROM reminder WHERE Key_name = %s", (INDEX_NAME,))
+    return bool(cursor.fetchall())
+
+
+def run(cursor, label, sql, sample_ids):
+    """Print the plan for one student and the timing over all samples."""
+    cursor.execute("EXPLAIN " + sql, (sample_ids[0], sample_ids[0]))
+    plan = cursor.fetchall()
+    timings = []
+    for student_id in sample_ids:
+        started = time.perf_counter()
+        cursor.execute(sql, (student_id, student_id))
+        cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    print(f"\n{label}")
+    for row in plan:
+        print(f"  {row.get('table') or '-':<22} type={row.get('type') or '-':<7} "
+              f"key={row.get('key') or '-':<28} rows={row.get('rows') or 0:<8} {row.get('Extra') or ''}")
+    for finding in review_plan(plan, min_rows=100):
+        print(f"  ! {finding}")
+    print(f"  median {statistics.median(timings):.2f} ms, "
+          f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:.2f} ms over {len(timings)} students")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=10000, help="students to generate")
+    parser.add_argument("--samples", type=int, default=200, help="students to time each query for")
+    parser.add_argument("--seed", type=int, default=7, help="random seed for the dataset")
+    parser.add_argument("--keep", action="store_true", help=f"leave the {BENCH_SCHEMA} schema in place")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    conn = connect()
+    cursor = conn.cursor()
+    source_schema = conn.db.decode() if isinstance(conn.db, bytes) else conn.db
+    try:
+        create_schema(cursor, source_schema)
+        reminders = generate(cursor, args.students, rng)
+        conn.commit()
+        print(f"Generated {args.students} students and {reminders} reminders in {BENCH_SCHEMA}")
+
+        sample_ids = rng.sample(range(1, args.students + 1), min(args.samples, args.students))
+        if has_index(cursor):
+            cursor.execute(f"DROP INDEX {INDEX_NAME} ON reminder")
+        run(cursor, "OR query, no due-reminder index", LEGACY_REMINDERS_QUERY, sample_ids)
+        run(cursor, "Two-branch query, no due-reminder index", STUDENT_REMINDERS_QUERY, sample_ids)
+
+        cursor.execute(f"CREATE INDEX {INDEX_NAME} ON reminder (isActive, date, time)")
+        run(cursor, "OR query, with due-reminder index", LEGACY_REMINDERS_QUERY, sample_ids)
+        run(cursor, "Two-branch query, with due-reminder index", STUDENT_REMINDERS_QUERY, sample_ids)
+    finally:
+        if not args.keep:
+            cursor.execute(f"DROP DATABASE IF EXISTS {BENCH_SCHEMA}")
+        cursor.close()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
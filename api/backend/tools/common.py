@@ -0,0 +1,26 @@
+"""
+Shared helpers for the command-line tools in backend/tools
+Location: api/backend/tools/common.py
+"""
+
+import os
+from pathlib import Path
+
+import pymysql
+from dotenv import load_dotenv
+from pymysql import cursors
+
+API_DIR = Path(__file__).resolve().parents[2]
+
+
+def connect():
+    """Open a direct connection using the same .env settings as the API."""
+    load_dotenv(API_DIR / ".env")
+    return pymysql.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=int(os.getenv("DB_PORT", "3306")),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("MYSQL_ROOT_PASSWORD"),
+        database=os.getenv("DB_NAME"),
+        cursorclass=cursors.DictCursor,
+    )
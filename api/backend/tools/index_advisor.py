@@ -0,0 +1,170 @@
+"""
+Index advisor: EXPLAIN every SQL statement in the API
+Location: api/backend/tools/index_advisor.py
+
+Pulls the SELECT/WITH string literals out of every module under
+api/backend (routes and the helpers they call), runs EXPLAIN on each against
+the configured database, and flags full table scans, filesorts and temporary
+tables. Exits non-zero when anything is flagged so it can gate a deploy.
+
+Queries completed at runtime (f-strings and str.format templates) are
+EXPLAINed with every runtime-filled part set to 1, which covers IN lists,
+column lists and WHERE/ORDER BY templates. Those that still do not parse
+(e.g. a UNION of generated subqueries) are reported as DYN; the common ones
+are checked through SAMPLE_QUERIES instead. Full scans of tables estimated
+below --min-rows (default 1000) are ignored so lookup tables do not drown
+the report.
+
+Usage (from the api/ folder, with the same .env the API uses):
+    python -m backend.tools.index_advisor [--min-rows N] [--no-fail]
+"""
+
+import argparse
+import ast
+import datetime
+import re
+import string
+import sys
+
+import pymysql
+
+from backend.tools.common import API_DIR, connect
+
+BACKEND_DIR = API_DIR / "backend"
+
+SQL_START = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+
+DEFAULT_MIN_ROWS = 1000
+
+# Stands in for whatever a query gets at runtime: an IN list, a column list,
+# a WHERE condition or an ORDER BY key
+RUNTIME_VALUE = "1"
+
+
+def _calendar_sample():
+    from backend.studylink.student.student_routes import _calendar_query
+    today = datetime.date.today()
+    return _calendar_query((1, today, today + datetime.timedelta(days=30)), None, 500)[0]
+
+
+# Queries assembled from generated pieces, built with representative arguments
+SAMPLE_QUERIES = {
+    "student calendar (_calendar_query)": _calendar_sample,
+}
+
+
+def _render_fstring(node):
+    parts = []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append(value.value)
+        else:
+            parts.append(RUNTIME_VALUE)
+    return "".join(parts)
+
+
+def _render_template(sql):
+    """Fill str.format fields; returns sql unchanged if it is not a template."""
+    try:
+        fields = [name for _, name, _, _ in string.Formatter().parse(sql) if name is not None]
+    except ValueError:
+        return sql
+    if not fields:
+        return sql
+    return sql.format_map({name: RUNTIME_VALUE for name in fields})
+
+
+def find_statements(root=BACKEND_DIR):
+    """
+    Yield (path, line, sql, dynamic) for every SELECT/WITH string literal
+    under root; f-strings and templates come back rendered, with dynamic set.
+    """
+    for path in sorted(root.rglob("*.py")):
+        tree = ast.parse(path.read_text(), filename=str(path))
+        fstring_parts = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.JoinedStr):
+                fstring_parts.update(id(value) for value in node.values)
+                sql = _render_fstring(node)
+                if SQL_START.match(sql):
+                    yield path.relative_to(API_DIR), node.lineno, sql, True
+            elif (isinstance(node, ast.Constant) and isinstance(node.value, str)
+                  and id(node) not in fstring_parts and SQL_START.match(node.value)):
+                sql = _render_template(node.value)
+                yield path.relative_to(API_DIR), node.lineno, sql, sql != node.value
+
+
+def to_explainable(sql):
+    """Swap DB-API placeholders for literals so the statement can be EXPLAINed."""
+    return sql.replace("%s", "1").replace("%%", "%")
+
+
+def review_plan(plan, min_rows):
+    """Return human-readable findings for one EXPLAIN result."""
+    findings = []
+    for row in plan:
+        table = row.get("table")
+        rows = row.get("rows") or 0
+        extra = row.get("Extra") or ""
+        if row.get("type") == "ALL" and rows >= min_rows:
+            findings.append(f"full scan of {table} (~{rows} rows)")
+        if "Using filesort" in extra:
+            findings.append(f"filesort on {table}")
+        if "Using temporary" in extra:
+            findings.append(f"temporary table for {table}")
+    return findings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-rows", type=int, default=DEFAULT_MIN_ROWS,
+                        help=f"ignore full scans of tables estimated below this many rows (default {DEFAULT_MIN_ROWS})")
+    parser.add_argument("--no-fail", action="store_true",
+                        help="always exit 0, just print the report")
+    args = parser.parse_args(argv)
+
+    conn = connect()
+    cursor = conn.cursor()
+    flagged = skipped = dynamic = checked = 0
+
+    statements = [(f"{path}:{line}", sql, is_dynamic) for path, line, sql, is_dynamic in find_statements()]
+    for label, build in SAMPLE_QUERIES.items():
+        try:
+            statements.append((f"sample {label}", build(), False))
+        except Exception as e:
+            skipped += 1
+            print(f"SKIP  sample {label}  could not build: {e}")
+
+    for where, sql, is_dynamic in statements:
+        try:
+            cursor.execute("EXPLAIN " + to_explainable(sql))
+            plan = cursor.fetchall()
+        except pymysql.MySQLError as e:
+            # Fragments completed at runtime (e.g. "WHERE 1=1" + filters) still
+            # parse; anything else is reported but does not fail the run.
+            if is_dynamic:
+                dynamic += 1
+                print(f"DYN   {where}  built at runtime, not analysed")
+            else:
+                skipped += 1
+                print(f"SKIP  {where}  {e.args[-1]}")
+            continue
+
+        checked += 1
+        findings = review_plan(plan, args.min_rows)
+        if findings:
+            flagged += 1
+            print(f"FLAG  {where}")
+            for finding in findings:
+                print(f"        - {finding}")
+
+    cursor.close()
+    conn.close()
+
+    print(f"\n{checked} statements checked, {flagged} flagged, {skipped} skipped, "
+          f"{dynamic} built at runtime and not analysed")
+    return 0 if args.no_fail or flagged == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Rebuild metric_daily_rollup from the metric table
+Location: api/backend/tools/rebuild_daily_rollup.py
+
+The API keeps the rollup current as metrics are written; this backfills it
+for existing data or repairs it after metrics change outside the API (e.g.
+cascaded deletes or hand-run SQL). Runs in a single transaction.
+
+Usage (from the api/ folder, with the same .env the API uses):
+    python -m backend.tools.rebuild_daily_rollup [--student ID]
+"""
+
+import argparse
+import sys
+
+from backend.studylink.data_analyst import metric_rollup
+from backend.tools.common import connect
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--student", type=int, default=None,
+                        help="only rebuild the rows for this studentID")
+    args = parser.parse_args(argv)
+
+    conn = connect()
+    cursor = conn.cursor()
+    try:
+        days = metric_rollup.rebuild(cursor, args.student)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    scope = f"student {args.student}" if args.student is not None else "all students"
+    print(f"Rebuilt metric_daily_rollup for {scope}: {days} day rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Rebuild student_week_load from assignments and events
+Location: api/backend/tools/rebuild_week_load.py
+
+The API keeps the weekly vectors current as assignments, events and
+enrollments are written; this backfills them or repairs them after changes
+made outside the API (e.g. cascaded deletes or hand-run SQL). Runs in a
+single transaction.
+
+Usage (from the api/ folder, with the same .env the API uses):
+    python -m backend.tools.rebuild_week_load [--student ID]
+"""
+
+import argparse
+import sys
+
+from backend.studylink.student import week_load
+from backend.tools.common import connect
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--student", type=int, default=None,
+                        help="only rebuild the rows for this studentID")
+    args = parser.parse_args(argv)
+
+    conn = connect()
+    cursor = conn.cursor()
+    try:
+        weeks = week_load.rebuild(cursor, args.student)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    scope = f"student {args.student}" if args.student is not None else "all students"
+    print(f"Rebuilt student_week_load for {scope}: {weeks} week rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+from backend.studylink.data_analyst.cohorts import METRICS, QUANTILES, compare
+
+COHORTS = [{"name": "All", "filters": {}}, {"name": "CS", "filters": {"major": "Computer Science"}}]
+
+
+def _row(student_id, cohorts, **values):
+    row = {"studentID": student_id, **{column: None for column in METRICS.values()}, **values}
+    row.update({f"cohort_{i}": member for i, member in enumerate(cohorts)})
+    return row
+
+
+def _assert_empty(stats, bins):
+    assert stats["count"] == 0
+    assert stats["mean"] is None and stats["std"] is None
+    assert stats["min"] is None and stats["max"] is None
+    assert stats["quantiles"] == {f"p{int(q * 100)}": None for q in QUANTILES}
+    assert stats["histogram"] == [0] * bins
+
+
+def test_no_matching_students():
+    result = compare([], COHORTS, 10)
+
+    assert result["students"] == 0
+    assert [cohort["size"] for cohort in result["cohorts"]] == [0, 0]
+    for cohort in result["cohorts"]:
+        for metric in METRICS:
+            _assert_empty(cohort["metrics"][metric], 10)
+    assert all(len(edges) == 11 for edges in result["binEdges"].values())
+
+
+def test_metric_with_no_values():
+    rows = [_row(1, (1, 1), GPA=3.5), _row(2, (1, 0), GPA=2.5)]
+
+    result = compare(rows, COHORTS, 4)
+
+    everyone, cs = result["cohorts"]
+    assert (everyone["size"], cs["size"]) == (2, 1)
+    assert everyone["metrics"]["GPA"]["count"] == 2
+    assert everyone["metrics"]["GPA"]["mean"] == 3.0
+    assert cs["metrics"]["GPA"]["max"] == 3.5
+    # No student has study data, in any cohort
+    for cohort in result["cohorts"]:
+        _assert_empty(cohort["metrics"]["studyHours"], 4)
@@ -0,0 +1,33 @@
+from backend.studylink.student.grade_engine import compute_standings
+
+
+def _row(course_id, assignment_id, weight, max_score, score, status="graded"):
+    return {"studentID": 1, "courseID": course_id, "assignmentID": assignment_id, "status": status,
+            "weight": weight, "maxScore": max_score, "scoreReceived": score, "assignmentType": "Homework"}
+
+
+def test_unweighted_assignment_in_weighted_course_counts():
+    rows = [_row(1, 1, 2.0, 100, 50), _row(1, 2, None, 100, 100), _row(1, 3, 2.0, 100, None, "submitted")]
+
+    standing, = compute_standings(rows)
+
+    # The unweighted assignment gets 2 / 100 per point, like its weighted peers
+    assert standing["totalWeight"] == 6.0
+    assert standing["currentGrade"] == 75.0
+    assert standing["weighting"] == "mixed"
+    assert standing["inferredWeights"] == 1
+    assert (standing["totalAssignments"], standing["gradedAssignments"]) == (3, 2)
+
+
+def test_points_based_and_empty_courses():
+    rows = [_row(2, 4, None, 50, 50), _row(2, 5, None, 100, None, "submitted"),
+            _row(3, None, None, None, None, None)]
+
+    points, empty = compute_standings(rows)
+
+    assert points["weighting"] == "points"
+    assert points["currentGrade"] == 100.0
+    assert points["floorGrade"] == 33.33
+    assert empty["weighting"] is None
+    assert empty["totalAssignments"] == 0
+    assert empty["currentGrade"] is None
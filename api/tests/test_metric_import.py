@@ -0,0 +1,24 @@
+from backend.studylink.System_Admin.metric_import import import_outcome, normalize_metric
+
+
+def test_import_outcome():
+    assert import_outcome(5, 0) == ("Completed", 201)
+    assert import_outcome(5, 2) == ("Partial", 200)
+    assert import_outcome(0, 3) == ("Failed", 500)
+    # Invalid rows alone are the client's data, not a server fault
+    assert import_outcome(0, 0, 4) == ("Failed", 422)
+    assert import_outcome(3, 0, 4) == ("Completed", 201)
+    assert import_outcome(0, 2, 4) == ("Failed", 500)
+
+
+def test_normalize_metric_rejects_bad_values():
+    row = {"studentID": "7", "category": "study", "privacyLevel": "private", "unit": "hours",
+           "metricType": "numeric", "metricName": "study_hours", "metricValue": "2.5"}
+
+    metric, error = normalize_metric(row)
+    assert error is None
+    assert metric["studentID"] == 7
+
+    assert normalize_metric(dict(row, metricValue="lots"))[1] == "metricValue must be numeric"
+    assert normalize_metric(dict(row, metricValue="NaN"))[1] == "metricValue must be finite"
+    assert normalize_metric(dict(row, unit=""))[1] == "missing unit"
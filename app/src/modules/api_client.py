@@ -0,0 +1,64 @@
+# modules/api_client.py
+# Conditional GET helper for the student pages, Arrow loader for the analyst pages
+
+import threading
+from collections import OrderedDict
+
+import pyarrow as pa
+import requests
+
+# Last 200 response per (url, params): (etag, body bytes, headers)
+_MAX_ENTRIES = 256
+_store = OrderedDict()
+_lock = threading.Lock()
+
+
+def conditional_get(url, params=None, timeout=10):
+    """
+    requests.get() that sends the ETag from the last 200 response for the
+    same URL and params. When the API answers 304 Not Modified, the stored
+    body and headers are put back on the response and it is returned as a
+    200, so callers can keep using status_code/json()/headers unchanged.
+    """
+    key = (url, tuple(sorted((params or {}).items())))
+    with _lock:
+        cached = _store.get(key)
+
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    response = requests.get(url, params=params, headers=headers, timeout=timeout)
+
+    if response.status_code == 304 and cached:
+        etag, body, cached_headers = cached
+        response.status_code = 200
+        response._content = body
+        response.headers.update(cached_headers)
+        with _lock:
+            if key in _store:
+                _store.move_to_end(key)
+    elif response.status_code == 200 and response.headers.get("ETag"):
+        with _lock:
+            _store[key] = (response.headers["ETag"], response.content, dict(response.headers))
+            _store.move_to_end(key)
+            while len(_store) > _MAX_ENTRIES:
+                _store.popitem(last=False)
+    return response
+
+
+def fetch_frame(url, params=None, timeout=30):
+    """
+    Load one of the API's columnar /export endpoints into a DataFrame. The
+    Arrow IPC stream is read straight into Arrow memory and handed to
+    pandas without a JSON parse, keeping DECIMAL/DATE/BOOLEAN column types.
+    """
+    response = requests.get(url, params={**(params or {}), "format": "arrow"}, timeout=timeout)
+    response.raise_for_status()
+    table = pa.ipc.open_stream(response.content).read_all()
+    # split_blocks/self_destruct avoid consolidating (copying) columns
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def fetch_export(url, params=None, fmt="parquet", timeout=60):
+    """Raw bytes of an /export endpoint in the given format, for download buttons."""
+    response = requests.get(url, params={**(params or {}), "format": fmt}, timeout=timeout)
+    response.raise_for_status()
+    return response.content
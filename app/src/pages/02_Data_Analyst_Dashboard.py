@@ -4,6 +4,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from modules.nav import SideBarLinks
+from modules.api_client import fetch_export, fetch_frame
 from datetime import datetime, timedelta
 
 # Page configuration
@@ -327,17 +328,14 @@ st.divider()
 st.markdown("### Student Reports")
 st.caption("View individual student reports for advisor presentations")
 
-# Fetch all student reports from /analyst/students/reports
-reports_data = []
+# Fetch all student reports from the columnar /analyst/students/reports/export
+reports_df = pd.DataFrame()
 try:
-    response = requests.get(f"{API_BASE}/analyst/students/reports", timeout=5)
-    if response.status_code == 200:
-        reports_data = response.json()
+    reports_df = fetch_frame(f"{API_BASE}/analyst/students/reports/export")
 except:
     pass
 
-if reports_data and len(reports_data) > 0:
-    reports_df = pd.DataFrame(reports_data)
+if not reports_df.empty:
     
     # Add status styling
     def get_status_color(status):
@@ -438,8 +436,23 @@ with export_col3:
         st.markdown("**🎓 Student Reports**")
         st.caption("Export comprehensive student reports")
         if st.button("Export All Student Reports", use_container_width=True):
-            if reports_data:
-                df = pd.DataFrame(reports_data)
+            if not reports_df.empty:
+                # Batch requests (500 students each) return the full reports
+                ids = [int(sid) for sid in reports_df['studentID']]
+                full_reports = []
+                try:
+                    for start in range(0, len(ids), 500):
+                        response = requests.post(
+                            f"{API_BASE}/analyst/students/reports/batch",
+                            json={"studentIDs": ids[start:start + 500]},
+                            timeout=10
+                        )
+                        response.raise_for_status()
+                        full_reports.extend(response.json().get('reports', []))
+                except Exception as e:
+                    st.warning(f"Exporting summary rows only: {e}")
+                    full_reports = reports_df
+                df = pd.DataFrame(full_reports)
                 csv = df.to_csv(index=False)
                 st.download_button(
                     "📥 Download",
@@ -449,6 +462,16 @@ with export_col3:
                 )
             else:
                 st.warning("No data available for export")
+        if st.button("Export Summaries as Parquet", use_container_width=True):
+            try:
+                st.download_button(
+                    "📥 Download",
+                    fetch_export(f"{API_BASE}/analyst/students/reports/export"),
+                    f"student_reports_{datetime.now().strftime('%Y%m%d')}.parquet",
+                    "application/vnd.apache.parquet"
+                )
+            except Exception as e:
+                st.error(f"Export failed: {e}")
 
 # Footer
 st.markdown("---")
@@ -1,7 +1,9 @@
 import streamlit as st
 import requests
 import pandas as pd
+import plotly.graph_objects as go
 from modules.nav import SideBarLinks
+from modules.api_client import fetch_frame
 from datetime import datetime
 
 # Page configuration
@@ -30,7 +32,7 @@ st.title("Data Quality Tools")
 st.caption("User Story 1.4 - Fix, correct, and maintain data integrity")
 
 # Tabs for different functionalities
-tab1, tab2, tab3, tab4 = st.tabs(["Metrics Editor", "Error Tracking", "Assignments", "Audit Log"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["Metrics Editor", "Error Tracking", "Assignments", "Audit Log", "Metric Trends"])
 
 # ============================================
 # TAB 1: Metrics Editor (User Story 1.4)
@@ -75,9 +77,18 @@ with tab1:
         if metric_type != "All":
             params['metricType'] = metric_type
         
+        # Keyset pagination: restart from the first page whenever the filters change
+        filter_key = tuple(sorted(params.items()))
+        if st.session_state.get('metrics_filter_key') != filter_key:
+            st.session_state['metrics_filter_key'] = filter_key
+            st.session_state['metrics_cursor'] = None
+        if st.session_state.get('metrics_cursor'):
+            params['cursor'] = st.session_state['metrics_cursor']
+        
         response = requests.get(f"{API_BASE}/data/metrics", params=params, timeout=5)
         if response.status_code == 200:
             metrics = response.json()
+            st.session_state['metrics_next_cursor'] = response.headers.get('X-Next-Cursor')
         else:
             metrics_error = f"API returned status {response.status_code}"
     except requests.exceptions.ConnectionError:
@@ -88,9 +99,20 @@ with tab1:
     # Display metrics table
     if metrics and len(metrics) > 0:
         df = pd.DataFrame(metrics)
-        st.caption(f"Found {len(df)} metrics")
+        st.caption(f"Showing {len(df)} metrics")
         st.dataframe(df, use_container_width=True, hide_index=True)
         
+        page_col1, page_col2 = st.columns(2)
+        with page_col1:
+            if st.session_state.get('metrics_cursor') and st.button("⏮ First page", use_container_width=True):
+                st.session_state['metrics_cursor'] = None
+                st.rerun()
+        with page_col2:
+            next_cursor = st.session_state.get('metrics_next_cursor')
+            if next_cursor and st.button("Next page ⏭", use_container_width=True):
+                st.session_state['metrics_cursor'] = next_cursor
+                st.rerun()
+        
         # Edit metric section
         st.markdown("---")
         st.markdown("#### Edit Metric")
@@ -516,18 +538,16 @@ with tab4:
             st.session_state['filter_audit'] = True
     
     # Fetch metrics that have been corrected (contain [CORRECTED] in description)
-    corrected_metrics = []
+    corrected_df = pd.DataFrame()
     try:
-        response = requests.get(f"{API_BASE}/data/metrics", timeout=5)
-        if response.status_code == 200:
-            all_metrics = response.json()
-            corrected_metrics = [m for m in all_metrics if m.get('description') and '[CORRECTED]' in str(m.get('description', ''))]
+        all_metrics = fetch_frame(f"{API_BASE}/data/metrics/export")
+        corrected = all_metrics['description'].fillna('').str.contains('[CORRECTED]', regex=False)
+        corrected_df = all_metrics[corrected]
     except:
         pass
     
-    if corrected_metrics:
+    if not corrected_df.empty:
         st.markdown("#### Corrected Metrics")
-        corrected_df = pd.DataFrame(corrected_metrics)
         
         # Select relevant columns for audit display
         display_cols = ['metricID', 'studentID', 'metricName', 'metricValue', 'category', 'metricDate', 'description']
@@ -572,6 +592,76 @@ with tab4:
     else:
         st.info("No resolved errors to display")
 
+# ============================================
+# TAB 5: Metric Trends (User Story 1.2)
+# ============================================
+with tab5:
+    st.subheader("Metric Trends")
+    st.markdown("Plot one metric over time. The API buckets and downsamples the data, so long ranges stay fast.")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        series_students = st.text_input("Student IDs", value="1", placeholder="e.g., 1, 5, 14", key="series_students")
+        series_metric = st.selectbox("Metric Name", ["study_hrs", "sleep", "stress", "attendance_pct"], key="series_metric")
+    with col2:
+        series_start = st.date_input("From Date", value=datetime(2025, 1, 1), key="series_start")
+        series_end = st.date_input("To Date", value=datetime.now(), key="series_end")
+    with col3:
+        series_bucket = st.selectbox("Bucket", ["day", "week", "hour"], key="series_bucket")
+        series_points = st.slider("Max points per student", min_value=20, max_value=1000, value=200, step=20, key="series_points")
+    
+    series = []
+    series_error = None
+    try:
+        params = {
+            'studentID': series_students.replace(' ', ''),
+            'metricName': series_metric,
+            'start': series_start.isoformat(),
+            'end': series_end.isoformat(),
+            'bucket': series_bucket,
+            'points': series_points
+        }
+        response = requests.get(f"{API_BASE}/data/metrics/series", params=params, timeout=10)
+        if response.status_code == 200:
+            series = response.json().get('series', [])
+        else:
+            series_error = response.json().get('error', f"API returned status {response.status_code}")
+    except requests.exceptions.ConnectionError:
+        series_error = "Cannot connect to API server"
+    except Exception as e:
+        series_error = str(e)
+    
+    if series_error:
+        st.warning(f"Could not load series: {series_error}")
+    elif not any(s['points'] for s in series):
+        st.info("No values recorded for this metric in the selected range")
+    else:
+        fig = go.Figure()
+        for s in series:
+            if not s['points']:
+                continue
+            points_df = pd.DataFrame(s['points'])
+            points_df['bucketStart'] = pd.to_datetime(points_df['bucketStart'])
+            name = f"Student {s['studentID']}"
+            # Shaded min-max range behind each student's average line
+            fig.add_trace(go.Scatter(x=points_df['bucketStart'], y=points_df['max'], mode='lines',
+                                     line=dict(width=0), showlegend=False, hoverinfo='skip'))
+            fig.add_trace(go.Scatter(x=points_df['bucketStart'], y=points_df['min'], mode='lines',
+                                     line=dict(width=0), fill='tonexty', opacity=0.2,
+                                     showlegend=False, hoverinfo='skip'))
+            fig.add_trace(go.Scatter(x=points_df['bucketStart'], y=points_df['avg'], mode='lines+markers',
+                                     name=name, customdata=points_df[['min', 'max', 'count']],
+                                     hovertemplate="%{x}<br>avg %{y:.2f} (min %{customdata[0]}, "
+                                                   "max %{customdata[1]}, n=%{customdata[2]})"))
+        fig.update_layout(height=400, xaxis_title="", yaxis_title=series_metric)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        summary = pd.DataFrame([
+            {'Student': s['studentID'], 'Buckets': s['buckets'], 'Points shown': len(s['points'])}
+            for s in series
+        ])
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+
 # Footer
 st.markdown("---")
 st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Data Analyst: {st.session_state.get('user_name', 'Jordan Lee')}")
\ No newline at end of file
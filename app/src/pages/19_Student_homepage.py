@@ -1,6 +1,7 @@
 import streamlit as st
 import requests
 from modules.nav import SideBarLinks
+from modules.api_client import conditional_get
 
 # Page Configuration
 st.set_page_config(
@@ -43,21 +44,18 @@ API_BASE = "http://web-api:4000"  # Use Docker service name
 
 col1, col2, col3, col4 = st.columns(4)
 
-# Fetch quick stats
+# Fetch everything the page shows in one request
+calendar_items = []
 try:
-    # Get courses count
-    courses_res = requests.get(f"{API_BASE}/student/courses", params={"studentID": student_id}, timeout=5)
-    courses_count = len(courses_res.json()) if courses_res.status_code == 200 else 0
-    
-    # Get upcoming assignments
-    calendar_res = requests.get(f"{API_BASE}/student/calendar", params={"studentID": student_id}, timeout=5)
-    calendar_items = calendar_res.json() if calendar_res.status_code == 200 else []
-    assignments_count = len([i for i in calendar_items if i.get('itemType') == 'assignment'])
-    events_count = len([i for i in calendar_items if i.get('itemType') == 'event'])
-    
-    # Get active reminders
-    reminders_res = requests.get(f"{API_BASE}/student/reminders", params={"studentID": student_id}, timeout=5)
-    reminders_count = len(reminders_res.json()) if reminders_res.status_code == 200 else 0
+    home_res = conditional_get(f"{API_BASE}/student/{student_id}/home", params={"limit": 5}, timeout=5)
+    home_res.raise_for_status()
+    home = home_res.json()
+    calendar_items = home.get('calendar', [])
+    counts = home.get('counts', {})
+    courses_count = counts.get('courses', 0)
+    assignments_count = counts.get('upcomingAssignments', 0)
+    events_count = counts.get('upcomingEvents', 0)
+    reminders_count = counts.get('activeReminders', 0)
 
     with col1:
         st.metric("Enrolled Courses", courses_count)
@@ -114,7 +112,7 @@ st.subheader("Recent Calendar Items")
 
 try:
     if calendar_items:
-        for item in calendar_items[:5]:  # Show first 5 items
+        for item in calendar_items:  # Next 5 items from /home
             title = item.get('assignmentTitle', 'Unknown')
             due_date = item.get('dueDate', 'N/A')
             status = item.get('status', '')
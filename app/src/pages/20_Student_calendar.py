@@ -2,6 +2,7 @@ import streamlit as st
 import requests
 import datetime as dt
 from modules.nav import SideBarLinks
+from modules.api_client import conditional_get
 
 # Page Setup
 st.set_page_config(page_title="Calendar", page_icon="📅", layout="wide")
@@ -46,15 +47,24 @@ def get_color(item):
 # API FUNCTIONS
 # ============================================
 @st.cache_data(ttl=10)
-def fetch_calendar(sid):
+def fetch_calendar(sid, date_from, date_to):
+    """Fetch every item in the window, following the API's page cursors."""
+    items = []
+    params = {"studentID": sid, "from": str(date_from), "to": str(date_to)}
     try:
-        r = requests.get(f"{API}?studentID={sid}", timeout=10)
-        if r.status_code == 200:
-            return r.json()
-        return []
+        while True:
+            r = conditional_get(API, params=params, timeout=10)
+            if r.status_code != 200:
+                break
+            items.extend(r.json())
+            next_cursor = r.headers.get("X-Next-Cursor")
+            if not next_cursor:
+                break
+            params["cursor"] = next_cursor
+        return items
     except Exception as e:
         st.error(f"API Error: {e}")
-        return []
+        return items
 
 def create_calendar_item(payload):
     return requests.post(API, json=payload, timeout=10)
@@ -67,15 +77,22 @@ def delete_item(item_type, item_id):
 
 
 # LOAD DATA
-calendar_items = fetch_calendar(student_id)
+today = dt.date.today()
+monday = today - dt.timedelta(days=today.weekday())
+window = st.date_input(
+    "Show items between:",
+    value=(monday, monday + dt.timedelta(weeks=8, days=-1)),
+    key="cal_window"
+)
+# The range picker returns a single date until both ends are chosen
+window_start, window_end = window if len(window) == 2 else (window[0], window[0])
+calendar_items = fetch_calendar(student_id, window_start, window_end)
 
 # ============================================
 # WEEKLY GRID VIEW
 # ============================================
 st.markdown("### Weekly Calendar View")
 
-today = dt.date.today()
-monday = today - dt.timedelta(days=today.weekday())
 week_dates = [monday + dt.timedelta(days=i) for i in range(7)]
 labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
@@ -249,7 +266,7 @@ with tab2:
         
         # Fetch courses for dropdown
         try:
-            courses_res = requests.get(f"{API_BASE}/student/courses", params={"studentID": student_id}, timeout=5)
+            courses_res = conditional_get(f"{API_BASE}/student/courses", params={"studentID": student_id}, timeout=5)
             courses = courses_res.json() if courses_res.status_code == 200 else []
         except:
             courses = []
@@ -1,7 +1,8 @@
 import streamlit as st
 import requests
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
 from modules.nav import SideBarLinks
+from modules.api_client import conditional_get
 
 # PAGE CONFIG
 st.set_page_config(page_title="Reminders", page_icon="🔔", layout="wide")
@@ -11,6 +12,9 @@ SideBarLinks()
 API_BASE = "http://web-api:4000"
 API = f"{API_BASE}/student/reminders"
 
+# How far ahead the event/assignment pickers look
+REMINDER_WINDOW_DAYS = 180
+
 # AUTH CHECK
 if not st.session_state.get("authenticated", False):
     st.warning("Please log in from the Home page.")
@@ -35,7 +39,7 @@ st.write("Stay on top of deadlines and upcoming events!")
 def fetch_reminders(sid):
     """Fetch all active reminders for a student."""
     try:
-        response = requests.get(API, params={"studentID": sid}, timeout=10)
+        response = conditional_get(API, params={"studentID": sid}, timeout=10)
         if response.status_code == 200:
             return response.json()
         return []
@@ -44,15 +48,23 @@ def fetch_reminders(sid):
         return []
 
 @st.cache_data(ttl=30)
-def fetch_calendar_items(sid):
-    """Fetch calendar items to link reminders to."""
+def fetch_calendar_items(sid, date_from, date_to):
+    """Fetch calendar items to link reminders to, following the API's page cursors."""
+    items = []
+    params = {"studentID": sid, "from": str(date_from), "to": str(date_to)}
     try:
-        res = requests.get(f"{API_BASE}/student/calendar", params={"studentID": sid}, timeout=10)
-        if res.status_code == 200:
-            return res.json()
-        return []
-    except:
-        return []
+        while True:
+            res = conditional_get(f"{API_BASE}/student/calendar", params=params, timeout=10)
+            if res.status_code != 200:
+                break
+            items.extend(res.json())
+            next_cursor = res.headers.get("X-Next-Cursor")
+            if not next_cursor:
+                break
+            params["cursor"] = next_cursor
+        return items
+    except Exception:
+        return items
 
 def create_reminder(payload):
     """Create a new reminder."""
@@ -69,7 +81,8 @@ def delete_reminder(reminder_id):
 
 # LOAD DATA
 reminders = fetch_reminders(student_id)
-calendar_items = fetch_calendar_items(student_id)
+# Reminders are for what is coming up, so only offer upcoming items
+calendar_items = fetch_calendar_items(student_id, date.today(), date.today() + timedelta(days=REMINDER_WINDOW_DAYS))
 
 # Separate assignments and events for linking
 assignments = [i for i in calendar_items if i.get("itemType") == "assignment"]
@@ -255,7 +268,7 @@ with st.form("add_reminder_form"):
             selected = st.selectbox("Select Assignment:", list(assignment_options.keys()))
             assignment_id = assignment_options[selected]
         else:
-            st.warning("No assignments found. Create one in the Calendar first, or enter ID manually.")
+            st.warning("No upcoming assignments found. Create one in the Calendar first, or enter ID manually.")
             assignment_id = st.number_input("Assignment ID:", min_value=1, step=1, key="manual_assign_id")
     else:
         if events:
@@ -266,7 +279,7 @@ with st.form("add_reminder_form"):
             selected = st.selectbox("Select Event:", list(event_options.keys()))
             event_id = event_options[selected]
         else:
-            st.warning("No events found. Create one in the Calendar or Events page first, or enter ID manually.")
+            st.warning("No upcoming events found. Create one in the Calendar or Events page first, or enter ID manually.")
             event_id = st.number_input("Event ID:", min_value=1, step=1, key="manual_event_id")
     
     submitted = st.form_submit_button("Add Reminder", type="primary")
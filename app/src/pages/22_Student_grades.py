@@ -2,6 +2,7 @@ import streamlit as st
 import requests
 import pandas as pd
 from modules.nav import SideBarLinks
+from modules.api_client import conditional_get
 
 # PAGE CONFIG
 st.set_page_config(page_title="Grades", page_icon="📊", layout="wide")
@@ -35,7 +36,7 @@ st.write("Track your grades, assignment progress, and estimated GPA.")
 def fetch_grades(sid):
     """Fetch all grades for a student."""
     try:
-        res = requests.get(API, params={"studentID": sid}, timeout=10)
+        res = conditional_get(API, params={"studentID": sid}, timeout=10)
         if res.status_code == 200:
             return res.json()
         return []
@@ -47,7 +48,7 @@ def fetch_grades(sid):
 def fetch_grade_summary(sid):
     """Fetch grade summary by course."""
     try:
-        res = requests.get(f"{API}/summary", params={"studentID": sid}, timeout=10)
+        res = conditional_get(f"{API}/summary", params={"studentID": sid}, timeout=10)
         if res.status_code == 200:
             return res.json()
         return []
@@ -105,29 +106,9 @@ if grades:
     else:
         avg_percentage = 0
     
-    # GPA calculation
-    def pct_to_gpa(p):
-        if pd.isna(p) or p is None:
-            return None
-        p = float(p)
-        if p >= 93: return 4.0
-        if p >= 90: return 3.7
-        if p >= 87: return 3.3
-        if p >= 83: return 3.0
-        if p >= 80: return 2.7
-        if p >= 77: return 2.3
-        if p >= 73: return 2.0
-        if p >= 70: return 1.7
-        if p >= 67: return 1.3
-        if p >= 63: return 1.0
-        if p >= 60: return 0.7
-        return 0.0
-    
-    if 'percentageScore' in df.columns:
-        gpa_values = df['percentageScore'].dropna().apply(pct_to_gpa)
-        estimated_gpa = gpa_values.mean() if len(gpa_values) > 0 else 0
-    else:
-        estimated_gpa = 0
+    # Estimated GPA from the API's per-course standings
+    gpa_values = [c['gpaPoints'] for c in summary if c.get('gpaPoints') is not None]
+    estimated_gpa = sum(gpa_values) / len(gpa_values) if gpa_values else 0
     
     # Display metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -159,7 +140,15 @@ if summary:
         for j, col in enumerate(cols):
             if i + j < len(summary):
                 course = summary[i + j]
-                avg_score = safe_float(course.get('averageScore'), 0)
+                avg_score = safe_float(course.get('currentGrade'), safe_float(course.get('averageScore'), 0))
+                projected = course.get('projectedGrade')
+                needed = course.get('neededOnRemaining')
+                if needed is not None:
+                    outlook = f"Projected {safe_float(projected):.1f}% • need {safe_float(needed):.0f}% on the rest for {course.get('targetGrade', 90):.0f}%"
+                elif projected is not None:
+                    outlook = f"Final grade {safe_float(projected):.1f}% ({course.get('letterGrade', '')})"
+                else:
+                    outlook = "No graded work yet"
                 
                 # Color based on score
                 if avg_score >= 80:
@@ -178,7 +167,7 @@ if summary:
                 with col:
                     st.markdown(f"""
                     <div style="padding:20px; border-radius:12px; background:linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%); 
-                                border:1px solid #e0e0e0; border-left:5px solid {color}; height:180px;">
+                                border:1px solid #e0e0e0; border-left:5px solid {color}; height:200px;">
                         <h4 style="margin:0 0 5px 0; color:#333;">{course.get('courseCode', 'N/A')}</h4>
                         <p style="margin:0 0 15px 0; color:#666; font-size:13px; height:35px; overflow:hidden;">
                             {course.get('courseName', 'Unknown Course')}
@@ -187,6 +176,7 @@ if summary:
                         <p style="margin:5px 0 0 0; color:#888; font-size:12px;">
                             {graded}/{total} assignments graded ({progress:.0f}%)
                         </p>
+                        <p style="margin:5px 0 0 0; color:#888; font-size:12px;">{outlook}</p>
                     </div>
                     """, unsafe_allow_html=True)
                     st.write("")  # Spacing
@@ -39,10 +39,10 @@ def fetch_student_courses(sid):
         return []
 
 @st.cache_data(ttl=30)
-def fetch_course_catalog():
-    """Fetch all available courses in the catalog."""
+def fetch_course_catalog(sid):
+    """Fetch all available courses in the catalog, marked eligible/blocked for the student."""
     try:
-        res = requests.get(f"{API}/catalog", timeout=10)
+        res = requests.get(f"{API}/catalog", params={"studentID": sid}, timeout=10)
         if res.status_code == 200:
             return res.json()
         return []
@@ -61,7 +61,7 @@ def remove_course(sid, course_id):
 
 # LOAD DATA
 student_courses = fetch_student_courses(student_id)
-catalog = fetch_course_catalog()
+catalog = fetch_course_catalog(student_id)
 
 # Get list of enrolled course IDs for filtering
 enrolled_course_ids = [c.get('courseID') for c in student_courses]
@@ -213,6 +213,14 @@ else:
             instructor = c.get('instructor', 'TBA')
             location = c.get('location', 'TBA')
             term = c.get('termName', 'N/A')
+            blocked = c.get('eligibility') == 'blocked'
+            missing = c.get('missingPrerequisites')
+            if not blocked:
+                prereq_note = ""
+            elif missing is None:
+                prereq_note = "<br><span style='color:#e74c3c; font-size:12px;'>Prerequisites misconfigured (cycle)</span>"
+            else:
+                prereq_note = f"<br><span style='color:#e74c3c; font-size:12px;'>Missing prerequisites: {', '.join(missing)}</span>"
             
             with st.container():
                 col1, col2 = st.columns([5, 1])
@@ -223,12 +231,12 @@ else:
                         <strong>{course_code} - {course_name}</strong><br>
                         <span style="color:#666; font-size:13px;">
                             {department} • {credits} credits • {instructor} • {term}
-                        </span>
+                        </span>{prereq_note}
                     </div>
                     """, unsafe_allow_html=True)
                 
                 with col2:
-                    if st.button("Add", key=f"add_{course_id}", type="primary"):
+                    if st.button("Add", key=f"add_{course_id}", type="primary", disabled=blocked):
                         res = add_course(student_id, course_id)
                         if res.status_code == 201:
                             st.success(f"Added {course_code}!")
@@ -1,6 +1,9 @@
 import streamlit as st
 import requests
+import datetime as dt
+import pandas as pd
 from modules.nav import SideBarLinks
+from modules.api_client import conditional_get
 
 # PAGE CONFIG
 st.set_page_config(page_title="Workload Analysis", page_icon="📈", layout="wide")
@@ -28,10 +31,22 @@ student_name = st.session_state.get("name", "Student")
 # API FUNCTIONS
 # ============================================
 @st.cache_data(ttl=10)
-def fetch_workload(sid):
-    """Fetch weekly workload analysis for a student."""
+def fetch_workload(sid, week):
+    """Fetch the day-by-day workload forecast for one week."""
     try:
-        res = requests.get(API_WORKLOAD, params={"studentID": sid}, timeout=10)
+        res = conditional_get(API_WORKLOAD, params={"studentID": sid, "week": str(week)}, timeout=10)
+        if res.status_code == 200:
+            return res.json()
+        return []
+    except Exception as e:
+        st.error(f"Workload API Error: {e}")
+        return []
+
+@st.cache_data(ttl=10)
+def fetch_workload_trend(sid, first, last):
+    """Fetch per-week load vectors for a range of weeks."""
+    try:
+        res = conditional_get(API_WORKLOAD, params={"studentID": sid, "from": str(first), "to": str(last)}, timeout=10)
         if res.status_code == 200:
             return res.json()
         return []
@@ -53,7 +68,10 @@ def fetch_summary(sid):
 
 
 # LOAD DATA
-workload = fetch_workload(student_id)
+selected_day = st.date_input("Week of:", value=dt.date.today(), key="workload_week")
+week_start = selected_day - dt.timedelta(days=selected_day.weekday())
+workload = fetch_workload(student_id, week_start)
+trend = fetch_workload_trend(student_id, week_start - dt.timedelta(weeks=4), week_start + dt.timedelta(weeks=7))
 summary = fetch_summary(student_id)
 
 
@@ -67,7 +85,7 @@ st.divider()
 # ============================================
 # WEEKLY WORKLOAD OVERVIEW
 # ============================================
-st.subheader("This Week's Workload Forecast")
+st.subheader(f"Workload Forecast: Week of {week_start.strftime('%b %d, %Y')}")
 
 # Workload intensity colors
 INTENSITY_STYLES = {
@@ -183,6 +201,23 @@ else:
 st.divider()
 
 
+# ============================================
+# WEEKLY TREND
+# ============================================
+st.subheader("Weekly Trend")
+
+if trend:
+    trend_df = pd.DataFrame([
+        {"Week": w["week"], "Assignments": w["totalAssignments"], "Events": w["totalEvents"]}
+        for w in trend
+    ]).set_index("Week")
+    st.bar_chart(trend_df)
+else:
+    st.info("No workload trend available.")
+
+st.divider()
+
+
 # ============================================
 # STUDY SUMMARY HISTORY
 # ============================================
@@ -90,6 +90,7 @@ with c2:
         date_val = st.text_input("date (YYYY-MM-DD, optional)", value="")
         startTime = st.text_input("startTime (HH:MM:SS, optional)", value="")
         endTime = st.text_input("endTime (HH:MM:SS, optional)", value="")
+        prerequisites = st.text_input("prerequisites (course codes, comma-separated, optional)", value="")
         submit_course = st.form_submit_button("Create New Course", use_container_width=True)
 
     if submit_course:
@@ -103,6 +104,7 @@ with c2:
             "date": date_val or None,
             "startTime": startTime or None,
             "endTime": endTime or None,
+            "prerequisites": prerequisites or None,
         }
         code, data = call_api("POST", f"/terms/{int(term_id)}/courses", json_body=body)
         st.write(f"Status: {code}")
@@ -1,5 +1,6 @@
 import os
 import io
+import time
 import requests
 import pandas as pd
 import streamlit as st
@@ -18,6 +19,12 @@ if st.session_state.get("role") != "System Admin":
 
 API_BASE = os.getenv("API_BASE_URL", "http://web-api:4000").rstrip("/")
 
+# Give up polling an import job after this long, or once its row count has
+# not moved for JOB_STALL_SECONDS (e.g. the API restarted mid-import)
+JOB_POLL_TIMEOUT_SECONDS = 600
+JOB_STALL_SECONDS = 60
+FINISHED_JOB_STATUSES = ("Completed", "Partial", "Failed")
+
 def call_api(method, path, json_body=None, params=None):
     try:
         r = requests.request(method, f"{API_BASE}{path}", json=json_body, params=params, timeout=30)
@@ -75,7 +82,61 @@ with tab1:
             metrics.append(m)
 
         body = {"adminID": int(admin_id), "jobType": job_type, "metrics": metrics}
-        code, data = call_api("POST", "/imports/metrics", json_body=body)
+        code, data = call_api("POST", "/imports/metrics/async", json_body=body)
+        st.write(f"Status: {code}")
+        if isinstance(data, dict) and data.get("jobID") is not None:
+            job_id = int(data["jobID"])
+            st.session_state["last_job_id"] = job_id
+
+            # Poll the job instead of holding a request open for the whole import
+            bar = st.progress(0.0, text="Queued")
+            started = last_change = time.monotonic()
+            last_done = None
+            while True:
+                code, data = call_api("GET", f"/jobs/{job_id}")
+                if code != 200 or not isinstance(data, dict):
+                    break
+                total = data.get("totalRows") or len(metrics) or 1
+                done = data.get("rowsProcessed") or 0
+                bar.progress(
+                    min(done / total, 1.0),
+                    text=f"{data.get('status')} - {done}/{total} rows ({data.get('rowsPerSec', 0)} rows/s)"
+                )
+                if data.get("status") in FINISHED_JOB_STATUSES:
+                    break
+
+                now = time.monotonic()
+                if done != last_done:
+                    last_done, last_change = done, now
+                if now - last_change > JOB_STALL_SECONDS:
+                    st.warning(f"Job {job_id} has not made progress for {JOB_STALL_SECONDS}s "
+                               f"(status {data.get('status')}); stopped polling. Check GET /jobs/{job_id} later.")
+                    break
+                if now - started > JOB_POLL_TIMEOUT_SECONDS:
+                    st.warning(f"Job {job_id} is still {data.get('status')} after {JOB_POLL_TIMEOUT_SECONDS}s; "
+                               f"stopped polling. Check GET /jobs/{job_id} later.")
+                    break
+                time.sleep(1)
+        st.json(data)
+
+    st.divider()
+    st.subheader("POST /imports/metrics/stream")
+    st.caption("Upload a large NDJSON or CSV export; rows are validated and inserted as they stream in.")
+    upload = st.file_uploader("Metrics file", type=["csv", "ndjson", "jsonl"])
+
+    if upload is not None and st.button("Stream Import", use_container_width=True):
+        fmt = "csv" if upload.name.lower().endswith(".csv") else "ndjson"
+        try:
+            r = requests.post(
+                f"{API_BASE}/imports/metrics/stream",
+                params={"adminID": int(admin_id), "jobType": job_type, "format": fmt},
+                data=upload,
+                headers={"Content-Type": "text/csv" if fmt == "csv" else "application/x-ndjson"},
+                timeout=600,
+            )
+            code, data = r.status_code, r.json()
+        except Exception as e:
+            code, data = 0, {"error": str(e)}
         st.write(f"Status: {code}")
         st.json(data)
         if isinstance(data, dict) and data.get("jobID") is not None:
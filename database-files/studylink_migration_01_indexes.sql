@@ -0,0 +1,22 @@
+-- Composite indexes for the metric and StudySummary hot queries.
+-- Runs after studylink_db.sql on container creation; can also be applied
+-- by hand to an existing database:
+--   mysql -u root -p < database-files/studylink_migration_01_indexes.sql
+USE study_link;
+
+
+-- GET /data/metrics (unfiltered): keyset order (metricDate DESC, metricID DESC)
+CREATE INDEX idx_metric_date_id ON metric(metricDate, metricID);
+
+-- GET /data/metrics?studentID=: same order within one student
+CREATE INDEX idx_metric_student_date_id ON metric(studentID, metricDate, metricID);
+
+-- GET /data/metrics?category=&metricType=: equality filters, then the sort
+CREATE INDEX idx_metric_category_type_date ON metric(category, metricType, metricDate, metricID);
+
+-- GET /analyst/engagement[/<id>]: covers the per-student DATE(metricDate)
+-- grouping and the Study-hours sum without touching the table rows
+CREATE INDEX idx_metric_student_engagement ON metric(studentID, metricDate, category, metricValue);
+
+-- GET /analyst/dashboard: latest StudySummary per student by periodStart
+CREATE INDEX idx_summary_student_period ON StudySummary(studentID, periodStart);
@@ -0,0 +1,73 @@
+-- StudentLatestSummary: each student's most recent StudySummary row,
+-- kept current by triggers so /analyst/dashboard is a single indexed join
+-- instead of a correlated ORDER BY ... LIMIT 1 per student.
+USE study_link;
+
+
+CREATE TABLE StudentLatestSummary (
+   studentID INT PRIMARY KEY,
+   summaryID INT NOT NULL,
+   totalStudyHrs DECIMAL(5,2),
+   avgStudyHrs DECIMAL(4,2),
+   avgSleep DECIMAL(4,2),
+   periodStart DATETIME,
+   periodEnd DATETIME,
+   FOREIGN KEY (studentID) REFERENCES student(studentID)
+       ON DELETE CASCADE
+       ON UPDATE CASCADE
+);
+
+
+-- Recompute one student's row; an indexed lookup on
+-- StudySummary(studentID, periodStart) from migration 01
+DELIMITER //
+CREATE PROCEDURE refresh_latest_summary(IN p_studentID INT)
+BEGIN
+   DELETE FROM StudentLatestSummary WHERE studentID = p_studentID;
+
+   INSERT INTO StudentLatestSummary
+       (studentID, summaryID, totalStudyHrs, avgStudyHrs, avgSleep, periodStart, periodEnd)
+   SELECT studentID, summaryID, totalStudyHrs, avgStudyHrs, avgSleep, periodStart, periodEnd
+   FROM StudySummary
+   WHERE studentID = p_studentID
+   ORDER BY periodStart DESC, summaryID DESC
+   LIMIT 1;
+END//
+
+CREATE TRIGGER study_summary_after_insert
+AFTER INSERT ON StudySummary
+FOR EACH ROW
+BEGIN
+   CALL refresh_latest_summary(NEW.studentID);
+END//
+
+CREATE TRIGGER study_summary_after_update
+AFTER UPDATE ON StudySummary
+FOR EACH ROW
+BEGIN
+   CALL refresh_latest_summary(NEW.studentID);
+   IF OLD.studentID <> NEW.studentID THEN
+       CALL refresh_latest_summary(OLD.studentID);
+   END IF;
+END//
+
+CREATE TRIGGER study_summary_after_delete
+AFTER DELETE ON StudySummary
+FOR EACH ROW
+BEGIN
+   CALL refresh_latest_summary(OLD.studentID);
+END//
+DELIMITER ;
+
+
+-- Backfill from the rows loaded by studylink_db.sql
+INSERT INTO StudentLatestSummary
+    (studentID, summaryID, totalStudyHrs, avgStudyHrs, avgSleep, periodStart, periodEnd)
+SELECT studentID, summaryID, totalStudyHrs, avgStudyHrs, avgSleep, periodStart, periodEnd
+FROM (
+    SELECT ss.*,
+           ROW_NUMBER() OVER (PARTITION BY ss.studentID
+                              ORDER BY ss.periodStart DESC, ss.summaryID DESC) AS rn
+    FROM StudySummary ss
+) ranked
+WHERE rn = 1;
@@ -0,0 +1,31 @@
+-- metric_daily_rollup: per-student, per-day metric counts and study hours
+-- for the engagement endpoints. Maintained incrementally by the API's metric
+-- write paths (backend/studylink/data_analyst/metric_rollup.py); rebuild it
+-- with `python -m backend.tools.rebuild_daily_rollup` if it ever drifts.
+USE study_link;
+
+
+CREATE TABLE metric_daily_rollup (
+   studentID INT NOT NULL,
+   metricDay DATE NOT NULL,
+   entryCount INT NOT NULL DEFAULT 0,
+   studyHours DECIMAL(14,2) NOT NULL DEFAULT 0,
+   PRIMARY KEY (studentID, metricDay),
+   FOREIGN KEY (studentID) REFERENCES student(studentID)
+       ON DELETE CASCADE
+       ON UPDATE CASCADE
+);
+
+-- /analyst/engagement lists the most recent days across all students
+CREATE INDEX idx_rollup_day ON metric_daily_rollup (metricDay);
+
+
+-- Backfill from the existing metric rows
+INSERT INTO metric_daily_rollup (studentID, metricDay, entryCount, studyHours)
+SELECT
+   studentID,
+   DATE(metricDate),
+   COUNT(*),
+   SUM(CASE WHEN category = 'Study' THEN COALESCE(metricValue, 0) ELSE 0 END)
+FROM metric
+GROUP BY studentID, DATE(metricDate);
@@ -0,0 +1,7 @@
+-- Indexes for the date-windowed /student/calendar feed: a student's
+-- assignments are found per course and date range, and events by date.
+USE study_link;
+
+
+CREATE INDEX idx_assignment_course_date ON assignment (courseID, assignmentDate);
+CREATE INDEX idx_event_date ON event (date);
@@ -0,0 +1,15 @@
+-- student_version: a change counter per student, incremented by the API in
+-- the same transaction as every write that touches the student's calendar,
+-- reminders, grades, courses or metrics. Reads expose it as an ETag /
+-- X-Student-Version so caches can validate with one primary-key lookup.
+-- Students without a row are at version 0.
+USE study_link;
+
+
+CREATE TABLE student_version (
+   studentID INT PRIMARY KEY,
+   version BIGINT NOT NULL DEFAULT 0,
+   FOREIGN KEY (studentID) REFERENCES student(studentID)
+       ON DELETE CASCADE
+       ON UPDATE CASCADE
+);
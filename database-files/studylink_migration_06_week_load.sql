@@ -0,0 +1,81 @@
+-- student_week_load: per-student, per-ISO-week workload vectors. One row per
+-- (studentID, weekStart = the week's Monday) with the number of assignments
+-- due and events attended on each weekday. Maintained incrementally by the
+-- API's assignment/event/enrollment writes
+-- (backend/studylink/student/week_load.py); rebuild it with
+-- `python -m backend.tools.rebuild_week_load` if it ever drifts.
+USE study_link;
+
+
+CREATE TABLE student_week_load (
+   studentID INT NOT NULL,
+   weekStart DATE NOT NULL,
+   monAssignments INT NOT NULL DEFAULT 0,
+   tueAssignments INT NOT NULL DEFAULT 0,
+   wedAssignments INT NOT NULL DEFAULT 0,
+   thuAssignments INT NOT NULL DEFAULT 0,
+   friAssignments INT NOT NULL DEFAULT 0,
+   satAssignments INT NOT NULL DEFAULT 0,
+   sunAssignments INT NOT NULL DEFAULT 0,
+   monEvents INT NOT NULL DEFAULT 0,
+   tueEvents INT NOT NULL DEFAULT 0,
+   wedEvents INT NOT NULL DEFAULT 0,
+   thuEvents INT NOT NULL DEFAULT 0,
+   friEvents INT NOT NULL DEFAULT 0,
+   satEvents INT NOT NULL DEFAULT 0,
+   sunEvents INT NOT NULL DEFAULT 0,
+   PRIMARY KEY (studentID, weekStart),
+   FOREIGN KEY (studentID) REFERENCES student(studentID)
+       ON DELETE CASCADE
+       ON UPDATE CASCADE
+);
+
+
+-- Backfill from existing assignments and events
+INSERT INTO student_week_load (studentID, weekStart, monAssignments, tueAssignments, wedAssignments, thuAssignments, friAssignments, satAssignments, sunAssignments)
+SELECT studentID, weekStart, monAssignments, tueAssignments, wedAssignments, thuAssignments, friAssignments, satAssignments, sunAssignments FROM (
+   SELECT
+       css.studentID AS studentID,
+       DATE_SUB(a.assignmentDate, INTERVAL WEEKDAY(a.assignmentDate) DAY) AS weekStart,
+       SUM(WEEKDAY(a.assignmentDate) = 0) AS monAssignments,
+       SUM(WEEKDAY(a.assignmentDate) = 1) AS tueAssignments,
+       SUM(WEEKDAY(a.assignmentDate) = 2) AS wedAssignments,
+       SUM(WEEKDAY(a.assignmentDate) = 3) AS thuAssignments,
+       SUM(WEEKDAY(a.assignmentDate) = 4) AS friAssignments,
+       SUM(WEEKDAY(a.assignmentDate) = 5) AS satAssignments,
+       SUM(WEEKDAY(a.assignmentDate) = 6) AS sunAssignments
+   FROM assignment a JOIN CourseSelectionStudent css ON css.courseID = a.courseID
+   GROUP BY css.studentID, DATE_SUB(a.assignmentDate, INTERVAL WEEKDAY(a.assignmentDate) DAY)
+) AS delta
+ON DUPLICATE KEY UPDATE
+   monAssignments = student_week_load.monAssignments + delta.monAssignments,
+   tueAssignments = student_week_load.tueAssignments + delta.tueAssignments,
+   wedAssignments = student_week_load.wedAssignments + delta.wedAssignments,
+   thuAssignments = student_week_load.thuAssignments + delta.thuAssignments,
+   friAssignments = student_week_load.friAssignments + delta.friAssignments,
+   satAssignments = student_week_load.satAssignments + delta.satAssignments,
+   sunAssignments = student_week_load.sunAssignments + delta.sunAssignments;
+
+INSERT INTO student_week_load (studentID, weekStart, monEvents, tueEvents, wedEvents, thuEvents, friEvents, satEvents, sunEvents)
+SELECT studentID, weekStart, monEvents, tueEvents, wedEvents, thuEvents, friEvents, satEvents, sunEvents FROM (
+   SELECT
+       ae.studentID AS studentID,
+       DATE_SUB(e.date, INTERVAL WEEKDAY(e.date) DAY) AS weekStart,
+       SUM(WEEKDAY(e.date) = 0) AS monEvents,
+       SUM(WEEKDAY(e.date) = 1) AS tueEvents,
+       SUM(WEEKDAY(e.date) = 2) AS wedEvents,
+       SUM(WEEKDAY(e.date) = 3) AS thuEvents,
+       SUM(WEEKDAY(e.date) = 4) AS friEvents,
+       SUM(WEEKDAY(e.date) = 5) AS satEvents,
+       SUM(WEEKDAY(e.date) = 6) AS sunEvents
+   FROM event e JOIN attEvent ae ON ae.eventID = e.eventID
+   GROUP BY ae.studentID, DATE_SUB(e.date, INTERVAL WEEKDAY(e.date) DAY)
+) AS delta
+ON DUPLICATE KEY UPDATE
+   monEvents = student_week_load.monEvents + delta.monEvents,
+   tueEvents = student_week_load.tueEvents + delta.tueEvents,
+   wedEvents = student_week_load.wedEvents + delta.wedEvents,
+   thuEvents = student_week_load.thuEvents + delta.thuEvents,
+   friEvents = student_week_load.friEvents + delta.friEvents,
+   satEvents = student_week_load.satEvents + delta.satEvents,
+   sunEvents = student_week_load.sunEvents + delta.sunEvents;
@@ -0,0 +1,7 @@
+-- Due-reminder lookups filter on isActive and an upcoming date and read in
+-- (date, time) order: the all-students /student/reminders feed and the
+-- reminder dispatcher scan this index instead of the whole table.
+USE study_link;
+
+
+CREATE INDEX idx_reminder_active_due ON reminder (isActive, date, time);
@@ -0,0 +1,8 @@
+-- Prerequisites for a course, as a comma-separated list of course codes
+-- (e.g. 'CS 2500, MATH 1365'). The API parses them into a prerequisite graph
+-- per courseCode and marks catalog courses eligible/blocked per student.
+USE study_link;
+
+
+ALTER TABLE CourseSelection
+    ADD COLUMN prerequisites VARCHAR(255) NULL;
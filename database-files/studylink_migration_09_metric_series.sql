@@ -0,0 +1,7 @@
+-- GET /data/metrics/series reads one metricName per student over a date
+-- range and groups by time bucket: equality columns first, then the range,
+-- with metricValue included so the aggregate never touches the table rows.
+USE study_link;
+
+
+CREATE INDEX idx_metric_student_name_date ON metric (studentID, metricName, metricDate, metricValue);